@@ -4,7 +4,9 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_restx import Api
 from flask_migrate import Migrate
-from .config import Config
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+import os
+from .config import config_por_entorno
 
 # Inicializamos las extensiones globalmente para luego asociarlas a la app en la función create_app
 db = SQLAlchemy()
@@ -12,11 +14,24 @@ migrate = Migrate()  # Para gestionar las migraciones de la base de datos
 bcrypt = Bcrypt()
 jwt = JWTManager()  # Para la gestión de tokens JWT en la autenticación
 
-def create_app():
+def create_app(config_name=None):
+    """
+    Crear y configurar la aplicación Flask.
+
+    Args:
+        config_name (str | None): Entorno de configuración ("development", "production" o "testing").
+            Si no se indica, se usa la variable de entorno APP_ENV y, si tampoco existe, "development".
+
+    Returns:
+        Flask: La aplicación configurada.
+    """
     app = Flask(__name__)
 
-    # Configuraciones de la aplicación
-    app.config.from_object(Config)  # Cargar la configuración
+    # Configuraciones de la aplicación según el entorno
+    config_name = config_name or os.environ.get('APP_ENV', 'development')
+    if config_name not in config_por_entorno:
+        raise ValueError(f"Entorno de configuración desconocido: {config_name}")
+    app.config.from_object(config_por_entorno[config_name])  # Cargar la configuración
 
     # Inicializamos las extensiones con la aplicación
     db.init_app(app)  # Inicializar SQLAlchemy con la app
@@ -24,6 +39,30 @@ def create_app():
     jwt.init_app(app)  # Inicializar JWTManager con la app
     migrate.init_app(app, db)  # Inicializar Migrate con la app y la base de datos
 
+    # Codificador JSON usado por las respuestas de los listados
+    from app.utils.serializacion import usar_codificador
+    usar_codificador(app.config['JSON_CODIFICADOR'])
+
+    # Versiones por tabla para los ETag de los endpoints de listado
+    from app.utils.versiones import init_versiones
+    init_versiones(app)
+
+    # Cachés de lectura, invalidadas después de cada commit
+    from app.utils.cache import init_cache
+    init_cache(app)
+
+    # Contar las consultas SQL y medir los tiempos de cada petición
+    from app.middlewares.instrumentacion_middleware import init_instrumentacion
+    init_instrumentacion(app)
+
+    # Métricas de peticiones, latencias y pool de conexiones en `/metrics`
+    from app.middlewares.metricas_middleware import init_metricas
+    init_metricas(app)
+
+    # Compresión gzip/deflate (y brotli si está instalado) de las respuestas
+    from app.middlewares.compresion_middleware import init_compresion
+    init_compresion(app)
+
     authorizations = {
         "Bearer": {
             "type": "apiKey",  # Tipo apiKey define que el token JWT se envía en el encabezado de la solicitud
@@ -46,6 +85,12 @@ def create_app():
         security="Bearer",  # Define que los endpoints por defecto usan el esquema de seguridad JWT
     )
 
+    # Si el pool está agotado y no se libera una conexión dentro de pool_timeout, se responde 503
+    # para que el cliente reintente, en lugar de un error 500 genérico.
+    @api.errorhandler(PoolTimeoutError)
+    def pool_agotado(error):
+        return {'message': 'Servicio saturado, intente nuevamente en unos segundos.'}, 503, {'Retry-After': '5'}
+
     # Importar y registrar los namespaces de los controladores
     from app.controllers.proveedor_controller import proveedor_ns
     from app.controllers.cliente_controller import cliente_ns
@@ -54,6 +99,8 @@ def create_app():
     from app.controllers.detalle_orden_compra_controller import detalle_orden_compra_ns
     from app.controllers.orden_compra_controller import orden_compra_ns
     from app.controllers.orden_venta_controller import orden_venta_ns
+    from app.controllers.reporte_controller import reporte_ns
+    from app.controllers.auth_controller import auth_ns
 
     api.add_namespace(proveedor_ns)
     api.add_namespace(cliente_ns)
@@ -62,5 +109,13 @@ def create_app():
     api.add_namespace(detalle_orden_compra_ns)
     api.add_namespace(orden_compra_ns)  # Agrega el namespace de órdenes de compra
     api.add_namespace(orden_venta_ns)
+    api.add_namespace(reporte_ns)  # Reportes agregados en `/reportes`
+    api.add_namespace(auth_ns)  # Registro, inicio de sesión y renovación de tokens en `/auth`
+
+    # Registrar los comandos de consola (`flask stock ...`, `flask resumen ...` y `flask idempotencia ...`)
+    from app.cli import idempotencia_cli, resumen_cli, stock_cli
+    app.cli.add_command(stock_cli)
+    app.cli.add_command(resumen_cli)
+    app.cli.add_command(idempotencia_cli)
 
     return app
\ No newline at end of file
@@ -0,0 +1,63 @@
+import click
+from datetime import date, timedelta
+from flask.cli import AppGroup
+
+# Grupo de comandos `flask stock ...` para mantener el libro de movimientos de stock.
+stock_cli = AppGroup('stock', help='Comandos del libro de movimientos y snapshots de stock.')
+
+
+@stock_cli.command('snapshot')
+@click.option('--fecha', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Fecha del snapshot (YYYY-MM-DD). Por defecto, ayer.')
+def snapshot(fecha):
+    """Guardar el stock de cada producto al final de una fecha ya cerrada."""
+    from app.services.stock_service import StockService
+
+    fecha = fecha.date() if fecha else date.today() - timedelta(days=1)
+    try:
+        total = StockService.crear_snapshots(fecha)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--fecha')
+    click.echo(f'Snapshots guardados para {fecha.isoformat()}: {total}')
+
+
+@stock_cli.command('inicializar')
+def inicializar():
+    """Registrar como ajuste la diferencia entre el stock de cada producto y su libro de movimientos."""
+    from app.services.stock_service import StockService
+
+    total = StockService.crear_movimientos_iniciales()
+    click.echo(f'Movimientos iniciales registrados: {total}')
+
+
+# Grupo de comandos `flask resumen ...` para mantener el resumen diario de ventas.
+resumen_cli = AppGroup('resumen', help='Comandos del resumen diario de ventas.')
+
+
+@resumen_cli.command('reconstruir')
+@click.option('--dias', type=int, default=31, show_default=True,
+              help='Cantidad de días que se recalculan en cada transacción.')
+def reconstruir(dias):
+    """Recalcular desde cero el resumen diario de ventas a partir de los detalles de venta."""
+    from app.services.resumen_ventas_service import ResumenVentasService
+
+    try:
+        total = ResumenVentasService.reconstruir(dias)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--dias')
+    click.echo(f'Resumen de ventas reconstruido: {total} filas')
+
+
+# Grupo de comandos `flask idempotencia ...` para mantener la tabla de claves Idempotency-Key.
+idempotencia_cli = AppGroup('idempotencia', help='Comandos de las claves Idempotency-Key.')
+
+
+@idempotencia_cli.command('purgar')
+@click.option('--lote', type=click.IntRange(min=1), default=1000, show_default=True,
+              help='Cantidad máxima de claves eliminadas por transacción.')
+def purgar(lote):
+    """Eliminar las claves Idempotency-Key vencidas."""
+    from app.utils.idempotencia import purgar_vencidas
+
+    total = purgar_vencidas(lote)
+    click.echo(f'Claves vencidas eliminadas: {total}')
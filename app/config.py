@@ -15,9 +15,30 @@ class Config:
     Atributos:
         SQLALCHEMY_DATABASE_URI (str): URI para la conexión a la base de datos MySQL.
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Deshabilita el seguimiento de modificaciones de objetos en SQLAlchemy para optimizar el rendimiento.
-        SQLALCHEMY_ECHO (bool): Activa la impresión de todas las consultas SQL ejecutadas por la aplicación en la consola, útil para depuración.
+        SQLALCHEMY_ECHO (bool): Activa la impresión de todas las consultas SQL en la consola; solo para depuración (variable de entorno SQLALCHEMY_ECHO).
         SECRET_KEY (str): Clave secreta para firmar cookies y otras funcionalidades de seguridad de Flask.
         JWT_SECRET_KEY (str): Clave secreta utilizada para generar y verificar tokens JWT.
+        PAGINACION_LIMITE_POR_DEFECTO (int): Cantidad de registros por página cuando el cliente no indica `limit`.
+        PAGINACION_LIMITE_MAXIMO (int): Cantidad máxima de registros por página que puede pedir un cliente.
+        LOTE_MAXIMO_LINEAS (int): Cantidad máxima de líneas aceptadas por los endpoints de creación en lote.
+        INSTRUMENTACION_UMBRAL_CONSULTAS (int): Cantidad de consultas SQL a partir de la cual se registra la petición como sospechosa.
+        INSTRUMENTACION_UMBRAL_MS (float): Duración en milisegundos a partir de la cual se registra la petición como lenta.
+        METRICAS_DIRECTORIO_MULTIPROCESO (str | None): Directorio donde cada proceso vuelca sus métricas para combinarlas en `/metrics`; None si hay un solo proceso.
+        METRICAS_INTERVALO_ESCRITURA (float): Segundos entre volcados de las métricas de un proceso a su archivo.
+        SQLALCHEMY_ENGINE_OPTIONS (dict): Opciones del pool de conexiones (tamaño, desborde, tiempo de espera, reciclado y pre-ping).
+        CACHE_BACKEND (str): Backend de la caché de productos: "memoria" (LRU por proceso), la ruta de una clase compatible con `BackendCache`, o vacío para desactivarla.
+        CACHE_MAXSIZE (int): Cantidad máxima de entradas de la caché en memoria.
+        CACHE_TTL (float): Segundos de vida de cada entrada de la caché.
+        COMPRESION_UMBRAL_BYTES (int): Tamaño mínimo del cuerpo para comprimir una respuesta que no es streaming.
+        COMPRESION_NIVEL (int): Nivel de compresión de zlib (1 a 9; también se usa como calidad de brotli).
+        JSON_CODIFICADOR (str): Codificador JSON de las respuestas: "auto" (orjson si está instalado), "orjson" o "json".
+        BCRYPT_LOG_ROUNDS (int): Factor de costo de bcrypt para los hash de contraseñas; al cambiarlo, cada hash se recalcula en el siguiente inicio de sesión del usuario.
+        AUTH_HASH_HILOS (int): Cantidad máxima de hash bcrypt que un proceso calcula a la vez.
+        AUTH_ROL_POR_DEFECTO (str): Rol de los usuarios creados con `/auth/register`.
+        IDEMPOTENCIA_TTL (int): Segundos durante los que se guarda la respuesta de cada Idempotency-Key.
+        IDEMPOTENCIA_ESPERA (float): Segundos que un reintento espera a que termine la petición original con la misma clave antes de responder 409.
+        IDEMPOTENCIA_RESERVA (int): Segundos que dura la reserva de una clave "en_proceso"; pasado ese tiempo se considera que la petición original murió y un reintento la vuelve a ejecutar. Debe superar la duración de la petición más lenta.
+        AUTH_REVOCACION_TTL (float): Segundos que se guarda en caché el estado de cada usuario; es la demora máxima para rechazar los tokens de un usuario desactivado o con otro rol.
     """
 
     # URI de conexión a la base de datos MySQL, con las credenciales y el host tomados del archivo .env
@@ -26,11 +47,119 @@ class Config:
     # Desactiva el rastreo de modificaciones para mejorar el rendimiento de la aplicación
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # Activa el logging de las consultas SQL en la consola
-    SQLALCHEMY_ECHO = True
+    # Pool de conexiones. pool_recycle debe ser menor que el wait_timeout de MySQL para no usar conexiones
+    # que el servidor ya cerró, y pool_pre_ping descarta las conexiones caídas antes de entregarlas.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),  # Conexiones que se mantienen abiertas.
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),  # Conexiones extra permitidas en picos de carga.
+        # Segundos de espera por una conexión libre; entero porque Flask-SQLAlchemy crea el engine con
+        # engine_from_config, que convierte pool_timeout a int (0.5 quedaría en 0, sin espera).
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 280)),  # Segundos de vida máxima de una conexión.
+        'pool_pre_ping': True,
+    }
+
+    # Imprimir cada consulta SQL en la consola es lento bajo carga: solo se activa explícitamente para depurar.
+    # Para medir consultas por petición se usan los encabezados X-DB-Queries y Server-Timing.
+    SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO', 'false').lower() in ('1', 'true', 'yes')
 
     # Clave secreta para funcionalidades de seguridad como sesiones y cookies
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'super_secret_key'
 
     # Clave secreta para la autenticación JWT, usada para generar tokens
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt_super_secret_key'
+
+    # Tamaño de página por defecto y máximo para los endpoints de listado paginados por cursor
+    PAGINACION_LIMITE_POR_DEFECTO = int(os.environ.get('PAGINACION_LIMITE_POR_DEFECTO', 100))
+    PAGINACION_LIMITE_MAXIMO = int(os.environ.get('PAGINACION_LIMITE_MAXIMO', 1000))
+
+    # Cantidad máxima de líneas que se aceptan en una sola petición de creación en lote
+    LOTE_MAXIMO_LINEAS = int(os.environ.get('LOTE_MAXIMO_LINEAS', 5000))
+
+    # Umbrales a partir de los cuales una petición se registra como lenta o con demasiadas consultas
+    INSTRUMENTACION_UMBRAL_CONSULTAS = int(os.environ.get('INSTRUMENTACION_UMBRAL_CONSULTAS', 20))
+    INSTRUMENTACION_UMBRAL_MS = float(os.environ.get('INSTRUMENTACION_UMBRAL_MS', 500))
+
+    # Con varios workers, cada proceso vuelca sus métricas en este directorio y `/metrics` las combina
+    METRICAS_DIRECTORIO_MULTIPROCESO = os.environ.get('METRICAS_DIRECTORIO_MULTIPROCESO') or None
+    METRICAS_INTERVALO_ESCRITURA = float(os.environ.get('METRICAS_INTERVALO_ESCRITURA', 5))
+
+    # Caché de lectura del catálogo de productos
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memoria')
+    CACHE_MAXSIZE = int(os.environ.get('CACHE_MAXSIZE', 1024))
+    CACHE_TTL = float(os.environ.get('CACHE_TTL', 30))
+
+    # Compresión de respuestas según Accept-Encoding
+    COMPRESION_UMBRAL_BYTES = int(os.environ.get('COMPRESION_UMBRAL_BYTES', 1024))
+    COMPRESION_NIVEL = int(os.environ.get('COMPRESION_NIVEL', 6))
+
+    # Codificador JSON de los listados y exportaciones
+    JSON_CODIFICADOR = os.environ.get('JSON_CODIFICADOR', 'auto')
+
+    # Costo de bcrypt (cada punto duplica el tiempo de cálculo) y tamaño del pool de hilos que calcula los hash
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    AUTH_HASH_HILOS = int(os.environ.get('AUTH_HASH_HILOS', 4))
+
+    # Rol asignado a los usuarios nuevos
+    AUTH_ROL_POR_DEFECTO = os.environ.get('AUTH_ROL_POR_DEFECTO', 'usuario')
+
+    # Vida de las claves Idempotency-Key, espera máxima de un reintento concurrente y duración de cada reserva
+    IDEMPOTENCIA_TTL = int(os.environ.get('IDEMPOTENCIA_TTL', 86400))
+    IDEMPOTENCIA_ESPERA = float(os.environ.get('IDEMPOTENCIA_ESPERA', 10))
+    IDEMPOTENCIA_RESERVA = int(os.environ.get('IDEMPOTENCIA_RESERVA', 60))
+
+    # Vida de la caché del estado de los usuarios que usa `role_required` para detectar tokens revocados
+    AUTH_REVOCACION_TTL = float(os.environ.get('AUTH_REVOCACION_TTL', 30))
+
+
+class DevelopmentConfig(Config):
+    """
+    Configuración para desarrollo local: modo debug activado y el resto igual a la base.
+    """
+
+    DEBUG = True
+
+
+class ProductionConfig(Config):
+    """
+    Configuración para producción.
+
+    Desactiva siempre el log de consultas SQL y limita la duración de las consultas de lectura
+    en el servidor con `max_execution_time` de MySQL (variable de entorno DB_STATEMENT_TIMEOUT_MS,
+    0 para desactivarlo).
+    """
+
+    DEBUG = False
+    SQLALCHEMY_ECHO = False
+
+    # Tiempo máximo de ejecución de cada SELECT en el servidor, en milisegundos
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        'connect_args': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 10)),  # Segundos para establecer la conexión.
+            # Se ejecuta al abrir cada conexión; MySQL aplica max_execution_time a las sentencias SELECT.
+            **({'init_command': f'SET SESSION max_execution_time={DB_STATEMENT_TIMEOUT_MS}'} if DB_STATEMENT_TIMEOUT_MS else {}),
+        },
+    }
+
+
+class TestingConfig(Config):
+    """
+    Configuración para pruebas: base de datos SQLite en memoria (o TEST_DATABASE_URI) sin opciones de pool.
+    """
+
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URI', 'sqlite://')
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # SQLite en memoria usa un pool propio que no admite estas opciones.
+    BCRYPT_LOG_ROUNDS = 4  # El costo mínimo de bcrypt para que las pruebas no esperen cada hash.
+
+
+# Clases de configuración disponibles según el entorno (variable de entorno APP_ENV)
+config_por_entorno = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
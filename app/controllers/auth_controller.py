@@ -0,0 +1,82 @@
+from flask import request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt_identity, jwt_required  # Tokens JWT.
+from flask_restx import Namespace, Resource, fields  # Importa las herramientas necesarias para crear una API RESTful.
+from app.services.user_service import UserService  # Importa el servicio que maneja los usuarios.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+
+# Crear un espacio de nombres (namespace) para la autenticación, publicado en `/auth`.
+auth_ns = Namespace('Auth', description='Registro, inicio de sesión y renovación de tokens', path='/auth')
+
+# Modelo de las credenciales para la documentación de Swagger.
+credenciales_model = auth_ns.model('Credenciales', {
+    'username': fields.String(required=True, description='Nombre de usuario'),  # Nombre de usuario, requerido.
+    'password': fields.String(required=True, description='Contraseña'),  # Contraseña, requerida.
+})
+
+@auth_ns.route('/register')  # Define la ruta de registro de usuarios.
+class RegisterResource(Resource):
+    @auth_ns.doc('register', security=[])  # No requiere token.
+    @auth_ns.expect(credenciales_model, validate=True)  # Espera un modelo válido.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
+    def post(self):
+        """
+        Registrar un nuevo usuario
+        ---
+        Este método crea un usuario con el rol por defecto.
+
+        Responses:
+        - 201: Usuario creado con éxito.
+        - 400: Si los datos no son válidos o el nombre de usuario ya existe.
+        """
+        data = request.get_json()
+        try:
+            user = UserService.create_user(data['username'], data['password'])
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si el registro falla.
+        return {'message': 'Usuario creado con éxito', 'username': user.username}, 201  # Respuesta exitosa.
+
+@auth_ns.route('/login')  # Define la ruta de inicio de sesión.
+class LoginResource(Resource):
+    @auth_ns.doc('login', security=[])  # No requiere token.
+    @auth_ns.expect(credenciales_model, validate=True)  # Espera un modelo válido.
+    def post(self):
+        """
+        Iniciar sesión
+        ---
+        Este método verifica las credenciales y devuelve un token de acceso, con el rol del usuario
+        como claim, y un token de renovación.
+
+        Responses:
+        - 200: Retorna access_token y refresh_token.
+        - 401: Si las credenciales no son válidas.
+        """
+        data = request.get_json()
+        try:
+            user = UserService.autenticar(data['username'], data['password'])
+        except ValueError as e:
+            return {'message': str(e)}, 401  # Respuesta de error si las credenciales no son válidas.
+        claims = UserService.get_claims(user)  # El rol viaja en el token: `role_required` no consulta la base de datos.
+        return {
+            'access_token': create_access_token(identity=user.username, additional_claims=claims),
+            'refresh_token': create_refresh_token(identity=user.username),
+        }, 200  # Respuesta exitosa.
+
+@auth_ns.route('/refresh')  # Define la ruta de renovación del token de acceso.
+class RefreshResource(Resource):
+    @auth_ns.doc('refresh')  # Requiere el token de renovación en el encabezado Authorization.
+    @jwt_required(refresh=True)
+    def post(self):
+        """
+        Renovar el token de acceso
+        ---
+        Este método devuelve un token de acceso nuevo con el rol actual del usuario, a partir del token de renovación.
+
+        Responses:
+        - 200: Retorna un access_token nuevo.
+        - 401: Si el usuario ya no existe o está inactivo.
+        """
+        username = get_jwt_identity()
+        estado = UserService.get_estado_usuario(username)  # Estado en caché: sin consulta en la mayoría de las renovaciones.
+        if estado is None or not estado['activo']:
+            return {'message': 'Token revocado'}, 401  # El usuario fue desactivado o eliminado.
+        return {'access_token': create_access_token(identity=username, additional_claims={'rol': estado['rol']})}, 200
@@ -1,6 +1,13 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services.cliente_service import ClienteService
+from app.utils.paginacion import paginacion_parser  # Parámetros compartidos de paginación por cursor.
+from app.utils.condicional import condicional  # ETag / Last-Modified y respuestas 304.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+
+# Claves de la respuesta y columnas de las que se leen en el listado.
+CAMPOS_CLIENTE = {'id': 'id_cliente', 'nombre': 'nombre', 'contacto': 'contacto', 'telefono': 'telefono', 'direccion': 'direccion'}
 
 # Crear un espacio de nombres (namespace) para los clientes.
 # Esto ayuda a organizar las rutas de la API relacionadas con los clientes.
@@ -20,6 +27,7 @@ class ClienteResource(Resource):
     
     @cliente_ns.doc('create_cliente')  # Docstring para documentar la operación.
     @cliente_ns.expect(cliente_model, validate=True)  # Espera el modelo definido anteriormente.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear un nuevo cliente
@@ -40,6 +48,8 @@ class ClienteResource(Resource):
             return {'message': str(e)}, 400  # Respuesta de error si falla la creación.
 
     @cliente_ns.doc('get_clientes')  # Docstring para documentar la operación de obtención.
+    @cliente_ns.expect(paginacion_parser)  # Documenta los parámetros `after` y `limit`.
+    @condicional('clientes')  # Responde 304 sin leer los registros si la tabla no cambió.
     def get(self):
         """
         Obtener todos los clientes
@@ -47,12 +57,14 @@ class ClienteResource(Resource):
         Este método permite obtener una lista de todos los clientes registrados en la base de datos.
 
         Responses:
-        - 200: Retorna una lista de clientes.
+        - 200: Retorna una página de clientes y el `next_cursor` para pedir la siguiente (null si no hay más).
+        - 304: Si el ETag enviado en If-None-Match (o la fecha de If-Modified-Since) sigue vigente.
         """
         # Llama al servicio para obtener todos los clientes.
-        clientes = ClienteService.get_all_clientes()
+        args = paginacion_parser.parse_args()  # Lee los parámetros de paginación de la URL.
+        clientes, next_cursor = ClienteService.get_all_clientes(args['after'], args['limit'], ligero=True)
         # Devuelve una lista de clientes en formato JSON.
-        return {'clientes': [{'id': c.id_cliente, 'nombre': c.nombre, "contacto": c.contacto, "telefono": c.telefono, "direccion": c.direccion} for c in clientes]}, 200
+        return respuesta_json({'clientes': a_diccionarios(clientes, CAMPOS_CLIENTE), 'next_cursor': next_cursor})
 
 @cliente_ns.route('/<int:id_cliente>')  # Define la ruta para operaciones sobre un cliente específico usando su ID.
 @cliente_ns.param('id_cliente', 'El ID del cliente')  # Define el parámetro ID en la documentación.
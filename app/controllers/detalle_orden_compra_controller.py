@@ -1,6 +1,10 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services.detalle_orden_compra_service import DetalleOrdenCompraService
+from app.utils.lotes import lote_parser  # Parámetros de los endpoints de creación en lote.
+from app.utils.streaming import exportacion_parser, respuesta_ndjson, solicita_stream  # Paginación y exportación en streaming.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
 
 # Crear un espacio de nombres (namespace) para los detalles de las órdenes de compra.
 # Esto ayuda a organizar las rutas de la API relacionadas con los detalles de las órdenes de compra.
@@ -14,11 +18,20 @@ detalle_model = detalle_orden_compra_ns.model('DetalleOrdenCompra', {
     'cantidad': fields.Integer(required=True, description='Cantidad del producto'),  # Cantidad del producto, requerida.
 })
 
+# Claves de la respuesta y columnas de las que se leen, para los listados y la exportación.
+CAMPOS_DETALLE = {
+    'id': 'id_detalle_compra',
+    'id_orden_compra': 'id_orden_compra',
+    'id_producto': 'id_producto',
+    'cantidad': 'cantidad'
+}
+
 @detalle_orden_compra_ns.route('/')  # Define la ruta base para las operaciones de detalle de orden de compra.
 class DetalleOrdenCompraResource(Resource):
     
     @detalle_orden_compra_ns.doc('create_detalle_orden_compra')  # Docstring para documentar la operación de creación.
     @detalle_orden_compra_ns.expect(detalle_model, validate=True)  # Espera el modelo definido anteriormente.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear un nuevo detalle de orden de compra
@@ -33,16 +46,17 @@ class DetalleOrdenCompraResource(Resource):
         data = request.get_json()
         try:
             # Llama al servicio para crear un detalle de orden de compra usando los datos obtenidos.
-            detalle = DetalleOrdenCompraService.create_detalle_orden_compra(
+            id_detalle = DetalleOrdenCompraService.create_detalle_orden_compra(
                 data['id_orden_compra'],
                 data['id_producto'],
                 data['cantidad']
             )
-            return {'message': 'Detalle de orden de compra creado con éxito', 'detalle': detalle.id_detalle_compra}, 201  # Respuesta exitosa.
+            return {'message': 'Detalle de orden de compra creado con éxito', 'detalle': id_detalle}, 201  # Respuesta exitosa.
         except ValueError as e:
             return {'message': str(e)}, 400  # Respuesta de error si falla la creación.
 
     @detalle_orden_compra_ns.doc('get_all_detalles_orden_compra')  # Docstring para documentar la operación de obtención.
+    @detalle_orden_compra_ns.expect(exportacion_parser)  # Documenta los parámetros `after`, `limit` y `stream`.
     def get(self):
         """
         Obtener todos los detalles de orden de compra
@@ -50,19 +64,59 @@ class DetalleOrdenCompraResource(Resource):
         Este método permite obtener todos los detalles de orden de compra.
 
         Responses:
-        - 200: Retorna una lista de todos los detalles de orden de compra.
+        - 200: Retorna una página de detalles de orden de compra y el `next_cursor` para pedir la siguiente (null si no hay más).
+          Con `?stream=1` o `Accept: application/x-ndjson` retorna todos los detalles como NDJSON en streaming.
         """
+        args = exportacion_parser.parse_args()  # Lee los parámetros de paginación y streaming de la URL.
+        if solicita_stream(args['stream']):
+            # Exporta todos los detalles fila por fila sin construir la lista completa en memoria.
+            return respuesta_ndjson(DetalleOrdenCompraService.iter_detalles_orden_compra(), CAMPOS_DETALLE)
+
         # Llama al servicio para obtener todos los detalles de órdenes de compra.
-        detalles = DetalleOrdenCompraService.get_all_detalles_orden_compra()
+        detalles, next_cursor = DetalleOrdenCompraService.get_all_detalles_orden_compra(args['after'], args['limit'], ligero=True)
         # Devuelve una lista de detalles en formato JSON.
-        return {
-            'detalles_orden_compra': [{
-                'id': d.id_detalle_compra,
-                'id_orden_compra': d.id_orden_compra,
-                'id_producto': d.id_producto,
-                'cantidad': d.cantidad
-            } for d in detalles]
-        }, 200
+        return respuesta_json({
+            'detalles_orden_compra': a_diccionarios(detalles, CAMPOS_DETALLE),
+            'next_cursor': next_cursor  # Cursor para pedir la siguiente página, None si no hay más.
+        })
+
+@detalle_orden_compra_ns.route('/bulk')  # Define la ruta para crear varios detalles en una sola petición.
+class DetalleOrdenCompraBulkResource(Resource):
+
+    @detalle_orden_compra_ns.doc('create_detalles_orden_compra_bulk')  # Docstring para documentar la operación de creación en lote.
+    @detalle_orden_compra_ns.expect([detalle_model], lote_parser, validate=True)  # Espera una lista de detalles.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
+    def post(self):
+        """
+        Crear varios detalles de orden de compra
+        ---
+        Este método permite registrar muchos detalles de orden de compra (por ejemplo, la recepción
+        de un envío del proveedor) en una sola transacción.
+        Con `?partial=true` se crean las líneas válidas y se reportan los errores de las demás.
+
+        Responses:
+        - 201: Detalles creados con éxito; incluye los IDs generados en el orden recibido y los errores de las líneas omitidas.
+        - 400: Si el lote no es válido o ninguna línea pudo crearse.
+        """
+        # Obtiene la lista de detalles y el modo parcial de la solicitud.
+        lineas = request.get_json()
+        # Flask-RESTX también acepta un objeto suelto como si fuera una lista de un elemento: se exige la lista.
+        if not isinstance(lineas, list) or not lineas:
+            return {'message': 'Se esperaba una lista no vacía de detalles'}, 400
+        args = lote_parser.parse_args()
+        try:
+            # Llama al servicio para crear todos los detalles en una sola transacción.
+            creados, errores = DetalleOrdenCompraService.create_detalles_orden_compra_bulk(lineas, args['partial'])
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si el lote no es válido.
+
+        respuesta = {
+            'detalles': [{'indice': indice, 'id': id_detalle} for indice, id_detalle in creados],  # IDs creados por línea.
+            'errores': [{'indice': indice, 'message': mensaje} for indice, mensaje in errores],  # Errores por línea.
+        }
+        if not creados:
+            return {'message': 'No se creó ningún detalle de orden de compra', **respuesta}, 400
+        return {'message': 'Detalles de orden de compra creados con éxito', **respuesta}, 201
 
 @detalle_orden_compra_ns.route('/<int:id_detalle>')  # Define la ruta para operaciones sobre un detalle específico usando su ID.
 @detalle_orden_compra_ns.param('id_detalle', 'El ID del detalle de orden de compra')  # Define el parámetro ID en la documentación.
@@ -1,6 +1,10 @@
 from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from app.utils.lotes import lote_parser  # Parámetros de los endpoints de creación en lote.
+from app.utils.streaming import exportacion_parser, respuesta_ndjson, solicita_stream  # Paginación y exportación en streaming.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
 
 # Crear un espacio de nombres (namespace) para los detalles de las órdenes de venta.
 # Esto organiza las rutas de la API que están relacionadas con los detalles de las órdenes de venta.
@@ -21,11 +25,20 @@ detalle_model = detalle_orden_venta_ns.model(
     },
 )
 
+# Claves de la respuesta y columnas de las que se leen, para los listados y la exportación.
+CAMPOS_DETALLE = {
+    "id": "id_detalle_venta",  # ID del detalle de venta.
+    "id_orden_venta": "id_orden_venta",  # ID de la orden de venta asociada.
+    "id_producto": "id_producto",  # ID del producto asociado.
+    "cantidad": "cantidad",  # Cantidad del producto.
+}
+
 @detalle_orden_venta_ns.route("/")  # Define la ruta base para las operaciones de detalle de orden de venta.
 class DetalleOrdenVentaResource(Resource):
     
     @detalle_orden_venta_ns.doc("create_detalle_orden_venta")  # Docstring para documentar la operación de creación.
     @detalle_orden_venta_ns.expect(detalle_model, validate=True)  # Espera el modelo definido anteriormente.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear un nuevo detalle de orden de venta
@@ -40,17 +53,18 @@ class DetalleOrdenVentaResource(Resource):
         data = request.get_json()
         try:
             # Llama al servicio para crear un detalle de orden de venta usando los datos obtenidos.
-            detalle = DetalleOrdenVentaService.create_detalle_orden_venta(
+            id_detalle = DetalleOrdenVentaService.create_detalle_orden_venta(
                 data["id_orden_venta"], data["id_producto"], data["cantidad"]
             )
             return {
                 "message": "Detalle de orden de venta creado con éxito",
-                "detalle": detalle.id_detalle_venta,
+                "detalle": id_detalle,
             }, 201  # Respuesta exitosa con el ID del detalle creado.
         except ValueError as e:
             return {"message": str(e)}, 400  # Respuesta de error si falla la creación.
 
     @detalle_orden_venta_ns.doc("get_all_detalles_orden_venta")  # Docstring para documentar la operación de obtención.
+    @detalle_orden_venta_ns.expect(exportacion_parser)  # Documenta los parámetros `after`, `limit` y `stream`.
     def get(self):
         """
         Obtener todos los detalles de orden de venta
@@ -58,22 +72,58 @@ class DetalleOrdenVentaResource(Resource):
         Este método permite obtener todos los detalles de orden de venta.
 
         Responses:
-        - 200: Retorna una lista de todos los detalles de orden de venta.
+        - 200: Retorna una página de detalles de orden de venta y el `next_cursor` para pedir la siguiente (null si no hay más).
+          Con `?stream=1` o `Accept: application/x-ndjson` retorna todos los detalles como NDJSON en streaming.
         """
+        args = exportacion_parser.parse_args()  # Lee los parámetros de paginación y streaming de la URL.
+        if solicita_stream(args['stream']):
+            # Exporta todos los detalles fila por fila sin construir la lista completa en memoria.
+            return respuesta_ndjson(DetalleOrdenVentaService.iter_detalles_orden_venta(), CAMPOS_DETALLE)
+
         # Llama al servicio para obtener todos los detalles de órdenes de venta.
-        detalles = DetalleOrdenVentaService.get_all_detalles_orden_venta()
+        detalles, next_cursor = DetalleOrdenVentaService.get_all_detalles_orden_venta(args['after'], args['limit'], ligero=True)
         # Devuelve una lista de detalles en formato JSON.
-        return {
-            "detalles_orden_venta": [
-                {
-                    "id": d.id_detalle_venta,  # ID del detalle de venta.
-                    "id_orden_venta": d.id_orden_venta,  # ID de la orden de venta asociada.
-                    "id_producto": d.id_producto,  # ID del producto asociado.
-                    "cantidad": d.cantidad,  # Cantidad del producto.
-                }
-                for d in detalles  # Itera sobre todos los detalles obtenidos.
-            ]
-        }, 200  # Respuesta exitosa con la lista de detalles.
+        return respuesta_json({
+            "detalles_orden_venta": a_diccionarios(detalles, CAMPOS_DETALLE),
+            "next_cursor": next_cursor,  # Cursor para pedir la siguiente página, None si no hay más.
+        })  # Respuesta exitosa con la lista de detalles.
+
+@detalle_orden_venta_ns.route("/bulk")  # Define la ruta para crear varios detalles en una sola petición.
+class DetalleOrdenVentaBulkResource(Resource):
+
+    @detalle_orden_venta_ns.doc("create_detalles_orden_venta_bulk")  # Docstring para documentar la operación de creación en lote.
+    @detalle_orden_venta_ns.expect([detalle_model], lote_parser, validate=True)  # Espera una lista de detalles.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
+    def post(self):
+        """
+        Crear varios detalles de orden de venta
+        ---
+        Este método permite crear muchos detalles de orden de venta en una sola transacción.
+        Con `?partial=true` se crean las líneas válidas y se reportan los errores de las demás.
+
+        Responses:
+        - 201: Detalles creados con éxito; incluye el ID de cada línea creada y los errores de las omitidas.
+        - 400: Si el lote no es válido o ninguna línea pudo crearse.
+        """
+        # Obtiene la lista de detalles y el modo parcial de la solicitud.
+        lineas = request.get_json()
+        # Flask-RESTX también acepta un objeto suelto como si fuera una lista de un elemento: se exige la lista.
+        if not isinstance(lineas, list) or not lineas:
+            return {"message": "Se esperaba una lista no vacía de detalles"}, 400
+        args = lote_parser.parse_args()
+        try:
+            # Llama al servicio para crear todos los detalles en una sola transacción.
+            creados, errores = DetalleOrdenVentaService.create_detalles_orden_venta_bulk(lineas, args["partial"])
+        except ValueError as e:
+            return {"message": str(e)}, 400  # Respuesta de error si el lote no es válido.
+
+        respuesta = {
+            "detalles": [{"indice": indice, "id": id_detalle} for indice, id_detalle in creados],  # IDs creados por línea.
+            "errores": [{"indice": indice, "message": mensaje} for indice, mensaje in errores],  # Errores por línea.
+        }
+        if not creados:
+            return {"message": "No se creó ningún detalle de orden de venta", **respuesta}, 400
+        return {"message": "Detalles de orden de venta creados con éxito", **respuesta}, 201
 
 @detalle_orden_venta_ns.route("/<int:id_detalle>")  # Define la ruta para operaciones sobre un detalle específico usando su ID.
 @detalle_orden_venta_ns.param("id_detalle", "El ID del detalle de orden de venta")  # Define el parámetro ID en la documentación.
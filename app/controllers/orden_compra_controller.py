@@ -1,6 +1,21 @@
 from flask import request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
-from flask_restx import Namespace, Resource, fields  # Importa las herramientas necesarias para crear una API RESTful.
+from flask_restx import Namespace, Resource, fields, inputs  # Importa las herramientas necesarias para crear una API RESTful.
 from app.services.orden_compra_service import OrdenCompraService  # Importa el servicio que maneja la lógica de negocio de las órdenes de compra.
+from app.utils.paginacion import paginacion_parser  # Parámetros compartidos de paginación por cursor.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+from app.utils.concurrencia import ConflictoVersionError, encabezado_etag, versiones_de_if_match  # Control de concurrencia optimista con If-Match.
+
+# Claves de la respuesta y columnas de las que se leen en el listado.
+# Las fechas se copian como date: el serializador las escribe en formato YYYY-MM-DD.
+CAMPOS_ORDEN = {
+    'id': 'id_orden_compra',  # ID de la orden de compra.
+    'id_proveedor': 'id_proveedor',  # ID del proveedor asociado.
+    'fecha_inicio': 'fecha_inicio',  # Fecha de inicio.
+    'fecha_final': 'fecha_final',  # Fecha final.
+    'estado': 'estado',  # Estado de la orden.
+    'version': 'version'  # Versión de la orden (para actualizarla con If-Match).
+}
 
 # Crear un espacio de nombres (namespace) para las órdenes de compra.
 # Esto ayuda a organizar las rutas relacionadas con las órdenes de compra en la API.
@@ -15,10 +30,19 @@ orden_compra_model = orden_compra_ns.model('OrdenCompra', {
     'id_proveedor': fields.Integer(required=True, description='ID del proveedor asociado'),  # ID del proveedor, requerido.
 })
 
+# Parámetros del listado: paginación por cursor más los filtros y el orden que se aplican en la base de datos.
+ordenes_compra_parser = paginacion_parser.copy()
+ordenes_compra_parser.add_argument('estado', type=str, location='args', required=False, choices=('completado', 'pendiente', 'cancelado'), help='Filtra por estado de la orden')
+ordenes_compra_parser.add_argument('desde', type=inputs.date, location='args', required=False, help='Fecha de inicio mínima (YYYY-MM-DD)')
+ordenes_compra_parser.add_argument('hasta', type=inputs.date, location='args', required=False, help='Fecha de inicio máxima (YYYY-MM-DD)')
+ordenes_compra_parser.add_argument('id_proveedor', type=int, location='args', required=False, help='Filtra por el ID del proveedor')
+ordenes_compra_parser.add_argument('sort', type=str, location='args', required=False, help='Columna de orden: id, fecha_inicio, fecha_final o estado; con "-" inicial el orden es descendente')
+
 @orden_compra_ns.route('/')  # Define la ruta base para las operaciones de órdenes de compra.
 class OrdenCompraResource(Resource):
     @orden_compra_ns.doc('create_orden_compra')  # Documenta la operación de creación de la orden de compra.
     @orden_compra_ns.expect(orden_compra_model, validate=True)  # Espera un modelo válido para la creación.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear una nueva orden de compra
@@ -47,27 +71,36 @@ class OrdenCompraResource(Resource):
             return {'message': str(e)}, 400  # Respuesta de error si la creación falla.
 
     @orden_compra_ns.doc('get_ordenes_compra')  # Documenta la operación para obtener todas las órdenes de compra.
+    @orden_compra_ns.expect(ordenes_compra_parser)  # Documenta los parámetros de paginación, filtros y orden.
     def get(self):
         """
         Obtener todas las órdenes de compra
         ---
-        Este método permite obtener una lista de todas las órdenes de compra registradas en la base de datos.
+        Este método permite obtener una lista de las órdenes de compra registradas en la base de datos,
+        filtrada por estado, rango de fechas y proveedor, y ordenada por la columna indicada en `sort`.
 
         Responses:
-        - 200: Retorna una lista de órdenes de compra.
+        - 200: Retorna una página de órdenes de compra y el `next_cursor` para pedir la siguiente (null si no hay más).
+        - 400: Si un filtro o la columna de orden no son válidos.
         """
         # Llama al servicio para obtener todas las órdenes de compra.
-        ordenes_compra = OrdenCompraService.get_all_ordenes_compra()
+        args = ordenes_compra_parser.parse_args()  # Lee los parámetros de paginación, filtros y orden de la URL.
+        try:
+            ordenes_compra, next_cursor = OrdenCompraService.get_all_ordenes_compra(
+                args['after'], args['limit'],
+                estado=args['estado'],
+                desde=args['desde'].date() if args['desde'] else None,  # inputs.date devuelve un datetime.
+                hasta=args['hasta'].date() if args['hasta'] else None,
+                id_proveedor=args['id_proveedor'], sort=args['sort'],
+                ligero=True  # Solo se leen las columnas de la respuesta.
+            )
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si un filtro o el orden no son válidos.
         # Devuelve una lista de órdenes de compra en formato JSON.
-        return {
-            'ordenes_compra': [{
-                'id': o.id_orden_compra,  # ID de la orden de compra.
-                'id_proveedor': o.id_proveedor,  # ID del proveedor asociado.
-                'fecha_inicio': o.fecha_inicio.strftime('%Y-%m-%d'),  # Fecha de inicio formateada.
-                'fecha_final': o.fecha_final.strftime('%Y-%m-%d'),  # Fecha final formateada.
-                'estado': o.estado  # Estado de la orden.
-            } for o in ordenes_compra]  # Itera sobre todas las órdenes de compra.
-        }, 200  # Respuesta exitosa.
+        return respuesta_json({
+            'ordenes_compra': a_diccionarios(ordenes_compra, CAMPOS_ORDEN),
+            'next_cursor': next_cursor  # Cursor para pedir la siguiente página, None si no hay más.
+        })  # Respuesta exitosa.
 
 @orden_compra_ns.route('/<int:id_orden_compra>')  # Define la ruta para operaciones sobre una orden específica usando su ID.
 @orden_compra_ns.param('id_orden_compra', 'El ID de la orden de compra')  # Define el parámetro ID en la documentación.
@@ -83,13 +116,16 @@ class OrdenCompraDetailResource(Resource):
         Responses:
         - 200: Orden de compra actualizada con éxito.
         - 404: Si la orden de compra no se encuentra.
+        - 412: Si la orden de compra cambió desde la versión enviada en If-Match (campo `version` de la lectura).
         """
         # Obtiene los nuevos datos de la orden de compra en formato JSON del cuerpo de la solicitud.
         new_data = request.get_json()
         try:
-            # Llama al servicio para actualizar la orden de compra con el ID especificado y los nuevos datos.
-            OrdenCompraService.update_orden_compra(id_orden_compra, new_data)
-            return {'message': 'Orden de compra actualizada con éxito'}, 200  # Respuesta exitosa.
+            # Llama al servicio para actualizar la orden de compra con el ID especificado y los nuevos datos; si hay If-Match, solo se aplica sobre esa versión.
+            orden_compra = OrdenCompraService.update_orden_compra(id_orden_compra, new_data, versiones_de_if_match())
+            return {'message': 'Orden de compra actualizada con éxito'}, 200, encabezado_etag(orden_compra.version)  # Respuesta exitosa con la nueva versión.
+        except ConflictoVersionError as e:
+            return {'message': str(e)}, 412  # Otra petición modificó el registro: el cliente debe volver a leerlo.
         except ValueError:
             return {'message': 'Orden de compra no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
 
@@ -109,4 +145,49 @@ class OrdenCompraDetailResource(Resource):
             OrdenCompraService.delete_orden_compra(id_orden_compra)
             return {'message': 'Orden de compra eliminada con éxito'}, 200  # Respuesta exitosa.
         except ValueError:
-            return {'message': 'Orden de compra no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
\ No newline at end of file
+            return {'message': 'Orden de compra no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
+
+@orden_compra_ns.route('/<int:id_orden_compra>/completa')  # Define la ruta para obtener una orden con su proveedor y sus detalles.
+@orden_compra_ns.param('id_orden_compra', 'El ID de la orden de compra')  # Define el parámetro ID en la documentación.
+class OrdenCompraCompletaResource(Resource):
+    @orden_compra_ns.doc('get_orden_compra_completa')  # Documenta la operación de lectura de la orden completa.
+    def get(self, id_orden_compra):
+        """
+        Obtener una orden de compra completa
+        ---
+        Este método devuelve la orden de compra junto con su proveedor, sus detalles y el producto de cada detalle,
+        leídos con una cantidad fija de consultas.
+
+        Responses:
+        - 200: Retorna la orden de compra con su proveedor y sus detalles.
+        - 404: Si la orden de compra no se encuentra.
+        """
+        try:
+            # Llama al servicio para obtener la orden con todas sus relaciones ya cargadas.
+            o = OrdenCompraService.get_orden_compra_completa(id_orden_compra)
+        except ValueError:
+            return {'message': 'Orden de compra no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
+        return respuesta_json({
+            'id': o.id_orden_compra,  # ID de la orden de compra.
+            'fecha_inicio': o.fecha_inicio,  # Fecha de inicio (el serializador la escribe como YYYY-MM-DD).
+            'fecha_final': o.fecha_final,  # Fecha final.
+            'estado': o.estado,  # Estado de la orden.
+            'version': o.version,  # Versión de la orden (para actualizarla con If-Match).
+            'proveedor': {
+                'id': o.proveedor.id_proveedor,  # ID del proveedor.
+                'nombre': o.proveedor.nombre,  # Nombre del proveedor.
+                'contacto': o.proveedor.contacto,  # Nombre de contacto.
+                'telefono': o.proveedor.telefono,  # Teléfono.
+                'direccion': o.proveedor.direccion,  # Dirección.
+            },
+            'detalles': [{
+                'id': d.id_detalle_compra,  # ID del detalle.
+                'cantidad': d.cantidad,  # Cantidad del producto.
+                'producto': {
+                    'id_producto': d.producto.id_producto,  # ID del producto.
+                    'nombre': d.producto.nombre,  # Nombre del producto.
+                    'costo': d.producto.costo,  # Decimal: el serializador lo escribe como número.
+                    'precio_venta': d.producto.precio_venta,
+                },
+            } for d in o.detalles_compra],  # Los detalles y sus productos ya están cargados: no se hacen más consultas.
+        })  # Respuesta exitosa.
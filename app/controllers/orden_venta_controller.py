@@ -1,6 +1,21 @@
 from flask import request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
-from flask_restx import Namespace, Resource, fields  # Importa las herramientas necesarias para crear una API RESTful.
+from flask_restx import Namespace, Resource, fields, inputs  # Importa las herramientas necesarias para crear una API RESTful.
 from app.services.orden_venta_service import OrdenVentaService  # Importa el servicio que maneja la lógica de negocio de las órdenes de venta.
+from app.utils.paginacion import paginacion_parser  # Parámetros compartidos de paginación por cursor.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+from app.utils.concurrencia import ConflictoVersionError, encabezado_etag, versiones_de_if_match  # Control de concurrencia optimista con If-Match.
+
+# Claves de la respuesta y columnas de las que se leen en el listado.
+# Las fechas se copian como date: el serializador las escribe en formato YYYY-MM-DD.
+CAMPOS_ORDEN = {
+    'id': 'id_orden_venta',  # ID de la orden de venta.
+    'id_cliente': 'id_cliente',  # ID del cliente asociado.
+    'fecha_inicio': 'fecha_inicio',  # Fecha de inicio.
+    'fecha_final': 'fecha_final',  # Fecha final.
+    'estado': 'estado',  # Estado de la orden.
+    'version': 'version'  # Versión de la orden (para actualizarla con If-Match).
+}
 
 # Crear un espacio de nombres (namespace) para las órdenes de venta.
 # Esto organiza las rutas relacionadas con las órdenes de venta en la API.
@@ -15,10 +30,19 @@ orden_venta_model = orden_venta_ns.model('OrdenVenta', {
     'id_cliente': fields.Integer(required=True, description='ID del cliente asociado'),  # ID del cliente, requerido.
 })
 
+# Parámetros del listado: paginación por cursor más los filtros y el orden que se aplican en la base de datos.
+ordenes_venta_parser = paginacion_parser.copy()
+ordenes_venta_parser.add_argument('estado', type=str, location='args', required=False, choices=('completado', 'pendiente', 'cancelado'), help='Filtra por estado de la orden')
+ordenes_venta_parser.add_argument('desde', type=inputs.date, location='args', required=False, help='Fecha de inicio mínima (YYYY-MM-DD)')
+ordenes_venta_parser.add_argument('hasta', type=inputs.date, location='args', required=False, help='Fecha de inicio máxima (YYYY-MM-DD)')
+ordenes_venta_parser.add_argument('id_cliente', type=int, location='args', required=False, help='Filtra por el ID del cliente')
+ordenes_venta_parser.add_argument('sort', type=str, location='args', required=False, help='Columna de orden: id, fecha_inicio, fecha_final o estado; con "-" inicial el orden es descendente')
+
 @orden_venta_ns.route('/')  # Define la ruta base para las operaciones de órdenes de venta.
 class OrdenVentaResource(Resource):
     @orden_venta_ns.doc('create_orden_venta')  # Documenta la operación de creación de la orden de venta.
     @orden_venta_ns.expect(orden_venta_model, validate=True)  # Espera un modelo válido para la creación.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear una nueva orden de venta
@@ -47,27 +71,36 @@ class OrdenVentaResource(Resource):
             return {'message': str(e)}, 400  # Respuesta de error si la creación falla.
 
     @orden_venta_ns.doc('get_ordenes_venta')  # Documenta la operación para obtener todas las órdenes de venta.
+    @orden_venta_ns.expect(ordenes_venta_parser)  # Documenta los parámetros de paginación, filtros y orden.
     def get(self):
         """
         Obtener todas las órdenes de venta
         ---
-        Este método permite obtener una lista de todas las órdenes de venta registradas en la base de datos.
+        Este método permite obtener una lista de las órdenes de venta registradas en la base de datos,
+        filtrada por estado, rango de fechas y cliente, y ordenada por la columna indicada en `sort`.
 
         Responses:
-        - 200: Retorna una lista de órdenes de venta.
+        - 200: Retorna una página de órdenes de venta y el `next_cursor` para pedir la siguiente (null si no hay más).
+        - 400: Si un filtro o la columna de orden no son válidos.
         """
         # Llama al servicio para obtener todas las órdenes de venta.
-        ordenes_venta = OrdenVentaService.get_all_ordenes_venta()
+        args = ordenes_venta_parser.parse_args()  # Lee los parámetros de paginación, filtros y orden de la URL.
+        try:
+            ordenes_venta, next_cursor = OrdenVentaService.get_all_ordenes_venta(
+                args['after'], args['limit'],
+                estado=args['estado'],
+                desde=args['desde'].date() if args['desde'] else None,  # inputs.date devuelve un datetime.
+                hasta=args['hasta'].date() if args['hasta'] else None,
+                id_cliente=args['id_cliente'], sort=args['sort'],
+                ligero=True  # Solo se leen las columnas de la respuesta.
+            )
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si un filtro o el orden no son válidos.
         # Devuelve una lista de órdenes de venta en formato JSON.
-        return {
-            'ordenes_venta': [{
-                'id': o.id_orden_venta,  # ID de la orden de venta.
-                'id_cliente': o.id_cliente,  # ID del cliente asociado.
-                'fecha_inicio': o.fecha_inicio.strftime('%Y-%m-%d'),  # Fecha de inicio formateada.
-                'fecha_final': o.fecha_final.strftime('%Y-%m-%d'),  # Fecha final formateada.
-                'estado': o.estado  # Estado de la orden.
-            } for o in ordenes_venta]  # Itera sobre todas las órdenes de venta.
-        }, 200  # Respuesta exitosa.
+        return respuesta_json({
+            'ordenes_venta': a_diccionarios(ordenes_venta, CAMPOS_ORDEN),
+            'next_cursor': next_cursor  # Cursor para pedir la siguiente página, None si no hay más.
+        })  # Respuesta exitosa.
 
 @orden_venta_ns.route('/<int:id_orden_venta>')  # Define la ruta para operaciones sobre una orden específica usando su ID.
 @orden_venta_ns.param('id_orden_venta', 'El ID de la orden de venta')  # Define el parámetro ID en la documentación.
@@ -83,13 +116,16 @@ class OrdenVentaDetailResource(Resource):
         Responses:
         - 200: Orden de venta actualizada con éxito.
         - 404: Si la orden de venta no se encuentra.
+        - 412: Si la orden de venta cambió desde la versión enviada en If-Match (campo `version` de la lectura).
         """
         # Obtiene los nuevos datos de la orden de venta en formato JSON del cuerpo de la solicitud.
         new_data = request.get_json()
         try:
-            # Llama al servicio para actualizar la orden de venta con el ID especificado y los nuevos datos.
-            OrdenVentaService.update_orden_venta(id_orden_venta, new_data)
-            return {'message': 'Orden de venta actualizada con éxito'}, 200  # Respuesta exitosa.
+            # Llama al servicio para actualizar la orden de venta con el ID especificado y los nuevos datos; si hay If-Match, solo se aplica sobre esa versión.
+            orden_venta = OrdenVentaService.update_orden_venta(id_orden_venta, new_data, versiones_de_if_match())
+            return {'message': 'Orden de venta actualizada con éxito'}, 200, encabezado_etag(orden_venta.version)  # Respuesta exitosa con la nueva versión.
+        except ConflictoVersionError as e:
+            return {'message': str(e)}, 412  # Otra petición modificó el registro: el cliente debe volver a leerlo.
         except ValueError:
             return {'message': 'Orden de venta no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
 
@@ -109,4 +145,49 @@ class OrdenVentaDetailResource(Resource):
             OrdenVentaService.delete_orden_venta(id_orden_venta)
             return {'message': 'Orden de venta eliminada con éxito'}, 200  # Respuesta exitosa.
         except ValueError:
-            return {'message': 'Orden de venta no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
\ No newline at end of file
+            return {'message': 'Orden de venta no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
+
+@orden_venta_ns.route('/<int:id_orden_venta>/completa')  # Define la ruta para obtener una orden con su cliente y sus detalles.
+@orden_venta_ns.param('id_orden_venta', 'El ID de la orden de venta')  # Define el parámetro ID en la documentación.
+class OrdenVentaCompletaResource(Resource):
+    @orden_venta_ns.doc('get_orden_venta_completa')  # Documenta la operación de lectura de la orden completa.
+    def get(self, id_orden_venta):
+        """
+        Obtener una orden de venta completa
+        ---
+        Este método devuelve la orden de venta junto con su cliente, sus detalles y el producto de cada detalle,
+        leídos con una cantidad fija de consultas.
+
+        Responses:
+        - 200: Retorna la orden de venta con su cliente y sus detalles.
+        - 404: Si la orden de venta no se encuentra.
+        """
+        try:
+            # Llama al servicio para obtener la orden con todas sus relaciones ya cargadas.
+            o = OrdenVentaService.get_orden_venta_completa(id_orden_venta)
+        except ValueError:
+            return {'message': 'Orden de venta no encontrada'}, 404  # Respuesta de error si no se encuentra la orden.
+        return respuesta_json({
+            'id': o.id_orden_venta,  # ID de la orden de venta.
+            'fecha_inicio': o.fecha_inicio,  # Fecha de inicio (el serializador la escribe como YYYY-MM-DD).
+            'fecha_final': o.fecha_final,  # Fecha final.
+            'estado': o.estado,  # Estado de la orden.
+            'version': o.version,  # Versión de la orden (para actualizarla con If-Match).
+            'cliente': {
+                'id': o.cliente.id_cliente,  # ID del cliente.
+                'nombre': o.cliente.nombre,  # Nombre del cliente.
+                'contacto': o.cliente.contacto,  # Nombre de contacto.
+                'telefono': o.cliente.telefono,  # Teléfono.
+                'direccion': o.cliente.direccion,  # Dirección.
+            },
+            'detalles': [{
+                'id': d.id_detalle_venta,  # ID del detalle.
+                'cantidad': d.cantidad,  # Cantidad del producto.
+                'producto': {
+                    'id_producto': d.producto.id_producto,  # ID del producto.
+                    'nombre': d.producto.nombre,  # Nombre del producto.
+                    'costo': d.producto.costo,  # Decimal: el serializador lo escribe como número.
+                    'precio_venta': d.producto.precio_venta,
+                },
+            } for d in o.detalles_venta],  # Los detalles y sus productos ya están cargados: no se hacen más consultas.
+        })  # Respuesta exitosa.
@@ -1,6 +1,13 @@
-from flask import request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
-from flask_restx import Namespace, Resource, fields  # Importa las herramientas necesarias para crear una API RESTful.
+from datetime import date  # Importa date para usar la fecha actual por defecto en las consultas de stock.
+from flask import current_app, request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
+from flask_restx import Namespace, Resource, fields, inputs, reqparse  # Importa las herramientas necesarias para crear una API RESTful.
 from app.services.producto_service import ProductoService  # Importa el servicio que maneja la lógica de negocio de los productos.
+from app.services.stock_service import StockService  # Importa el servicio que calcula el stock histórico.
+from app.utils.paginacion import paginacion_parser  # Parámetros compartidos de paginación por cursor.
+from app.utils.condicional import condicional, respuesta_versionada  # ETag / Last-Modified y respuestas 304.
+from app.utils.serializacion import respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+from app.utils.concurrencia import ConflictoVersionError, encabezado_etag, versiones_de_if_match  # Control de concurrencia optimista con If-Match.
 
 # Crear un espacio de nombres (namespace) para los productos.
 # Esto organiza las rutas relacionadas con los productos en la API.
@@ -15,10 +22,19 @@ producto_model = producto_ns.model('Producto', {
     'cantidad': fields.Integer(required=True, description='Cantidad disponible del producto'),  # Cantidad disponible, requerido.
 })
 
+# Parámetros de las consultas de stock histórico.
+stock_parser = reqparse.RequestParser()
+stock_parser.add_argument('fecha', type=inputs.date, location='args', required=False, help='Fecha de la consulta (YYYY-MM-DD), por defecto hoy')
+
+# La consulta por lote recibe además la lista de productos.
+stock_lote_parser = stock_parser.copy()
+stock_lote_parser.add_argument('ids', type=str, location='args', required=True, help='IDs de los productos separados por comas')
+
 @producto_ns.route('/')  # Define la ruta base para las operaciones de productos.
 class ProductoResource(Resource):
     @producto_ns.doc('create_producto')  # Documenta la operación de creación del producto.
     @producto_ns.expect(producto_model, validate=True)  # Espera un modelo válido para la creación.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear un nuevo producto
@@ -42,6 +58,8 @@ class ProductoResource(Resource):
             return {'message': str(e)}, 400  # Respuesta de error si la creación falla.
 
     @producto_ns.doc('get_productos')  # Documenta la operación para obtener todos los productos.
+    @producto_ns.expect(paginacion_parser)  # Documenta los parámetros `after` y `limit`.
+    @condicional('productos')  # Responde 304 sin leer los registros si la tabla no cambió.
     def get(self):
         """
         Obtener todos los productos
@@ -49,26 +67,40 @@ class ProductoResource(Resource):
         Este método permite obtener una lista de todos los productos registrados en la base de datos.
 
         Responses:
-        - 200: Retorna una lista de productos.
+        - 200: Retorna una página de productos y el `next_cursor` para pedir la siguiente (null si no hay más).
+        - 304: Si el ETag enviado en If-None-Match (o la fecha de If-Modified-Since) sigue vigente.
         """
         # Llama al servicio para obtener todos los productos.
-        productos = ProductoService.get_all_productos()
-        # Devuelve una lista de productos en formato JSON.
-        return {
-            'productos': [
-                {
-                    'id_producto': p.id_producto,  # ID del producto.
-                    'nombre': p.nombre,  # Nombre del producto.
-                    'costo': float(p.costo),  # Convertir Decimal a float.
-                    'precio_venta': float(p.precio_venta),  # Convertir Decimal a float.
-                    'cantidad': p.cantidad  # Cantidad disponible.
-                } for p in productos  # Itera sobre todos los productos.
-            ]
-        }, 200  # Respuesta exitosa.
+        args = paginacion_parser.parse_args()  # Lee los parámetros de paginación de la URL.
+        productos, next_cursor = ProductoService.get_all_productos(args['after'], args['limit'])
+        # Devuelve una lista de productos en formato JSON (el servicio ya los entrega como diccionarios).
+        return respuesta_json({
+            'productos': productos,
+            'next_cursor': next_cursor  # Cursor para pedir la siguiente página, None si no hay más.
+        })  # Respuesta exitosa.
 
 @producto_ns.route('/<int:id_producto>')  # Define la ruta para operaciones sobre un producto específico usando su ID.
 @producto_ns.param('id_producto', 'El ID del producto')  # Define el parámetro ID en la documentación.
 class ProductoDetailResource(Resource):
+    @producto_ns.doc('get_producto')  # Documenta la operación de consulta de un producto.
+    def get(self, id_producto):
+        """
+        Obtener un producto
+        ---
+        Este método devuelve la información de un producto basado en su ID.
+
+        Responses:
+        - 200: Retorna el producto, con su versión como ETag (el valor que espera If-Match en PUT).
+        - 304: Si el ETag enviado en If-None-Match es la versión actual del producto.
+        - 404: Si el producto no se encuentra.
+        """
+        try:
+            # Llama al servicio, que sirve el producto desde la caché si está disponible.
+            producto = ProductoService.get_producto(id_producto)
+            return respuesta_versionada(producto, producto['version'])  # Respuesta exitosa (o 304).
+        except ValueError:
+            return {'message': 'Producto no encontrado'}, 404  # Respuesta de error si no se encuentra el producto.
+
     @producto_ns.doc('update_producto')  # Documenta la operación de actualización del producto.
     @producto_ns.expect(producto_model, validate=True)  # Espera un modelo válido para la actualización.
     def put(self, id_producto):
@@ -80,13 +112,16 @@ class ProductoDetailResource(Resource):
         Responses:
         - 200: Producto actualizado con éxito.
         - 404: Si el producto no se encuentra.
+        - 412: Si el producto cambió desde la versión enviada en If-Match (campo `version` de la lectura).
         """
         # Obtiene los nuevos datos del producto en formato JSON del cuerpo de la solicitud.
         new_data = request.get_json()
         try:
-            # Llama al servicio para actualizar el producto con el ID especificado y los nuevos datos.
-            ProductoService.update_producto(id_producto, new_data)
-            return {'message': 'Producto actualizado con éxito'}, 200  # Respuesta exitosa.
+            # Llama al servicio para actualizar el producto con el ID especificado y los nuevos datos; si hay If-Match, solo se aplica sobre esa versión.
+            producto = ProductoService.update_producto(id_producto, new_data, versiones_de_if_match())
+            return {'message': 'Producto actualizado con éxito'}, 200, encabezado_etag(producto.version)  # Respuesta exitosa con la nueva versión.
+        except ConflictoVersionError as e:
+            return {'message': str(e)}, 412  # Otra petición modificó el registro: el cliente debe volver a leerlo.
         except ValueError:
             return {'message': 'Producto no encontrado'}, 404  # Respuesta de error si no se encuentra el producto.
 
@@ -106,4 +141,62 @@ class ProductoDetailResource(Resource):
             ProductoService.delete_producto(id_producto)
             return {'message': 'Producto eliminado con éxito'}, 200  # Respuesta exitosa.
         except ValueError:
-            return {'message': 'Producto no encontrado'}, 404  # Respuesta de error si no se encuentra el producto.
\ No newline at end of file
+            return {'message': 'Producto no encontrado'}, 404  # Respuesta de error si no se encuentra el producto.
+
+@producto_ns.route('/<int:id_producto>/stock')  # Define la ruta para consultar el stock histórico de un producto.
+@producto_ns.param('id_producto', 'El ID del producto')  # Define el parámetro ID en la documentación.
+class ProductoStockResource(Resource):
+    @producto_ns.doc('get_stock_producto')  # Documenta la operación de consulta de stock histórico.
+    @producto_ns.expect(stock_parser)  # Documenta el parámetro `fecha`.
+    def get(self, id_producto):
+        """
+        Obtener el stock de un producto en una fecha
+        ---
+        Este método devuelve la cantidad disponible de un producto al final de la fecha indicada,
+        a partir del último snapshot y de los movimientos de stock posteriores.
+
+        Responses:
+        - 200: Retorna el stock del producto en la fecha.
+        - 404: Si el producto no se encuentra.
+        """
+        args = stock_parser.parse_args()  # Lee la fecha de la URL.
+        fecha = args['fecha'].date() if args['fecha'] else date.today()
+        try:
+            cantidad = StockService.get_stock_en_fecha(id_producto, fecha)  # Stock al final de la fecha.
+        except ValueError:
+            return {'message': 'Producto no encontrado'}, 404  # Respuesta de error si no se encuentra el producto.
+        return {
+            'id_producto': id_producto,  # ID del producto.
+            'fecha': fecha.isoformat(),  # Fecha consultada.
+            'cantidad': cantidad  # Stock al final de la fecha.
+        }, 200  # Respuesta exitosa.
+
+@producto_ns.route('/stock')  # Define la ruta para consultar el stock histórico de varios productos.
+class ProductoStockLoteResource(Resource):
+    @producto_ns.doc('get_stock_productos')  # Documenta la operación de consulta de stock histórico por lote.
+    @producto_ns.expect(stock_lote_parser)  # Documenta los parámetros `ids` y `fecha`.
+    def get(self):
+        """
+        Obtener el stock de varios productos en una fecha
+        ---
+        Este método devuelve la cantidad disponible de cada producto indicado al final de la fecha,
+        resolviendo todos los productos con una sola consulta de snapshots y una de movimientos.
+
+        Responses:
+        - 200: Retorna el stock de cada producto en la fecha.
+        - 400: Si la lista de IDs no es válida.
+        """
+        args = stock_lote_parser.parse_args()  # Lee los IDs y la fecha de la URL.
+        fecha = args['fecha'].date() if args['fecha'] else date.today()
+        try:
+            ids = [int(id_producto) for id_producto in args['ids'].split(',') if id_producto.strip()]
+        except ValueError:
+            return {'message': 'Los IDs deben ser números enteros separados por comas.'}, 400
+        if not ids or len(ids) > current_app.config['PAGINACION_LIMITE_MAXIMO']:
+            return {'message': 'Debe indicar entre 1 y %d productos.' % current_app.config['PAGINACION_LIMITE_MAXIMO']}, 400
+
+        stock = StockService.get_stock_en_fecha_lote(fecha, ids)
+        return {
+            'fecha': fecha.isoformat(),  # Fecha consultada.
+            'stock': [{'id_producto': id_producto, 'cantidad': stock[id_producto]} for id_producto in ids]  # Stock por producto.
+        }, 200  # Respuesta exitosa.
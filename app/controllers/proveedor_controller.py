@@ -1,6 +1,19 @@
 from flask import request  # Importa la clase request de Flask para manejar las solicitudes HTTP.
 from flask_restx import Namespace, Resource, fields  # Importa las herramientas necesarias para crear una API RESTful.
 from app.services.proveedor_service import ProveedorService  # Importa el servicio que maneja la lógica de negocio de los proveedores.
+from app.utils.paginacion import paginacion_parser  # Parámetros compartidos de paginación por cursor.
+from app.utils.condicional import condicional  # ETag / Last-Modified y respuestas 304.
+from app.utils.serializacion import a_diccionarios, respuesta_json  # Serialización rápida a JSON.
+from app.utils.idempotencia import idempotente  # Reintentos seguros de los POST con Idempotency-Key.
+
+# Claves de la respuesta y columnas de las que se leen en el listado.
+CAMPOS_PROVEEDOR = {
+    'id_proveedor': 'id_proveedor',  # ID del proveedor.
+    'nombre': 'nombre',  # Nombre del proveedor.
+    'contacto': 'contacto',  # Nombre de contacto.
+    'telefono': 'telefono',  # Teléfono del proveedor.
+    'direccion': 'direccion'  # Dirección del proveedor.
+}
 
 # Crear un espacio de nombres (namespace) para los proveedores.
 # Esto organiza las rutas relacionadas con los proveedores en la API.
@@ -19,6 +32,7 @@ proveedor_model = proveedor_ns.model('Proveedor', {
 class ProveedorResource(Resource):
     @proveedor_ns.doc('create_proveedor')  # Documenta la operación de creación del proveedor.
     @proveedor_ns.expect(proveedor_model, validate=True)  # Espera un modelo válido para la creación.
+    @idempotente  # Un reintento con la misma Idempotency-Key devuelve la respuesta original.
     def post(self):
         """
         Crear un nuevo proveedor
@@ -42,6 +56,8 @@ class ProveedorResource(Resource):
             return {'message': str(e)}, 400  # Respuesta de error si la creación falla.
 
     @proveedor_ns.doc('get_proveedores')  # Documenta la operación para obtener todos los proveedores.
+    @proveedor_ns.expect(paginacion_parser)  # Documenta los parámetros `after` y `limit`.
+    @condicional('proveedores')  # Responde 304 sin leer los registros si la tabla no cambió.
     def get(self):
         """
         Obtener todos los proveedores
@@ -49,22 +65,17 @@ class ProveedorResource(Resource):
         Este método permite obtener una lista de todos los proveedores registrados en la base de datos.
 
         Responses:
-        - 200: Retorna una lista de proveedores.
+        - 200: Retorna una página de proveedores y el `next_cursor` para pedir la siguiente (null si no hay más).
+        - 304: Si el ETag enviado en If-None-Match (o la fecha de If-Modified-Since) sigue vigente.
         """
         # Llama al servicio para obtener todos los proveedores.
-        proveedores = ProveedorService.get_all_proveedores()
+        args = paginacion_parser.parse_args()  # Lee los parámetros de paginación de la URL.
+        proveedores, next_cursor = ProveedorService.get_all_proveedores(args['after'], args['limit'], ligero=True)
         # Devuelve una lista de proveedores en formato JSON.
-        return {
-            'proveedores': [
-                {
-                    'id_proveedor': p.id_proveedor,  # ID del proveedor.
-                    'nombre': p.nombre,  # Nombre del proveedor.
-                    'contacto': p.contacto,  # Nombre de contacto.
-                    'telefono': p.telefono,  # Teléfono del proveedor.
-                    'direccion': p.direccion  # Dirección del proveedor.
-                } for p in proveedores  # Itera sobre todos los proveedores.
-            ]
-        }, 200  # Respuesta exitosa.
+        return respuesta_json({
+            'proveedores': a_diccionarios(proveedores, CAMPOS_PROVEEDOR),
+            'next_cursor': next_cursor  # Cursor para pedir la siguiente página, None si no hay más.
+        })  # Respuesta exitosa.
 
 @proveedor_ns.route('/<int:id_proveedor>')  # Define la ruta para operaciones sobre un proveedor específico usando su ID.
 @proveedor_ns.param('id_proveedor', 'El ID del proveedor')  # Define el parámetro ID en la documentación.
@@ -0,0 +1,78 @@
+from flask_restx import Namespace, Resource, inputs, reqparse  # Importa las herramientas necesarias para crear una API RESTful.
+from app.services.reporte_service import AGRUPACIONES_COMPRAS, AGRUPACIONES_VENTAS, ReporteService  # Importa el servicio de reportes.
+from app.utils.condicional import condicional  # ETag y Last-Modified según la versión de las tablas.
+from app.utils.serializacion import respuesta_json  # Serialización rápida a JSON.
+
+# Crear un espacio de nombres (namespace) para los reportes, publicado en `/reportes`.
+reporte_ns = Namespace('Reportes', description='Reportes agregados calculados en la base de datos', path='/reportes')
+
+# Parámetros del reporte de ventas: rango de fechas, agrupación y estados que se cuentan.
+ventas_parser = reqparse.RequestParser()
+ventas_parser.add_argument('desde', type=inputs.date, location='args', required=False, help='Fecha de inicio mínima de las órdenes (YYYY-MM-DD)')
+ventas_parser.add_argument('hasta', type=inputs.date, location='args', required=False, help='Fecha de inicio máxima de las órdenes (YYYY-MM-DD)')
+ventas_parser.add_argument('agrupar', type=str, location='args', required=False, default='producto', choices=AGRUPACIONES_VENTAS, help='Agrupación: producto, cliente, dia o mes')
+ventas_parser.add_argument('solo_completadas', type=inputs.boolean, location='args', required=False, default=True, help='Si es true (por defecto), solo cuenta las órdenes completadas')
+
+# Parámetros del reporte de compras: rango de fechas, agrupación y estados que se cuentan.
+compras_parser = reqparse.RequestParser()
+compras_parser.add_argument('desde', type=inputs.date, location='args', required=False, help='Fecha de inicio mínima de las órdenes (YYYY-MM-DD)')
+compras_parser.add_argument('hasta', type=inputs.date, location='args', required=False, help='Fecha de inicio máxima de las órdenes (YYYY-MM-DD)')
+compras_parser.add_argument('agrupar', type=str, location='args', required=False, default='proveedor', choices=AGRUPACIONES_COMPRAS, help='Agrupación: proveedor o producto (por proveedor y producto)')
+compras_parser.add_argument('solo_completadas', type=inputs.boolean, location='args', required=False, default=True, help='Si es true (por defecto), solo cuenta las órdenes completadas')
+
+@reporte_ns.route('/ventas')  # Define la ruta del reporte de ventas.
+class ReporteVentasResource(Resource):
+    @reporte_ns.doc('get_reporte_ventas')  # Documenta la operación del reporte de ventas.
+    @reporte_ns.expect(ventas_parser)  # Documenta los parámetros del reporte.
+    @condicional('detalle_orden_venta', 'ordenes_venta', 'productos', 'clientes', 'resumen_ventas_diario')  # Responde 304 si las ventas no cambiaron.
+    def get(self):
+        """
+        Obtener el reporte de ventas
+        ---
+        Este método devuelve las unidades vendidas, los ingresos, el costo y el margen agrupados por
+        producto, cliente, día o mes, calculados con una sola consulta en la base de datos. Las órdenes completadas
+        agrupadas por producto, día o mes se leen del resumen diario de ventas.
+
+        Responses:
+        - 200: Retorna un grupo por fila con unidades, ingresos, costo y margen.
+        - 400: Si la agrupación o el rango de fechas no son válidos.
+        """
+        args = ventas_parser.parse_args()  # Lee los parámetros del reporte de la URL.
+        try:
+            grupos = ReporteService.get_reporte_ventas(
+                desde=args['desde'].date() if args['desde'] else None,  # inputs.date devuelve un datetime.
+                hasta=args['hasta'].date() if args['hasta'] else None,
+                agrupar=args['agrupar'],
+                solo_completadas=args['solo_completadas'],
+            )
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si un parámetro no es válido.
+        return respuesta_json({'agrupar': args['agrupar'], 'ventas': grupos})  # Respuesta exitosa.
+
+@reporte_ns.route('/compras')  # Define la ruta del reporte de compras.
+class ReporteComprasResource(Resource):
+    @reporte_ns.doc('get_reporte_compras')  # Documenta la operación del reporte de compras.
+    @reporte_ns.expect(compras_parser)  # Documenta los parámetros del reporte.
+    @condicional('detalle_orden_compra', 'ordenes_compra', 'productos', 'proveedores')  # Responde 304 si las compras no cambiaron.
+    def get(self):
+        """
+        Obtener el reporte de compras
+        ---
+        Este método devuelve el gasto y las unidades compradas por proveedor (o por proveedor y producto),
+        junto con el plazo de entrega promedio y sus percentiles 50 y 90 en días, calculados en la base de datos.
+
+        Responses:
+        - 200: Retorna un grupo por fila con órdenes, unidades, gasto y plazos de entrega.
+        - 400: Si la agrupación o el rango de fechas no son válidos.
+        """
+        args = compras_parser.parse_args()  # Lee los parámetros del reporte de la URL.
+        try:
+            grupos = ReporteService.get_reporte_compras(
+                desde=args['desde'].date() if args['desde'] else None,  # inputs.date devuelve un datetime.
+                hasta=args['hasta'].date() if args['hasta'] else None,
+                agrupar=args['agrupar'],
+                solo_completadas=args['solo_completadas'],
+            )
+        except ValueError as e:
+            return {'message': str(e)}, 400  # Respuesta de error si un parámetro no es válido.
+        return respuesta_json({'agrupar': args['agrupar'], 'compras': grupos})  # Respuesta exitosa.
@@ -1,4 +1,4 @@
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_jwt, get_jwt_identity
 from functools import wraps
 from flask import jsonify
 from app.services.user_service import UserService
@@ -6,6 +6,11 @@ from app.services.user_service import UserService
 def role_required(required_role):
     """
     Middleware personalizado para verificar si el usuario autenticado tiene un rol específico.
+
+    El rol se lee del claim "rol" del token JWT (se agrega al iniciar sesión), por lo que la
+    verificación no consulta la base de datos. Para detectar tokens revocados se compara además
+    con el estado actual del usuario, que se guarda en una caché de AUTH_REVOCACION_TTL segundos.
+    Se usa debajo de `@jwt_required()`, que valida el token.
     
     Args:
         required_role (str): El rol requerido que el usuario debe tener para acceder al recurso.
@@ -17,20 +22,21 @@ def role_required(required_role):
     def decorator(func):
         @wraps(func)  # Mantiene el nombre y la docstring original de la función decorada
         def wrapper(*args, **kwargs):
-            # Obtener el nombre de usuario (identity) del token JWT actual
-            username = get_jwt_identity()
-            
-            # Buscar el usuario en la base de datos por su nombre de usuario
-            user = UserService.get_user_by_username(username)
+            # Obtener el rol guardado en el token JWT actual
+            rol = get_jwt().get('rol')
             
-            # Verificar si el rol del usuario coincide con el rol requerido
-            if user.role.name != required_role:
+            # Verificar si el rol del token coincide con el rol requerido
+            if rol != required_role:
                 # Si el usuario no tiene el rol adecuado, se retorna un mensaje de error y un código de estado 403
                 return jsonify({"message": "Acceso denegado"}), 403
+
+            # Verificar que el usuario siga activo y con el mismo rol que cuando se emitió el token
+            estado = UserService.get_estado_usuario(get_jwt_identity())
+            if estado is None or not estado['activo'] or estado['rol'] != rol:
+                return jsonify({"message": "Token revocado"}), 401
             
             # Si el rol es correcto, continuar con la ejecución del endpoint
             return func(*args, **kwargs)
         
         return wrapper  # Retorna la función decorada con las verificaciones de rol
     return decorator  # Retorna el decorador
-
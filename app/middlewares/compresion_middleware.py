@@ -0,0 +1,113 @@
+import zlib
+from flask import request
+
+try:  # brotli es opcional: si no está instalado solo se ofrecen gzip y deflate.
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+# Codificaciones soportadas, en orden de preferencia cuando el cliente acepta varias con la misma calidad.
+CODIFICACIONES = ('br', 'gzip', 'deflate') if brotli else ('gzip', 'deflate')
+
+# Tipos de contenido que vale la pena comprimir (texto y JSON); las imágenes y binarios ya vienen comprimidos.
+TIPOS_COMPRIMIBLES = ('application/json', 'application/x-ndjson', 'application/javascript', 'application/xml')
+
+# Parámetro wbits de zlib para cada formato: 31 = encabezado gzip, 15 = encabezado zlib ("deflate" en HTTP).
+WBITS = {'gzip': 31, 'deflate': 15}
+
+
+class _Compresor:
+    """Interfaz común sobre zlib y brotli para comprimir un cuerpo por partes."""
+
+    def __init__(self, codificacion, nivel):
+        if codificacion == 'br':
+            self._compresor = brotli.Compressor(quality=min(nivel, 11))
+            self._parcial = lambda datos: self._compresor.process(datos) + self._compresor.flush()
+            self._final = self._compresor.finish
+        else:
+            self._compresor = zlib.compressobj(nivel, zlib.DEFLATED, WBITS[codificacion])
+            # Z_SYNC_FLUSH entrega al cliente todo lo comprimido hasta ahora, sin cerrar el flujo.
+            self._parcial = lambda datos: self._compresor.compress(datos) + self._compresor.flush(zlib.Z_SYNC_FLUSH)
+            self._final = self._compresor.flush
+
+    def parcial(self, datos):
+        """Comprimir una parte y devolver los bytes listos para enviar."""
+        return self._parcial(datos)
+
+    def final(self):
+        """Cerrar el flujo comprimido y devolver los bytes restantes."""
+        return self._final()
+
+
+def _es_comprimible(response):
+    """Indicar si el tipo de contenido de la respuesta se beneficia de la compresión."""
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in TIPOS_COMPRIMIBLES
+
+
+def _ajustar_etag(response, codificacion):
+    """
+    Agregar la codificación al ETag fuerte, porque la versión comprimida es otra representación.
+
+    `condicional` ignora este sufijo al comparar If-None-Match.
+    """
+    etag, debil = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{codificacion}', weak=debil)
+
+
+def _comprimir_stream(iterable, compresor):
+    """Comprimir un cuerpo en streaming parte por parte, sin acumularlo en memoria."""
+    for parte in iterable:
+        if parte:
+            yield compresor.parcial(parte)
+    yield compresor.final()
+
+
+def init_compresion(app):
+    """
+    Comprimir las respuestas según el encabezado Accept-Encoding del cliente.
+
+    Se usa brotli si está instalado y el cliente lo acepta, y si no gzip o deflate con zlib.
+    Las respuestas normales menores a COMPRESION_UMBRAL_BYTES se envían sin comprimir; las
+    respuestas en streaming (por ejemplo las exportaciones NDJSON) se comprimen bloque por bloque.
+
+    Args:
+        app (Flask): Aplicación en la que se registra la compresión.
+    """
+    @app.after_request
+    def comprimir(response):
+        if not _es_comprimible(response) or 'Content-Encoding' in response.headers:
+            return response
+        # La respuesta depende de Accept-Encoding: los proxies y cachés deben distinguir las variantes.
+        response.vary.add('Accept-Encoding')
+
+        codificacion = request.accept_encodings.best_match(CODIFICACIONES)
+        if not codificacion:
+            return response
+
+        # Un 304 no tiene cuerpo, pero debe repetir el ETag de la variante que el cliente ya tiene.
+        if response.status_code == 304:
+            etag, _ = response.get_etag()
+            if etag and request.if_none_match.contains(f'{etag}-{codificacion}'):
+                _ajustar_etag(response, codificacion)
+            return response
+
+        if response.status_code < 200 or response.status_code == 204 or request.method == 'HEAD':
+            return response
+
+        compresor = _Compresor(codificacion, app.config['COMPRESION_NIVEL'])
+        if response.is_streamed:
+            # El tamaño total no se conoce: se comprime cada bloque a medida que se genera.
+            response.response = _comprimir_stream(response.iter_encoded(), compresor)
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+        else:
+            datos = response.get_data()
+            if len(datos) < app.config['COMPRESION_UMBRAL_BYTES']:
+                return response  # En respuestas chicas la compresión cuesta más de lo que ahorra.
+            response.set_data(compresor.parcial(datos) + compresor.final())
+
+        response.headers['Content-Encoding'] = codificacion
+        _ajustar_etag(response, codificacion)
+        return response
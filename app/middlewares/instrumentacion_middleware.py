@@ -0,0 +1,74 @@
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app import db
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    """
+    Guardar el momento en que empieza la consulta en su contexto de ejecución.
+
+    El contexto pertenece a una sola sentencia: si falla y `after_cursor_execute` no se ejecuta,
+    no queda ningún valor pendiente en la conexión que se empareje con la consulta siguiente.
+    """
+    context._inicio_consulta = time.perf_counter()
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    """Sumar la consulta y su duración a los contadores de la petición en curso."""
+    inicio = context._inicio_consulta
+    # Las consultas hechas fuera de una petición (comandos de consola, scripts) no se cuentan.
+    if not has_request_context():
+        return
+    g.db_consultas = g.get('db_consultas', 0) + 1
+    g.db_tiempo = g.get('db_tiempo', 0.0) + (time.perf_counter() - inicio)
+
+
+def init_instrumentacion(app):
+    """
+    Registrar la instrumentación de consultas SQL y tiempos por petición.
+
+    Cuenta las consultas y acumula el tiempo de base de datos de cada petición mediante los
+    eventos del engine de SQLAlchemy, los expone en los encabezados `X-DB-Queries` y
+    `Server-Timing`, y registra como advertencia las peticiones que superan los umbrales
+    INSTRUMENTACION_UMBRAL_CONSULTAS o INSTRUMENTACION_UMBRAL_MS.
+
+    En las respuestas en streaming solo se cuentan las consultas hechas antes de empezar a enviar el cuerpo.
+
+    Args:
+        app (Flask): Aplicación en la que se registra la instrumentación.
+    """
+    # Los engines de Flask-SQLAlchemy se crean por aplicación y solo son accesibles dentro de su contexto.
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _antes_de_ejecutar)
+            event.listen(engine, 'after_cursor_execute', _despues_de_ejecutar)
+
+    @app.before_request
+    def iniciar_medicion():
+        g.inicio_peticion = time.perf_counter()
+        g.db_consultas = 0
+        g.db_tiempo = 0.0
+
+    @app.after_request
+    def agregar_encabezados(response):
+        # Si la petición falló antes de before_request no hay nada que medir.
+        if 'inicio_peticion' not in g:
+            return response
+
+        total_ms = (time.perf_counter() - g.inicio_peticion) * 1000
+        db_ms = g.db_tiempo * 1000
+        response.headers['X-DB-Queries'] = str(g.db_consultas)
+        response.headers['Server-Timing'] = (
+            f'db;dur={db_ms:.1f};desc="{g.db_consultas} consultas", total;dur={total_ms:.1f}'
+        )
+
+        # Deja constancia de las peticiones lentas o con demasiadas consultas (posibles N+1).
+        if (g.db_consultas > app.config['INSTRUMENTACION_UMBRAL_CONSULTAS']
+                or total_ms > app.config['INSTRUMENTACION_UMBRAL_MS']):
+            app.logger.warning(
+                'Petición lenta: %s %s -> %s | %d consultas | db %.1f ms | total %.1f ms',
+                request.method, request.full_path.rstrip('?'), response.status_code,
+                g.db_consultas, db_ms, total_ms,
+            )
+        return response
@@ -0,0 +1,377 @@
+import atexit
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, request
+from app import db
+
+try:  # fcntl solo existe en Unix, donde corren los servidores con varios workers (por ejemplo gunicorn).
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Límites superiores (en segundos) de los buckets del histograma de latencia.
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Tipo MIME del formato de texto de Prometheus.
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Archivo del directorio multiproceso con los contadores acumulados de los procesos que ya terminaron.
+ARCHIVO_TERMINADOS = 'metricas_terminados.json'
+
+# Última instancia de Metricas creada en este proceso: la que se reinicia en los hijos creados con fork.
+_actual = None
+# os.register_at_fork no permite quitar hooks, así que se registra uno solo por proceso.
+_fork_registrado = False
+
+
+class Metricas:
+    """
+    Contadores de peticiones y latencias con un diccionario por hilo.
+
+    Cada hilo solo escribe en sus propios diccionarios, por lo que el registro de una petición
+    no necesita locks; los diccionarios de todos los hilos se combinan al momento de exportar.
+    Los contadores de los hilos que terminaron se suman a un total compartido y se dejan de
+    seguir, de modo que un servidor con un hilo por petición no acumula diccionarios.
+    Si se indica un directorio, cada proceso además vuelca periódicamente sus contadores a un
+    archivo JSON propio y la exportación suma los archivos de todos los procesos; al terminar,
+    el proceso suma sus contadores a ARCHIVO_TERMINADOS y elimina su archivo.
+    """
+
+    def __init__(self, directorio=None, intervalo_escritura=5.0):
+        self.directorio = directorio
+        self.intervalo_escritura = intervalo_escritura
+        self._local = threading.local()
+        self._hilos = {}  # Contadores de cada hilo vivo, por ident: (hilo, (peticiones, latencias)).
+        self._terminados = ({}, {})  # Contadores acumulados de los hilos que ya terminaron.
+        self._lock_registro = threading.Lock()  # Solo se usa la primera vez que un hilo registra una petición y al exportar.
+        self._lock_escritura = threading.Lock()
+        self._ultima_escritura = time.monotonic()
+        self._pid = os.getpid()
+        # Un worker creado con fork hereda los contadores del proceso padre: se reinician en el hijo.
+        global _actual, _fork_registrado
+        _actual = self
+        if not _fork_registrado:
+            os.register_at_fork(after_in_child=_reiniciar_en_hijo)
+            _fork_registrado = True
+
+    def _reiniciar(self):
+        """Descartar los contadores heredados del proceso padre."""
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._hilos = {}
+        self._terminados = ({}, {})
+        self._lock_registro = threading.Lock()
+        self._lock_escritura = threading.Lock()
+
+    def _contadores(self):
+        """Obtener los diccionarios del hilo actual, creándolos la primera vez."""
+        contadores = getattr(self._local, 'contadores', None)
+        if contadores is None:
+            contadores = ({}, {})
+            with self._lock_registro:
+                # También libera el ident de un hilo terminado que el sistema haya reutilizado para este.
+                self._acumular_hilos_terminados()
+                self._hilos[threading.get_ident()] = (threading.current_thread(), contadores)
+            self._local.contadores = contadores
+        return contadores
+
+    def _acumular_hilos_terminados(self):
+        """Sumar al total los contadores de los hilos que terminaron y dejar de seguirlos (con _lock_registro tomado)."""
+        for ident, (hilo, contadores) in list(self._hilos.items()):
+            if not hilo.is_alive():
+                _sumar_contadores(self._terminados, contadores)
+                del self._hilos[ident]
+
+    def registrar(self, namespace, metodo, estado, duracion):
+        """
+        Registrar una petición terminada.
+
+        Args:
+            namespace (str): Namespace (primer segmento de la ruta) que atendió la petición.
+            metodo (str): Método HTTP.
+            estado (int): Código de estado de la respuesta.
+            duracion (float): Duración de la petición en segundos.
+        """
+        peticiones, latencias = self._contadores()
+        clave = (namespace, metodo, str(estado))
+        peticiones[clave] = peticiones.get(clave, 0) + 1
+
+        clave = (namespace, metodo)
+        histograma = latencias.get(clave)
+        if histograma is None:
+            # Un contador por bucket, más el bucket +Inf, la suma y la cantidad de observaciones.
+            histograma = latencias[clave] = [0] * (len(BUCKETS_LATENCIA) + 1) + [0.0, 0]
+        histograma[bisect.bisect_left(BUCKETS_LATENCIA, duracion)] += 1
+        histograma[-2] += duracion
+        histograma[-1] += 1
+
+        if self.directorio:
+            self._escribir_si_corresponde()
+
+    def instantanea(self):
+        """
+        Combinar los contadores de todos los hilos de este proceso.
+
+        Returns:
+            tuple: (peticiones, latencias) con el mismo formato que los diccionarios de cada hilo.
+        """
+        totales = ({}, {})
+        with self._lock_registro:
+            self._acumular_hilos_terminados()
+            hilos = [contadores for _, contadores in self._hilos.values()]
+            _sumar_contadores(totales, self._terminados)
+        for peticiones_hilo, latencias_hilo in hilos:
+            # dict.copy() es atómico con el GIL, por lo que no hace falta bloquear al hilo que escribe.
+            _sumar_contadores(totales, (peticiones_hilo.copy(), latencias_hilo.copy()))
+        return totales
+
+    def _archivo(self):
+        """Ruta del archivo de métricas de este proceso."""
+        return os.path.join(self.directorio, f'metricas_{self._pid}.json')
+
+    def _escribir_si_corresponde(self):
+        """Volcar los contadores a disco si pasó el intervalo, sin hacer esperar a ninguna petición."""
+        if time.monotonic() - self._ultima_escritura < self.intervalo_escritura:
+            return
+        # Si otro hilo ya está escribiendo, esta petición sigue de largo.
+        if not self._lock_escritura.acquire(blocking=False):
+            return
+        try:
+            self.escribir_archivo()
+        finally:
+            self._lock_escritura.release()
+
+    def escribir_archivo(self):
+        """Guardar los contadores de este proceso en su archivo, reemplazándolo de forma atómica."""
+        self._ultima_escritura = time.monotonic()
+        os.makedirs(self.directorio, exist_ok=True)
+        self._guardar(self._archivo(), self.instantanea())
+
+    def _guardar(self, ruta, contadores):
+        """Guardar contadores en un archivo JSON, reemplazándolo de forma atómica."""
+        peticiones, latencias = contadores
+        datos = {
+            'peticiones': [list(clave) + [valor] for clave, valor in peticiones.items()],
+            'latencias': [list(clave) + [valores] for clave, valores in latencias.items()],
+        }
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as archivo:
+            json.dump(datos, archivo)
+        # os.replace es atómico: quien lea el archivo ve la versión anterior o la nueva, nunca una a medias.
+        os.replace(temporal, ruta)
+
+    @contextmanager
+    def _bloqueo_directorio(self, exclusivo):
+        """
+        Bloquear el directorio multiproceso entre procesos: exclusivo para mover los contadores de un
+        proceso que termina a ARCHIVO_TERMINADOS, compartido para leerlos sin contarlos dos veces.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        with open(os.path.join(self.directorio, 'metricas.lock'), 'a') as archivo:
+            fcntl.flock(archivo, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(archivo, fcntl.LOCK_UN)
+
+    def cerrar(self):
+        """Al terminar el proceso, sumar sus contadores a ARCHIVO_TERMINADOS y eliminar su archivo."""
+        terminados = os.path.join(self.directorio, ARCHIVO_TERMINADOS)
+        with self._bloqueo_directorio(exclusivo=True):
+            totales = self.instantanea()
+            _sumar_contadores(totales, _leer_archivo(terminados) or ({}, {}))
+            self._guardar(terminados, totales)
+            try:
+                os.remove(self._archivo())
+            except FileNotFoundError:
+                pass
+
+    def instantanea_global(self):
+        """
+        Combinar los contadores en vivo de este proceso con los archivos de los demás procesos.
+
+        Returns:
+            tuple: (peticiones, latencias) de todos los procesos.
+        """
+        peticiones, latencias = self.instantanea()
+        if not self.directorio or not os.path.isdir(self.directorio):
+            return peticiones, latencias
+
+        totales = (peticiones, latencias)
+        with self._bloqueo_directorio(exclusivo=False):
+            for nombre in os.listdir(self.directorio):
+                # El archivo de este proceso se ignora porque ya se usaron sus contadores en vivo.
+                if not nombre.startswith('metricas_') or not nombre.endswith('.json') or nombre == os.path.basename(self._archivo()):
+                    continue
+                contadores = _leer_archivo(os.path.join(self.directorio, nombre))
+                if contadores is not None:  # Archivo borrado o ilegible: se omite en esta exportación.
+                    _sumar_contadores(totales, contadores)
+        return totales
+
+
+def _reiniciar_en_hijo():
+    """Hook de fork: descartar en el proceso hijo los contadores heredados de la instancia actual."""
+    if _actual is not None:
+        _actual._reiniciar()
+
+
+def _leer_archivo(ruta):
+    """Leer los contadores de un archivo de métricas; None si no existe o no se puede leer."""
+    try:
+        with open(ruta) as archivo:
+            datos = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    return (
+        {tuple(clave): valor for *clave, valor in datos['peticiones']},
+        {tuple(clave): valores for *clave, valores in datos['latencias']},
+    )
+
+
+def _sumar_contadores(destino, origen):
+    """Sumar unos contadores (peticiones, latencias) a otros."""
+    for clave, valor in origen[0].items():
+        destino[0][clave] = destino[0].get(clave, 0) + valor
+    for clave, valores in origen[1].items():
+        _sumar_histograma(destino[1], clave, valores)
+
+
+def _sumar_histograma(latencias, clave, valores):
+    """Sumar un histograma a otro, creándolo si todavía no existe."""
+    actual = latencias.get(clave)
+    if actual is None:
+        latencias[clave] = list(valores)
+    else:
+        for i, valor in enumerate(valores):
+            actual[i] += valor
+
+
+def _etiquetas(**etiquetas):
+    """Formatear las etiquetas de una muestra, escapando los caracteres especiales del formato de Prometheus."""
+    partes = []
+    for nombre, valor in etiquetas.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{nombre}="{valor}"')
+    return '{' + ','.join(partes) + '}'
+
+
+def _namespace_actual():
+    """Obtener el namespace de la petición a partir de la regla de ruta (no de la URL, para no crear una serie por ID)."""
+    if request.url_rule is None:
+        return 'sin_ruta'
+    segmento = request.url_rule.rule.strip('/').split('/', 1)[0]
+    return segmento or 'raiz'
+
+
+def _lineas_pool():
+    """Generar los gauges del pool de conexiones de cada engine."""
+    lineas = []
+    metricas_pool = (
+        ('db_pool_size', 'Tamaño configurado del pool de conexiones', 'size'),
+        ('db_pool_checked_out', 'Conexiones del pool en uso', 'checkedout'),
+        ('db_pool_checked_in', 'Conexiones del pool disponibles', 'checkedin'),
+        ('db_pool_overflow', 'Conexiones abiertas por encima del tamaño del pool', 'overflow'),
+    )
+    engines = db.engines
+    for nombre, descripcion, metodo in metricas_pool:
+        muestras = []
+        for clave, engine in engines.items():
+            # Solo QueuePool y sus variantes informan estos valores (SQLite en memoria no usa pool).
+            if hasattr(engine.pool, metodo):
+                muestras.append(f'{nombre}{_etiquetas(engine=clave or "default")} {getattr(engine.pool, metodo)()}')
+        if muestras:
+            lineas += [f'# HELP {nombre} {descripcion}', f'# TYPE {nombre} gauge'] + muestras
+    return lineas
+
+
+def _lineas_cache():
+    """Generar los contadores de aciertos y fallos de las cachés de la aplicación."""
+    caches = current_app.extensions.get('caches', {})
+    lineas = []
+    for nombre, descripcion, atributo in (
+        ('cache_hits_total', 'Lecturas servidas desde la caché', 'aciertos'),
+        ('cache_misses_total', 'Lecturas que tuvieron que ir a la base de datos', 'fallos'),
+    ):
+        if caches:
+            lineas += [f'# HELP {nombre} {descripcion}', f'# TYPE {nombre} counter']
+            lineas += [f'{nombre}{_etiquetas(cache=clave)} {getattr(cache, atributo)}' for clave, cache in caches.items()]
+    return lineas
+
+
+def exportar(metricas):
+    """
+    Generar el texto de las métricas en el formato de exposición de Prometheus.
+
+    Args:
+        metricas (Metricas): Contadores de la aplicación.
+
+    Returns:
+        str: Métricas en formato de texto.
+    """
+    peticiones, latencias = metricas.instantanea_global()
+
+    lineas = [
+        '# HELP http_requests_total Cantidad de peticiones HTTP atendidas',
+        '# TYPE http_requests_total counter',
+    ]
+    for (namespace, metodo, estado), valor in sorted(peticiones.items()):
+        lineas.append(f'http_requests_total{_etiquetas(namespace=namespace, method=metodo, status=estado)} {valor}')
+
+    lineas += [
+        '# HELP http_request_duration_seconds Duración de las peticiones HTTP en segundos',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (namespace, metodo), valores in sorted(latencias.items()):
+        acumulado = 0
+        # Prometheus espera buckets acumulativos: cada uno incluye a los anteriores.
+        for limite, cantidad in zip(BUCKETS_LATENCIA + ('+Inf',), valores):
+            acumulado += cantidad
+            lineas.append(f'http_request_duration_seconds_bucket{_etiquetas(namespace=namespace, method=metodo, le=limite)} {acumulado}')
+        lineas.append(f'http_request_duration_seconds_sum{_etiquetas(namespace=namespace, method=metodo)} {valores[-2]}')
+        lineas.append(f'http_request_duration_seconds_count{_etiquetas(namespace=namespace, method=metodo)} {valores[-1]}')
+
+    lineas += _lineas_pool()
+    lineas += _lineas_cache()
+    return '\n'.join(lineas) + '\n'
+
+
+def init_metricas(app):
+    """
+    Registrar la recolección de métricas y el endpoint `/metrics`.
+
+    Si METRICAS_DIRECTORIO_MULTIPROCESO está configurado, los contadores de todos los
+    procesos (por ejemplo los workers de gunicorn) se combinan a través de ese directorio.
+
+    Args:
+        app (Flask): Aplicación en la que se registran las métricas.
+    """
+    metricas = Metricas(app.config['METRICAS_DIRECTORIO_MULTIPROCESO'], app.config['METRICAS_INTERVALO_ESCRITURA'])
+    app.extensions['metricas'] = metricas
+    if metricas.directorio:
+        # Al terminar el proceso sus contadores pasan al archivo de procesos terminados y se elimina su archivo.
+        atexit.register(metricas.cerrar)
+
+    @app.before_request
+    def iniciar_metricas():
+        g.metricas_inicio = time.perf_counter()
+
+    @app.after_request
+    def registrar_metricas(response):
+        if 'metricas_inicio' in g:
+            metricas.registrar(_namespace_actual(), request.method, response.status_code,
+                               time.perf_counter() - g.metricas_inicio)
+        return response
+
+    def metrics():
+        """Exponer las métricas de la aplicación en formato Prometheus."""
+        return Response(exportar(current_app.extensions['metricas']), mimetype=PROMETHEUS_MIMETYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
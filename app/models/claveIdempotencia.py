@@ -0,0 +1,48 @@
+from app import db
+
+class ClaveIdempotencia(db.Model):
+    """
+    Modelo que guarda la respuesta de cada petición POST enviada con el encabezado Idempotency-Key.
+
+    Si el cliente reintenta la petición con la misma clave, se devuelve la respuesta guardada sin
+    volver a ejecutar el servicio. Las filas vencen después de IDEMPOTENCIA_TTL segundos y se
+    eliminan con `flask idempotencia purgar`.
+
+    Atributos:
+        - clave (str): Valor del encabezado Idempotency-Key (clave primaria).
+        - huella (str): SHA-256 del método, la ruta y el cuerpo de la petición original.
+        - estado (str): "en_proceso" mientras se ejecuta la petición original, "completado" cuando hay respuesta.
+        - reservada (datetime): Momento (UTC, en segundos enteros) en que la petición en proceso tomó la clave;
+          identifica a su dueña y vence después de IDEMPOTENCIA_RESERVA segundos.
+        - codigo (int): Código de estado HTTP de la respuesta guardada.
+        - cuerpo (bytes): Cuerpo de la respuesta guardada.
+        - encabezados (dict): Encabezados de la respuesta guardada que se repiten (ETag, Location, Retry-After...).
+        - expira (datetime): Momento (UTC) a partir del cual la clave deja de tener efecto.
+    """
+
+    __tablename__ = 'claves_idempotencia'  # Nombre de la tabla en la base de datos.
+
+    clave = db.Column(db.String(100), primary_key=True)  # Clave enviada por el cliente.
+    huella = db.Column(db.String(64), nullable=False)  # Huella de la petición original.
+    estado = db.Column(db.Enum('en_proceso', 'completado'), nullable=False)  # Estado de la petición original.
+    reservada = db.Column(db.DateTime, nullable=True)  # Inicio de la reserva de la petición en proceso, en UTC.
+    codigo = db.Column(db.SmallInteger, nullable=True)  # Código HTTP de la respuesta.
+    cuerpo = db.Column(db.LargeBinary, nullable=True)  # Cuerpo JSON de la respuesta.
+    encabezados = db.Column(db.JSON, nullable=True)  # Encabezados de la respuesta que se repiten.
+    expira = db.Column(db.DateTime, nullable=False)  # Vencimiento de la clave, en UTC.
+
+    # Índice para eliminar las claves vencidas sin recorrer toda la tabla.
+    __table_args__ = (
+        db.Index('ix_claves_idempotencia_expira', 'expira'),
+    )
+
+    def __init__(self, clave, huella, estado, expira, codigo=None, cuerpo=None, reservada=None, encabezados=None):
+        # Esta función inicializa los valores de la clave cuando se crea un nuevo registro.
+        self.clave = clave
+        self.huella = huella
+        self.estado = estado
+        self.expira = expira
+        self.reservada = reservada
+        self.codigo = codigo
+        self.cuerpo = cuerpo
+        self.encabezados = encabezados
@@ -44,6 +44,12 @@ class DetalleOrdenCompra(db.Model):
         "Producto", backref=db.backref("detalles_compra", lazy=True)
     )
 
+    # Índices para buscar los detalles de una orden y las compras de un producto por orden.
+    __table_args__ = (
+        db.Index("ix_detalle_orden_compra_id_orden_compra", "id_orden_compra"),
+        db.Index("ix_detalle_orden_compra_producto_orden", "id_producto", "id_orden_compra"),
+    )
+
     def __init__(self, id_orden_compra, id_producto, cantidad):
         # Esta función inicializa los valores del detalle de orden de compra cuando se crea un nuevo registro.
         self.id_orden_compra = id_orden_compra
@@ -31,6 +31,12 @@ class DetalleOrdenVenta(db.Model):
     # Relación con la tabla Producto. Cada detalle de orden está vinculado a un producto específico.
     producto = db.relationship('Producto', backref=db.backref('detalles_venta', lazy=True))
 
+    # Índices para buscar los detalles de una orden y las ventas de un producto por orden.
+    __table_args__ = (
+        db.Index('ix_detalle_orden_venta_id_orden_venta', 'id_orden_venta'),
+        db.Index('ix_detalle_orden_venta_producto_orden', 'id_producto', 'id_orden_venta'),
+    )
+
     def __init__(self, id_orden_venta, id_producto, cantidad):
         # Esta función inicializa los valores del detalle de orden de venta cuando se crea un nuevo registro.
         self.id_orden_venta = id_orden_venta
@@ -0,0 +1,40 @@
+from app import db
+
+class MovimientoStock(db.Model):
+    """
+    Modelo que representa un movimiento de stock en el libro de movimientos (solo se agregan filas).
+
+    Cada vez que cambia la cantidad disponible de un producto se registra un movimiento con la
+    diferencia aplicada. Junto con los snapshots periódicos permite saber el stock de un producto
+    en cualquier fecha sin recorrer todos los detalles de órdenes.
+
+    Atributos:
+        - id_movimiento (int): Identificador único del movimiento (clave primaria).
+        - id_producto (int): Identificador del producto cuyo stock cambió.
+        - fecha (date): Fecha en que se aplicó el movimiento.
+        - cantidad (int): Unidades sumadas (positivo) o restadas (negativo) al stock.
+        - tipo (str): Origen del movimiento: "venta", "compra" o "ajuste".
+    """
+
+    __tablename__ = 'movimiento_stock'  # Nombre de la tabla en la base de datos.
+
+    id_movimiento = db.Column(db.Integer, primary_key=True, autoincrement=True)  # Clave primaria, autoincremental.
+
+    # No se declara clave foránea para conservar el historial aunque el producto se elimine.
+    id_producto = db.Column(db.Integer, nullable=False)
+
+    fecha = db.Column(db.Date, nullable=False)  # Fecha del movimiento.
+    cantidad = db.Column(db.Integer, nullable=False)  # Diferencia aplicada al stock.
+    tipo = db.Column(db.Enum('venta', 'compra', 'ajuste'), nullable=False)  # Origen del movimiento.
+
+    # Índice para recorrer los movimientos de un producto en un rango de fechas.
+    __table_args__ = (
+        db.Index('ix_movimiento_stock_producto_fecha', 'id_producto', 'fecha'),
+    )
+
+    def __init__(self, id_producto, fecha, cantidad, tipo):
+        # Esta función inicializa los valores del movimiento cuando se crea un nuevo registro.
+        self.id_producto = id_producto
+        self.fecha = fecha
+        self.cantidad = cantidad
+        self.tipo = tipo
@@ -12,6 +12,7 @@ class OrdenCompra(db.Model):
         - fecha_final (date): La fecha en que la orden de compra finalizó.
         - estado (str): Indica en qué estado está la orden, como "completado", "pendiente" o "cancelado".
         - id_proveedor (int): El identificador del proveedor asociado a la orden (clave foránea), que conecta con la tabla de proveedores.
+        - version (int): Versión del registro; aumenta con cada modificación (control de concurrencia optimista).
     """
     
     __tablename__ = 'ordenes_compra'  # Nombre de la tabla en la base de datos.
@@ -29,6 +30,17 @@ class OrdenCompra(db.Model):
     # La relación con el modelo Proveedor, lo que permite acceder a los datos del proveedor desde la orden de compra.
     proveedor = db.relationship('Proveedor', backref=db.backref('ordenes_compra', lazy=True))  
 
+    # Versión del registro: el ORM la incrementa en cada UPDATE y la incluye en el WHERE, de modo que
+    # si otra transacción modificó la orden después de leerla el UPDATE falla con StaleDataError.
+    version = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {'version_id_col': version}
+
+    # Índices para los filtros más comunes: por estado y rango de fechas, y por proveedor.
+    __table_args__ = (
+        db.Index('ix_ordenes_compra_estado_fecha_inicio', 'estado', 'fecha_inicio'),
+        db.Index('ix_ordenes_compra_id_proveedor', 'id_proveedor'),
+    )
+
     def __init__(self, fecha_inicio, fecha_final, estado, id_proveedor):
         # Esta es la función que se ejecuta cuando se crea una nueva instancia de OrdenCompra.
         # Se inicializan las fechas, el estado y el proveedor.
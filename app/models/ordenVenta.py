@@ -12,6 +12,7 @@ class OrdenVenta(db.Model):
         - fecha_final (date): La fecha en que la orden de venta finalizó.
         - estado (str): Indica en qué estado está la orden, como si está "completado", "pendiente" o "cancelado".
         - id_cliente (int): El identificador del cliente al que pertenece esta orden de venta. Este campo es una clave foránea (foreign key), lo que significa que se relaciona con la tabla de clientes.
+        - version (int): Versión del registro; aumenta con cada modificación (control de concurrencia optimista).
     """
     
     __tablename__ = 'ordenes_venta'  # Nombre de la tabla en la base de datos que almacenará las órdenes de venta.
@@ -31,6 +32,17 @@ class OrdenVenta(db.Model):
     # El parámetro backref permite acceder a todas las órdenes de venta desde el modelo Cliente.
     cliente = db.relationship('Cliente', backref=db.backref('ordenes_venta', lazy=True))  
 
+    # Versión del registro: el ORM la incrementa en cada UPDATE y la incluye en el WHERE, de modo que
+    # si otra transacción modificó la orden después de leerla el UPDATE falla con StaleDataError.
+    version = db.Column(db.Integer, nullable=False, default=1)
+    __mapper_args__ = {'version_id_col': version}
+
+    # Índices para los filtros más comunes: por estado y rango de fechas, y por cliente.
+    __table_args__ = (
+        db.Index('ix_ordenes_venta_estado_fecha_inicio', 'estado', 'fecha_inicio'),
+        db.Index('ix_ordenes_venta_id_cliente', 'id_cliente'),
+    )
+
     def __init__(self, fecha_inicio, fecha_final, estado, id_cliente):
         # Esta es la función que se ejecuta cuando se crea una nueva instancia de OrdenVenta.
         # Se le pasan los datos necesarios para inicializar el objeto (fecha de inicio, fecha final, estado y cliente).
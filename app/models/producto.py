@@ -12,6 +12,7 @@ class Producto(db.Model):
         costo (float): Costo del producto.
         precio_venta (float): Precio de venta del producto.
         cantidad (int): Cantidad disponible del producto.
+        version (int): Versión del registro; aumenta con cada modificación (control de concurrencia optimista).
     """
     
     __tablename__ = 'productos'
@@ -21,6 +22,11 @@ class Producto(db.Model):
     costo = db.Column(db.Numeric(10, 2), nullable=True)
     precio_venta = db.Column(db.Numeric(10, 2), nullable=True)
     cantidad = db.Column(db.Integer, nullable=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    # El ORM incrementa `version` en cada UPDATE y lo incluye en el WHERE: si otra transacción
+    # modificó el producto después de leerlo, el UPDATE no afecta filas y se lanza StaleDataError.
+    __mapper_args__ = {'version_id_col': version}
 
     def __init__(self, nombre, costo, precio_venta, cantidad):
         self.nombre = nombre
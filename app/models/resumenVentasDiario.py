@@ -0,0 +1,29 @@
+from app import db
+
+class ResumenVentasDiario(db.Model):
+    """
+    Modelo que guarda las unidades vendidas de cada producto por día.
+
+    Es un resumen de `detalle_orden_venta` que solo cuenta las órdenes completadas, agrupadas por
+    la fecha de inicio de la orden. Los servicios de detalles y órdenes de venta lo actualizan en la
+    misma transacción de cada cambio, y los reportes lo leen en lugar de recorrer todas las líneas.
+
+    Atributos:
+        - fecha (date): Fecha de inicio de las órdenes (parte de la clave primaria).
+        - id_producto (int): Identificador del producto (parte de la clave primaria).
+        - unidades (int): Unidades vendidas del producto en esa fecha.
+    """
+
+    __tablename__ = 'resumen_ventas_diario'  # Nombre de la tabla en la base de datos.
+
+    # La clave primaria compuesta (fecha, id_producto) sirve también como índice para los rangos de fechas.
+    # No hay clave foránea a productos: es una tabla derivada y no debe impedir borrar un producto.
+    fecha = db.Column(db.Date, primary_key=True)
+    id_producto = db.Column(db.Integer, primary_key=True)
+    unidades = db.Column(db.Integer, nullable=False, default=0)  # Unidades vendidas en la fecha.
+
+    def __init__(self, fecha, id_producto, unidades=0):
+        # Esta función inicializa los valores del resumen cuando se crea un nuevo registro.
+        self.fecha = fecha
+        self.id_producto = id_producto
+        self.unidades = unidades
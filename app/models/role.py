@@ -0,0 +1,21 @@
+from app import db
+
+class Role(db.Model):
+    """
+    Modelo que representa un rol de usuario (por ejemplo "admin" o "usuario").
+
+    El nombre del rol se copia en el token JWT al iniciar sesión, por lo que `role_required`
+    puede verificarlo sin consultar la base de datos.
+
+    Atributos:
+        id_rol (int): Identificador único del rol (clave primaria).
+        name (str): Nombre del rol, único.
+    """
+
+    __tablename__ = 'roles'
+
+    id_rol = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+    def __init__(self, name):
+        self.name = name
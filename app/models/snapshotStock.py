@@ -0,0 +1,27 @@
+from app import db
+
+class SnapshotStock(db.Model):
+    """
+    Modelo que representa el stock de un producto al final de una fecha.
+
+    Los snapshots se generan periódicamente a partir del libro de movimientos. Para conocer el
+    stock en una fecha basta con el último snapshot anterior y los movimientos posteriores a él.
+
+    Atributos:
+        - id_producto (int): Identificador del producto (parte de la clave primaria).
+        - fecha (date): Fecha del snapshot (parte de la clave primaria).
+        - cantidad (int): Stock del producto al final de esa fecha.
+    """
+
+    __tablename__ = 'snapshot_stock'  # Nombre de la tabla en la base de datos.
+
+    # La clave primaria compuesta (id_producto, fecha) sirve también como índice de búsqueda.
+    id_producto = db.Column(db.Integer, primary_key=True)
+    fecha = db.Column(db.Date, primary_key=True)
+    cantidad = db.Column(db.Integer, nullable=False)  # Stock al final de la fecha.
+
+    def __init__(self, id_producto, fecha, cantidad):
+        # Esta función inicializa los valores del snapshot cuando se crea un nuevo registro.
+        self.id_producto = id_producto
+        self.fecha = fecha
+        self.cantidad = cantidad
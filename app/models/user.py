@@ -0,0 +1,32 @@
+from app import db
+
+class User(db.Model):
+    """
+    Modelo que representa un usuario de la API.
+
+    Cada usuario tiene un nombre de usuario único, el hash bcrypt de su contraseña y un rol.
+
+    Atributos:
+        id_usuario (int): Identificador único del usuario (clave primaria).
+        username (str): Nombre de usuario, único; es la identidad del token JWT.
+        password_hash (str): Hash bcrypt de la contraseña.
+        id_rol (int): Identificador del rol del usuario (clave foránea a roles).
+        activo (bool): Si es False, el usuario no puede iniciar sesión y sus tokens dejan de ser válidos.
+    """
+
+    __tablename__ = 'usuarios'
+
+    id_usuario = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    username = db.Column(db.String(80), nullable=False, unique=True)
+    password_hash = db.Column(db.String(128), nullable=False)
+    id_rol = db.Column(db.Integer, db.ForeignKey('roles.id_rol'), nullable=False)
+    activo = db.Column(db.Boolean, nullable=False, default=True)
+
+    # Relación con la tabla Role. Cada usuario tiene un rol.
+    role = db.relationship('Role', backref=db.backref('usuarios', lazy=True))
+
+    def __init__(self, username, password_hash, id_rol, activo=True):
+        self.username = username
+        self.password_hash = password_hash
+        self.id_rol = id_rol
+        self.activo = activo
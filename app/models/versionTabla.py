@@ -0,0 +1,27 @@
+from app import db
+
+class VersionTabla(db.Model):
+    """
+    Modelo que guarda un contador de versión por tabla.
+
+    El contador se incrementa en la misma transacción que modifica la tabla, por lo que
+    leer una sola fila alcanza para saber si el contenido de la tabla cambió. Se usa para
+    generar los ETag de los endpoints de listado sin consultar los registros.
+
+    Atributos:
+        - tabla (str): Nombre de la tabla (clave primaria).
+        - version (int): Contador que aumenta con cada transacción que modifica la tabla.
+        - actualizado (datetime): Fecha y hora (UTC) de la última modificación.
+    """
+
+    __tablename__ = 'versiones_tabla'  # Nombre de la tabla en la base de datos.
+
+    tabla = db.Column(db.String(64), primary_key=True)  # Nombre de la tabla versionada.
+    version = db.Column(db.BigInteger, nullable=False, default=0)  # Versión actual de la tabla.
+    actualizado = db.Column(db.DateTime, nullable=True)  # Momento de la última modificación, en UTC.
+
+    def __init__(self, tabla, version=0, actualizado=None):
+        # Esta función inicializa los valores de la versión cuando se crea un nuevo registro.
+        self.tabla = tabla
+        self.version = version
+        self.actualizado = actualizado
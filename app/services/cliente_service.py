@@ -1,5 +1,18 @@
+from sqlalchemy import select  # Importa select para las consultas por columnas.
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.cliente import Cliente  # Importa el modelo Cliente.
+from app.utils.escritura import actualizar, eliminar, valores_actualizables  # Importa los helpers de UPDATE y DELETE en una sola sentencia.
+from app.utils.paginacion import paginar  # Importa el helper de paginación por cursor.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    Cliente.id_cliente,
+    Cliente.nombre,
+    Cliente.contacto,
+    Cliente.telefono,
+    Cliente.direccion,
+)
 
 class ClienteService:
     @staticmethod
@@ -27,15 +40,22 @@ class ClienteService:
         return cliente  # Retorna el cliente creado.
 
     @staticmethod
-    def get_all_clientes():
+    def get_all_clientes(after=None, limit=None, ligero=False):
         """
-        Obtener todos los clientes de la base de datos.
+        Obtener una página de los clientes de la base de datos, paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
         
         Returns:
-            List[Cliente]: Lista de todos los clientes.
+            tuple: (List[Cliente] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
         """
-        # Devuelve todos los clientes almacenados en la base de datos.
-        return Cliente.query.all()
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else Cliente.query
+        return paginar(consulta, Cliente.id_cliente, after, limit)
 
     @staticmethod
     def update_cliente(id_cliente, new_data):
@@ -47,20 +67,16 @@ class ClienteService:
             new_data (dict): Diccionario con los nuevos datos.
         
         Returns:
-            Cliente: El cliente actualizado.
+            Row: Las columnas de COLUMNAS_LISTADO del cliente actualizado.
         """
-        # Busca el cliente por su ID.
-        cliente = Cliente.query.get(id_cliente)
-        if not cliente:  # Si no se encuentra el cliente, lanza un error.
+        # Un solo UPDATE por clave primaria: no se lee el cliente antes de modificarlo.
+        cliente = actualizar(Cliente, id_cliente, valores_actualizables(Cliente, new_data), COLUMNAS_LISTADO)
+        if not cliente:  # Si el UPDATE no afectó ninguna fila, el cliente no existe.
             raise ValueError('Cliente no encontrado')
 
-        # Actualiza los campos basados en el diccionario new_data.
-        for key, value in new_data.items():
-            if hasattr(cliente, key):  # Verifica si el cliente tiene el atributo a actualizar.
-                setattr(cliente, key, value)  # Actualiza el atributo con el nuevo valor.
-        
+        marcar_tabla_modificada(Cliente.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return cliente  # Retorna el cliente actualizado.
+        return cliente  # Retorna las columnas del cliente actualizado.
 
     @staticmethod
     def delete_cliente(id_cliente):
@@ -73,10 +89,9 @@ class ClienteService:
         Returns:
             None
         """
-        # Busca el cliente por su ID.
-        cliente = Cliente.query.get(id_cliente)
-        if not cliente:  # Si no se encuentra el cliente, lanza un error.
+        # Un solo DELETE por clave primaria: si no afectó ninguna fila, el cliente no existe.
+        if not eliminar(Cliente, id_cliente):
             raise ValueError('Cliente no encontrado')
 
-        db.session.delete(cliente)  # Elimina el cliente de la sesión de la base de datos.
+        marcar_tabla_modificada(Cliente.__tablename__)  # El DELETE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
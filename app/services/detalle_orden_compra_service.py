@@ -1,13 +1,46 @@
+from sqlalchemy import exists, select  # Importa select y exists para construir consultas por columnas.
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.detalleOrdenCompra import DetalleOrdenCompra  # Importa el modelo DetalleOrdenCompra.
 from app.models.ordenCompra import OrdenCompra  # Importa el modelo OrdenCompra.
 from app.models.producto import Producto  # Importa el modelo Producto.
+from app.services.producto_service import ProductoService  # Importa el servicio que actualiza el stock de los productos.
+from app.utils.lotes import ids_existentes, insertar_en_lote, validar_tamano_lote  # Helpers para operaciones en lote.
+from app.utils.paginacion import paginar  # Importa el helper de paginación por cursor.
+
+def _sumar_stock(id_producto, unidades, productos):
+    """
+    Sumar unidades compradas al stock de un producto con un UPDATE atómico o lanzar un error claro.
+
+    No deshace la transacción: las escrituras pendientes quedan a cargo del servicio que llama.
+
+    Args:
+        id_producto (int): ID del producto.
+        unidades (int): Unidades recibidas; un valor negativo retira unidades del stock.
+        productos (set): IDs de los productos que existen, leídos una sola vez por operación; si el
+            UPDATE no afecta ninguna fila y el producto existe, es que no tiene stock suficiente.
+
+    Raises:
+        ValueError: Si el producto no existe o no tiene stock suficiente para retirar las unidades.
+    """
+    if id_producto not in productos:
+        raise ValueError("El producto especificado no existe.")
+    if not ProductoService.ajustar_stock(id_producto, unidades, 'compra'):
+        raise ValueError("Stock insuficiente para retirar las unidades compradas.")
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    DetalleOrdenCompra.id_detalle_compra,
+    DetalleOrdenCompra.id_orden_compra,
+    DetalleOrdenCompra.id_producto,
+    DetalleOrdenCompra.cantidad,
+)
 
 class DetalleOrdenCompraService:
     @staticmethod
     def create_detalle_orden_compra(id_orden_compra, id_producto, cantidad):
         """
-        Crear un nuevo detalle de orden de compra.
+        Crear un nuevo detalle de orden de compra y sumar las unidades al stock del producto
+        en la misma transacción.
         
         Args:
             id_orden_compra (int): ID de la orden de compra.
@@ -15,23 +48,88 @@ class DetalleOrdenCompraService:
             cantidad (int): Cantidad del producto.
         
         Returns:
-            DetalleOrdenCompra: El detalle de la orden de compra creado.
+            int: ID del detalle de la orden de compra creado.
         """
-        # Busca la orden de compra por su ID.
-        orden_compra = OrdenCompra.query.get(id_orden_compra)
+        # Verifica que la cantidad comprada sea positiva.
+        if cantidad is None or cantidad <= 0:
+            raise ValueError("La cantidad debe ser mayor que cero.")
+
+        # Verifica que existan la orden de compra y el producto con una sola consulta.
+        orden_compra = db.session.execute(
+            select(exists().where(Producto.id_producto == id_producto).label('producto_existe'))
+            .where(OrdenCompra.id_orden_compra == id_orden_compra)
+        ).first()
         if not orden_compra:  # Si no se encuentra la orden de compra, lanza un error.
             raise ValueError("La orden de compra especificada no existe.")
         
-        # Busca el producto por su ID.
-        producto = Producto.query.get(id_producto)
-        if not producto:  # Si no se encuentra el producto, lanza un error.
-            raise ValueError("El producto especificado no existe.")
+        # Suma las unidades al stock con un UPDATE atómico.
+        _sumar_stock(id_producto, cantidad, {id_producto} if orden_compra.producto_existe else set())
 
-        # Crea una nueva instancia de DetalleOrdenCompra con los datos proporcionados.
-        detalle = DetalleOrdenCompra(id_orden_compra=id_orden_compra, id_producto=id_producto, cantidad=cantidad)
-        db.session.add(detalle)  # Agrega el nuevo detalle a la sesión de la base de datos.
+        # Inserta el detalle sin pasar por el ORM: el ID se obtiene sin volver a leer la fila después del commit.
+        id_detalle = insertar_en_lote(DetalleOrdenCompra, DetalleOrdenCompra.id_detalle_compra, [
+            {'id_orden_compra': id_orden_compra, 'id_producto': id_producto, 'cantidad': cantidad}
+        ])[0]
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return detalle  # Retorna el detalle de la orden de compra creado.
+        return id_detalle  # Retorna el ID del detalle de la orden de compra creado.
+
+    @staticmethod
+    def create_detalles_orden_compra_bulk(lineas, partial=False):
+        """
+        Crear varios detalles de orden de compra en una sola transacción.
+        
+        Valida todas las órdenes de compra y productos referenciados con una consulta `IN (...)`
+        por tabla, suma el stock con un UPDATE por producto, inserta las líneas válidas con una
+        sola sentencia y confirma una única vez.
+        
+        Args:
+            lineas (list[dict]): Líneas con id_orden_compra, id_producto y cantidad.
+            partial (bool): Si es True, inserta las líneas válidas aunque otras tengan errores.
+        
+        Returns:
+            tuple: (creados, errores) donde `creados` es una lista de (índice, id_detalle_compra)
+            en el orden recibido y `errores` una lista de (índice, mensaje). Si hay errores y
+            `partial` es False no se inserta ninguna línea.
+        
+        Raises:
+            ValueError: Si el lote está vacío o supera el máximo permitido.
+        """
+        validar_tamano_lote(lineas)
+
+        # Valida la existencia de todas las órdenes de compra y productos con una consulta por tabla.
+        ordenes = ids_existentes(OrdenCompra.id_orden_compra, (l['id_orden_compra'] for l in lineas))
+        productos = ids_existentes(Producto.id_producto, (l['id_producto'] for l in lineas))
+
+        errores = []
+        validas = []  # Pares (índice, línea) que se van a insertar.
+        for indice, linea in enumerate(lineas):
+            if linea['id_orden_compra'] not in ordenes:
+                errores.append((indice, "La orden de compra especificada no existe."))
+            elif linea['id_producto'] not in productos:
+                errores.append((indice, "El producto especificado no existe."))
+            elif linea['cantidad'] is None or linea['cantidad'] <= 0:
+                errores.append((indice, "La cantidad debe ser mayor que cero."))
+            else:
+                validas.append((indice, linea))
+
+        # Sin el modo parcial, un solo error cancela todo el lote.
+        if errores and not partial:
+            return [], errores
+
+        # Agrupa las unidades por producto para sumar el stock con un solo UPDATE por producto.
+        unidades_por_producto = {}
+        for _, linea in validas:
+            unidades_por_producto[linea['id_producto']] = unidades_por_producto.get(linea['id_producto'], 0) + linea['cantidad']
+        # Se actualizan en orden de ID para que transacciones concurrentes bloqueen las filas en el mismo orden.
+        for id_producto in sorted(unidades_por_producto):
+            ProductoService.ajustar_stock(id_producto, unidades_por_producto[id_producto], 'compra')
+
+        # Inserta todas las líneas válidas en una sola sentencia y confirma una única vez.
+        ids = insertar_en_lote(DetalleOrdenCompra, DetalleOrdenCompra.id_detalle_compra, [
+            {'id_orden_compra': l['id_orden_compra'], 'id_producto': l['id_producto'], 'cantidad': l['cantidad']}
+            for _, l in validas
+        ])
+        db.session.commit()
+        return [(indice, id_detalle) for (indice, _), id_detalle in zip(validas, ids)], errores
 
     @staticmethod
     def get_detalles_orden_compra(id_orden_compra):
@@ -48,20 +146,45 @@ class DetalleOrdenCompraService:
         return DetalleOrdenCompra.query.filter_by(id_orden_compra=id_orden_compra).all()
 
     @staticmethod
-    def get_all_detalles_orden_compra():
+    def get_all_detalles_orden_compra(after=None, limit=None, ligero=False):
         """
-        Obtener todos los detalles de orden de compra.
+        Obtener una página de los detalles de orden de compra de la base de datos, paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
         
         Returns:
-            List[DetalleOrdenCompra]: Lista de todos los detalles de orden de compra.
+            tuple: (List[DetalleOrdenCompra] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
         """
-        # Devuelve todos los detalles de orden de compra almacenados en la base de datos.
-        return DetalleOrdenCompra.query.all()
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else DetalleOrdenCompra.query
+        return paginar(consulta, DetalleOrdenCompra.id_detalle_compra, after, limit)
+
+    @staticmethod
+    def iter_detalles_orden_compra(tamano_lote=1000):
+        """
+        Recorrer todos los detalles de orden de compra sin cargarlos en memoria.
+        
+        Lee solo las columnas necesarias con un cursor del lado del servidor (`yield_per`),
+        de modo que la memoria usada es constante sin importar el tamaño de la tabla.
+        
+        Args:
+            tamano_lote (int): Cantidad de filas que se traen de la base de datos en cada lote.
+        
+        Returns:
+            Result: Iterable de filas con id_detalle_compra, id_orden_compra, id_producto y cantidad.
+        """
+        # Selecciona columnas sueltas para no construir objetos ORM ni llenar el identity map.
+        consulta = select(*COLUMNAS_LISTADO).order_by(DetalleOrdenCompra.id_detalle_compra).execution_options(yield_per=tamano_lote)
+        return db.session.execute(consulta)
 
     @staticmethod
     def update_detalle_orden_compra(id_detalle, id_producto, cantidad):
         """
-        Actualizar un detalle de orden de compra existente.
+        Actualizar un detalle de orden de compra existente y ajustar el stock según la diferencia.
         
         Args:
             id_detalle (int): ID del detalle de orden de compra a actualizar.
@@ -71,15 +194,28 @@ class DetalleOrdenCompraService:
         Returns:
             DetalleOrdenCompra: Detalle de orden de compra actualizado.
         """
+        # Verifica que la cantidad comprada sea positiva.
+        if cantidad is None or cantidad <= 0:
+            raise ValueError("La cantidad debe ser mayor que cero.")
+
         # Busca el detalle de orden de compra por su ID.
         detalle = DetalleOrdenCompra.query.get(id_detalle)
         if detalle is None:  # Si no se encuentra el detalle, lanza un error.
             raise ValueError("El detalle de orden de compra no existe.")
 
-        # Busca el producto por su ID.
-        producto = Producto.query.get(id_producto)
-        if not producto:  # Si no se encuentra el producto, lanza un error.
-            raise ValueError("El producto especificado no existe.")
+        # Ajusta el stock: si el producto no cambia se aplica solo la diferencia de unidades;
+        # si cambia, se retiran las unidades del producto anterior y se suman al nuevo.
+        # El producto nuevo se verifica antes de escribir, para que un error no deje escrituras pendientes.
+        cantidad_anterior = detalle.cantidad or 0
+        if id_producto == detalle.id_producto:
+            if cantidad != cantidad_anterior:
+                _sumar_stock(id_producto, cantidad - cantidad_anterior, {id_producto})
+        else:
+            productos = ids_existentes(Producto.id_producto, [id_producto]) | {detalle.id_producto}
+            if id_producto not in productos:
+                raise ValueError("El producto especificado no existe.")
+            _sumar_stock(detalle.id_producto, -cantidad_anterior, productos)
+            _sumar_stock(id_producto, cantidad, productos)
 
         # Actualiza los campos del detalle.
         detalle.id_producto = id_producto
@@ -90,18 +226,20 @@ class DetalleOrdenCompraService:
     @staticmethod
     def delete_detalle_orden_compra(id_detalle):
         """
-        Eliminar un detalle de orden de compra por su ID.
+        Eliminar un detalle de orden de compra por su ID y retirar sus unidades del stock.
 
         Args:
             id_detalle (int): ID del detalle a eliminar.
 
         Raises:
-            ValueError: Si el detalle no se encuentra.
+            ValueError: Si el detalle no se encuentra o no hay stock suficiente para retirar sus unidades.
         """
         # Busca el detalle de orden de compra por su ID.
         detalle = DetalleOrdenCompra.query.get(id_detalle)
         if detalle is None:  # Si no se encuentra el detalle, lanza un error.
             raise ValueError("El detalle de orden de compra no existe.")
         
+        # Retira del stock las unidades que había sumado el detalle eliminado.
+        _sumar_stock(detalle.id_producto, -(detalle.cantidad or 0), {detalle.id_producto})
         db.session.delete(detalle)  # Elimina el detalle de la sesión de la base de datos.
         db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
@@ -1,13 +1,47 @@
+from sqlalchemy import exists, select  # Importa select y exists para construir consultas por columnas.
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.detalleOrdenVenta import DetalleOrdenVenta  # Importa el modelo DetalleOrdenVenta.
 from app.models.ordenVenta import OrdenVenta  # Importa el modelo OrdenVenta.
 from app.models.producto import Producto  # Importa el modelo Producto.
+from app.services.producto_service import ProductoService  # Importa el servicio que actualiza el stock de los productos.
+from app.services.resumen_ventas_service import ESTADO_RESUMEN, ResumenVentasService  # Importa el servicio del resumen diario de ventas.
+from app.utils.lotes import ids_existentes, insertar_en_lote, validar_tamano_lote  # Helpers para operaciones en lote.
+from app.utils.paginacion import paginar  # Importa el helper de paginación por cursor.
+
+def _descontar_stock(id_producto, unidades, productos):
+    """
+    Descontar unidades del stock de un producto con un UPDATE condicional o lanzar un error claro.
+
+    No deshace la transacción: las escrituras pendientes quedan a cargo del servicio que llama.
+
+    Args:
+        id_producto (int): ID del producto.
+        unidades (int): Unidades vendidas; un valor negativo devuelve unidades al stock.
+        productos (set): IDs de los productos que existen, leídos una sola vez por operación; si el
+            UPDATE no afecta ninguna fila y el producto existe, es que no tiene stock suficiente.
+
+    Raises:
+        ValueError: Si el producto no existe o no tiene stock suficiente.
+    """
+    if id_producto not in productos:
+        raise ValueError("El producto especificado no existe.")
+    if not ProductoService.ajustar_stock(id_producto, -unidades, 'venta'):
+        raise ValueError("Stock insuficiente para el producto especificado.")
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    DetalleOrdenVenta.id_detalle_venta,
+    DetalleOrdenVenta.id_orden_venta,
+    DetalleOrdenVenta.id_producto,
+    DetalleOrdenVenta.cantidad,
+)
 
 class DetalleOrdenVentaService:
     @staticmethod
     def create_detalle_orden_venta(id_orden_venta, id_producto, cantidad):
         """
-        Crear un nuevo detalle de orden de venta.
+        Crear un nuevo detalle de orden de venta y descontar las unidades del stock del producto
+        en la misma transacción.
         
         Args:
             id_orden_venta (int): ID de la orden de venta.
@@ -15,23 +49,108 @@ class DetalleOrdenVentaService:
             cantidad (int): Cantidad del producto.
         
         Returns:
-            DetalleOrdenVenta: El detalle de la orden de venta creado.
+            int: ID del detalle de la orden de venta creado.
+        
+        Raises:
+            ValueError: Si la orden o el producto no existen, o si no hay stock suficiente.
         """
-        # Busca la orden de venta por su ID.
-        orden_venta = OrdenVenta.query.get(id_orden_venta)
+        # Verifica que la cantidad vendida sea positiva.
+        if cantidad is None or cantidad <= 0:
+            raise ValueError("La cantidad debe ser mayor que cero.")
+
+        # Lee la fecha y el estado de la orden y verifica que el producto exista, con una sola consulta.
+        orden_venta = db.session.execute(
+            select(OrdenVenta.fecha_inicio, OrdenVenta.estado,
+                   exists().where(Producto.id_producto == id_producto).label('producto_existe'))
+            .where(OrdenVenta.id_orden_venta == id_orden_venta)
+        ).first()
         if not orden_venta:  # Si no se encuentra la orden de venta, lanza un error.
             raise ValueError("La orden de venta especificada no existe.")
         
-        # Busca el producto por su ID.
-        producto = Producto.query.get(id_producto)
-        if not producto:  # Si no se encuentra el producto, lanza un error.
-            raise ValueError("El producto especificado no existe.")
+        # Descuenta el stock con un UPDATE condicional.
+        _descontar_stock(id_producto, cantidad, {id_producto} if orden_venta.producto_existe else set())
 
-        # Crea una nueva instancia de DetalleOrdenVenta con los datos proporcionados.
-        detalle = DetalleOrdenVenta(id_orden_venta=id_orden_venta, id_producto=id_producto, cantidad=cantidad)
-        db.session.add(detalle)  # Agrega el nuevo detalle a la sesión de la base de datos.
+        # Inserta el detalle sin pasar por el ORM: el ID se obtiene sin volver a leer la fila después del commit.
+        id_detalle = insertar_en_lote(DetalleOrdenVenta, DetalleOrdenVenta.id_detalle_venta, [
+            {'id_orden_venta': id_orden_venta, 'id_producto': id_producto, 'cantidad': cantidad}
+        ])[0]
+        # Si la orden ya está completada, sus unidades se suman al resumen diario en la misma transacción.
+        if orden_venta.estado == ESTADO_RESUMEN:
+            ResumenVentasService.sumar({(orden_venta.fecha_inicio, id_producto): cantidad})
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return detalle  # Retorna el detalle de la orden de venta creado.
+        return id_detalle  # Retorna el ID del detalle de la orden de venta creado.
+
+    @staticmethod
+    def create_detalles_orden_venta_bulk(lineas, partial=False):
+        """
+        Crear varios detalles de orden de venta en una sola transacción.
+        
+        Valida todas las órdenes y productos referenciados con una consulta `IN (...)` por tabla,
+        descuenta el stock con un UPDATE condicional por producto, inserta las líneas válidas
+        con un solo executemany y confirma una única vez.
+        
+        Args:
+            lineas (list[dict]): Líneas con id_orden_venta, id_producto y cantidad.
+            partial (bool): Si es True, inserta las líneas válidas aunque otras tengan errores.
+        
+        Returns:
+            tuple: (creados, errores) donde `creados` es una lista de (índice, id_detalle_venta)
+            y `errores` una lista de (índice, mensaje). Si hay errores y `partial` es False
+            no se inserta ninguna línea.
+        
+        Raises:
+            ValueError: Si el lote está vacío o supera el máximo permitido.
+        """
+        validar_tamano_lote(lineas)
+
+        # Valida la existencia de todas las órdenes y productos con una consulta por tabla.
+        ordenes = ids_existentes(OrdenVenta.id_orden_venta, (l['id_orden_venta'] for l in lineas))
+        productos = ids_existentes(Producto.id_producto, (l['id_producto'] for l in lineas))
+
+        errores = []
+        validas = []  # Pares (índice, línea) que se van a insertar.
+        for indice, linea in enumerate(lineas):
+            if linea['id_orden_venta'] not in ordenes:
+                errores.append((indice, "La orden de venta especificada no existe."))
+            elif linea['id_producto'] not in productos:
+                errores.append((indice, "El producto especificado no existe."))
+            elif linea['cantidad'] is None or linea['cantidad'] <= 0:
+                errores.append((indice, "La cantidad debe ser mayor que cero."))
+            else:
+                validas.append((indice, linea))
+
+        # Sin el modo parcial, un solo error cancela todo el lote.
+        if errores and not partial:
+            return [], errores
+
+        # Agrupa las unidades por producto para descontar el stock con un solo UPDATE por producto.
+        unidades_por_producto = {}
+        for _, linea in validas:
+            unidades_por_producto[linea['id_producto']] = unidades_por_producto.get(linea['id_producto'], 0) + linea['cantidad']
+
+        # Se actualizan en orden de ID para que transacciones concurrentes bloqueen las filas en el mismo orden.
+        sin_stock = {
+            id_producto for id_producto in sorted(unidades_por_producto)
+            if not ProductoService.ajustar_stock(id_producto, -unidades_por_producto[id_producto], 'venta')
+        }
+        if sin_stock:
+            errores.extend((indice, "Stock insuficiente para el producto especificado.")
+                           for indice, linea in validas if linea['id_producto'] in sin_stock)
+            errores.sort()
+            if not partial:
+                db.session.rollback()  # Deshace los descuentos de stock ya aplicados.
+                return [], errores
+            validas = [(indice, linea) for indice, linea in validas if linea['id_producto'] not in sin_stock]
+
+        # Inserta todas las líneas válidas en una sola sentencia y confirma una única vez.
+        ids = insertar_en_lote(DetalleOrdenVenta, DetalleOrdenVenta.id_detalle_venta, [
+            {'id_orden_venta': l['id_orden_venta'], 'id_producto': l['id_producto'], 'cantidad': l['cantidad']}
+            for _, l in validas
+        ])
+        # Actualiza el resumen diario con las líneas de órdenes completadas (una consulta y un upsert para todo el lote).
+        ResumenVentasService.sumar_lineas((l['id_orden_venta'], l['id_producto'], l['cantidad']) for _, l in validas)
+        db.session.commit()
+        return [(indice, id_detalle) for (indice, _), id_detalle in zip(validas, ids)], errores
 
     @staticmethod
     def get_detalles_orden_venta(id_orden_venta):
@@ -48,20 +167,45 @@ class DetalleOrdenVentaService:
         return DetalleOrdenVenta.query.filter_by(id_orden_venta=id_orden_venta).all()
 
     @staticmethod
-    def get_all_detalles_orden_venta():
+    def get_all_detalles_orden_venta(after=None, limit=None, ligero=False):
+        """
+        Obtener una página de los detalles de orden de venta de la base de datos, paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
+        
+        Returns:
+            tuple: (List[DetalleOrdenVenta] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
+        """
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else DetalleOrdenVenta.query
+        return paginar(consulta, DetalleOrdenVenta.id_detalle_venta, after, limit)
+
+    @staticmethod
+    def iter_detalles_orden_venta(tamano_lote=1000):
         """
-        Obtener todos los detalles de orden de venta.
+        Recorrer todos los detalles de orden de venta sin cargarlos en memoria.
+        
+        Lee solo las columnas necesarias con un cursor del lado del servidor (`yield_per`),
+        de modo que la memoria usada es constante sin importar el tamaño de la tabla.
+        
+        Args:
+            tamano_lote (int): Cantidad de filas que se traen de la base de datos en cada lote.
         
         Returns:
-            List[DetalleOrdenVenta]: Lista de todos los detalles de orden de venta.
+            Result: Iterable de filas con id_detalle_venta, id_orden_venta, id_producto y cantidad.
         """
-        # Devuelve todos los detalles de orden de venta almacenados en la base de datos.
-        return DetalleOrdenVenta.query.all()
+        # Selecciona columnas sueltas para no construir objetos ORM ni llenar el identity map.
+        consulta = select(*COLUMNAS_LISTADO).order_by(DetalleOrdenVenta.id_detalle_venta).execution_options(yield_per=tamano_lote)
+        return db.session.execute(consulta)
 
     @staticmethod
     def update_detalle_orden_venta(id_detalle_venta, data):
         """
-        Actualizar un detalle de orden de venta existente.
+        Actualizar un detalle de orden de venta existente y ajustar el stock según la diferencia.
         
         Args:
             id_detalle_venta (int): ID del detalle de orden de venta.
@@ -71,17 +215,37 @@ class DetalleOrdenVentaService:
             DetalleOrdenVenta: El detalle de orden de venta actualizado.
         
         Raises:
-            ValueError: Si el detalle no se encuentra.
+            ValueError: Si el detalle no se encuentra o no hay stock suficiente.
         """
         # Busca el detalle de orden de venta por su ID.
         detalle = DetalleOrdenVenta.query.get(id_detalle_venta)
         if detalle is None:  # Si no se encuentra el detalle, lanza un error.
             raise ValueError("El detalle de orden de venta no existe.")
+
+        id_producto = data.get('id_producto', detalle.id_producto)
+        cantidad = data.get('cantidad', detalle.cantidad)
+        if cantidad is None or cantidad <= 0:
+            raise ValueError("La cantidad debe ser mayor que cero.")
+
+        # Ajusta el stock: si el producto no cambia se aplica solo la diferencia de unidades;
+        # si cambia, se descuentan las unidades del nuevo y después se devuelven al anterior,
+        # de modo que un error no deja escrituras pendientes en la transacción.
+        cantidad_anterior = detalle.cantidad or 0
+        if id_producto == detalle.id_producto:
+            if cantidad != cantidad_anterior:
+                _descontar_stock(id_producto, cantidad - cantidad_anterior, {id_producto})
+        else:
+            _descontar_stock(id_producto, cantidad, ids_existentes(Producto.id_producto, [id_producto]))
+            ProductoService.ajustar_stock(detalle.id_producto, cantidad_anterior, 'venta')
+
+        # Quita del resumen diario las unidades anteriores; las nuevas se suman después de actualizar la línea.
+        ResumenVentasService.sumar_lineas([(detalle.id_orden_venta, detalle.id_producto, cantidad_anterior)], -1)
         
         # Actualiza los campos basados en el diccionario
         detalle.id_orden_venta = data.get('id_orden_venta', detalle.id_orden_venta)
         detalle.id_producto = data.get('id_producto', detalle.id_producto)
         detalle.cantidad = data.get('cantidad', detalle.cantidad)
+        ResumenVentasService.sumar_lineas([(detalle.id_orden_venta, detalle.id_producto, detalle.cantidad)])
 
         db.session.commit()  # Confirma los cambios en la base de datos.
         return detalle  # Retorna el detalle de orden de venta actualizado.
@@ -89,7 +253,7 @@ class DetalleOrdenVentaService:
     @staticmethod
     def delete_detalle_orden_venta(id_detalle):
         """
-        Eliminar un detalle de orden de venta por su ID.
+        Eliminar un detalle de orden de venta por su ID y devolver sus unidades al stock.
 
         Args:
             id_detalle (int): ID del detalle a eliminar.
@@ -102,5 +266,9 @@ class DetalleOrdenVentaService:
         if detalle is None:  # Si no se encuentra el detalle, lanza un error.
             raise ValueError("El detalle de orden de venta no existe.")
         
+        # Devuelve al stock las unidades del detalle eliminado.
+        ProductoService.ajustar_stock(detalle.id_producto, detalle.cantidad or 0, 'venta')
+        # Quita del resumen diario las unidades del detalle (si su orden estaba completada).
+        ResumenVentasService.sumar_lineas([(detalle.id_orden_venta, detalle.id_producto, detalle.cantidad)], -1)
         db.session.delete(detalle)  # Elimina el detalle de la sesión de la base de datos.
         db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
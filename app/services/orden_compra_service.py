@@ -1,6 +1,31 @@
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.ordenCompra import OrdenCompra  # Importa el modelo OrdenCompra.
 from app.models.proveedor import Proveedor  # Importa el modelo Proveedor.
+from app.models.detalleOrdenCompra import DetalleOrdenCompra  # Importa el modelo DetalleOrdenCompra (define la relación `detalles_compra`).
+from sqlalchemy import select  # Importa select para construir la consulta con carga anticipada.
+from sqlalchemy.orm import joinedload, selectinload  # Estrategias de carga anticipada de relaciones.
+from app.utils.escritura import actualizar, eliminar, valores_actualizables  # Importa los helpers de UPDATE y DELETE en una sola sentencia.
+from app.utils.paginacion import interpretar_orden, paginar  # Importa los helpers de paginación por cursor y ordenamiento.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+# Columnas por las que se puede ordenar el listado (lista blanca del parámetro `sort`).
+COLUMNAS_ORDENABLES = {
+    'id': OrdenCompra.id_orden_compra,
+    'fecha_inicio': OrdenCompra.fecha_inicio,
+    'fecha_final': OrdenCompra.fecha_final,
+    # MySQL ordena los ENUM por posición y no alfabéticamente; el CAST hace que ORDER BY y el cursor coincidan.
+    'estado': db.cast(OrdenCompra.estado, db.String),
+}
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    OrdenCompra.id_orden_compra,
+    OrdenCompra.id_proveedor,
+    OrdenCompra.fecha_inicio,
+    OrdenCompra.fecha_final,
+    OrdenCompra.estado,
+    OrdenCompra.version,
+)
 
 class OrdenCompraService:
     @staticmethod
@@ -42,33 +67,90 @@ class OrdenCompraService:
         return orden_compra  # Retorna la orden de compra creada.
 
     @staticmethod
-    def get_all_ordenes_compra():
+    def get_all_ordenes_compra(after=None, limit=None, estado=None, desde=None, hasta=None, id_proveedor=None, sort=None, ligero=False):
         """
-        Obtener todas las órdenes de compra de la base de datos.
+        Obtener una página de las órdenes de compra de la base de datos, filtrada, ordenada y paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            estado (str | None): Solo las órdenes con este estado.
+            desde (date | None): Solo las órdenes con fecha de inicio mayor o igual a esta fecha.
+            hasta (date | None): Solo las órdenes con fecha de inicio menor o igual a esta fecha.
+            id_proveedor (int | None): Solo las órdenes del proveedor indicado.
+            sort (str | None): Columna de ordenamiento de COLUMNAS_ORDENABLES; con "-" inicial el orden es descendente.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
         
         Returns:
-            List[OrdenCompra]: Lista de todas las órdenes de compra.
+            tuple: (List[OrdenCompra] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
+
+        Raises:
+            ValueError: Si el estado o la columna de ordenamiento no son válidos, o si el rango de fechas está invertido.
+        """
+        if estado is not None and estado not in ['completado', 'pendiente', 'cancelado']:
+            raise ValueError("El estado proporcionado no es válido.")
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a la fecha 'desde'.")
+        orden, descendente = interpretar_orden(sort, COLUMNAS_ORDENABLES)
+
+        # Los filtros se traducen a WHERE para que la base de datos solo devuelva las filas pedidas.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else OrdenCompra.query
+        if estado is not None:
+            consulta = consulta.where(OrdenCompra.estado == estado)
+        if desde is not None:
+            consulta = consulta.where(OrdenCompra.fecha_inicio >= desde)
+        if hasta is not None:
+            consulta = consulta.where(OrdenCompra.fecha_inicio <= hasta)
+        if id_proveedor is not None:
+            consulta = consulta.where(OrdenCompra.id_proveedor == id_proveedor)
+
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        return paginar(consulta, OrdenCompra.id_orden_compra, after, limit, orden, descendente)
+
+    @staticmethod
+    def get_orden_compra_completa(id_orden_compra):
+        """
+        Obtener una orden de compra con su proveedor, sus detalles y el producto de cada detalle.
+
+        Las relaciones se cargan de forma anticipada para que la cantidad de consultas sea fija
+        (la orden con su proveedor en un JOIN y los detalles con sus productos en un SELECT ... IN),
+        sin importar cuántos detalles tenga la orden.
+
+        Args:
+            id_orden_compra (int): ID de la orden de compra.
+
+        Returns:
+            OrdenCompra: La orden de compra con las relaciones ya cargadas.
+
+        Raises:
+            ValueError: Si la orden de compra no existe.
         """
-        # Devuelve todas las órdenes de compra almacenadas en la base de datos.
-        return OrdenCompra.query.all()  # Utiliza el método query de SQLAlchemy para obtener todos los registros.
+        consulta = select(OrdenCompra).options(
+            joinedload(OrdenCompra.proveedor),  # El proveedor se trae en el mismo SELECT de la orden.
+            selectinload(OrdenCompra.detalles_compra).joinedload(DetalleOrdenCompra.producto),  # Detalles y productos en una segunda consulta.
+        ).where(OrdenCompra.id_orden_compra == id_orden_compra)
+        orden_compra = db.session.execute(consulta).unique().scalar_one_or_none()
+        if not orden_compra:  # Si no se encuentra la orden, lanza un error.
+            raise ValueError('Orden de compra no encontrada')
+        return orden_compra
 
     @staticmethod
-    def update_orden_compra(id_orden_compra, new_data):
+    def update_orden_compra(id_orden_compra, new_data, version=None):
         """
         Actualizar los datos de una orden de compra existente.
         
         Args:
             id_orden_compra (int): ID de la orden de compra a actualizar.
             new_data (dict): Diccionario con los nuevos datos.
+            version (set | None): Versiones que el cliente leyó (encabezado If-Match); None para no verificarla.
         
         Returns:
-            OrdenCompra: La orden de compra actualizada.
+            Row: Las columnas de COLUMNAS_LISTADO de la orden de compra actualizada.
+        
+        Raises:
+            ConflictoVersionError: Si el registro cambió desde la versión que leyó el cliente.
         """
-        # Busca la orden de compra por su ID en la base de datos.
-        orden_compra = OrdenCompra.query.get(id_orden_compra)
-        if not orden_compra:  # Si no se encuentra la orden, lanza un error.
-            raise ValueError('Orden de compra no encontrada')
-
         # Verifica que el ID del proveedor proporcionado exista si se incluye en new_data.
         if 'id_proveedor' in new_data:
             proveedor = Proveedor.query.get(new_data['id_proveedor'])
@@ -84,13 +166,14 @@ class OrdenCompraService:
             if new_data['fecha_final'] < new_data['fecha_inicio']:
                 raise ValueError("La fecha final no puede ser anterior a la fecha de inicio.")
         
-        # Actualiza los atributos de la orden de compra con los nuevos datos proporcionados.
-        for key, value in new_data.items():
-            if hasattr(orden_compra, key):  # Verifica si la orden tiene el atributo que se quiere actualizar.
-                setattr(orden_compra, key, value)  # Actualiza el atributo con el nuevo valor.
+        # Un solo UPDATE por clave primaria (y versión, si el cliente envió If-Match) que devuelve la orden actualizada.
+        orden_compra = actualizar(OrdenCompra, id_orden_compra, valores_actualizables(OrdenCompra, new_data), COLUMNAS_LISTADO, version)
+        if not orden_compra:  # Si el UPDATE no afectó ninguna fila, la orden no existe.
+            raise ValueError('Orden de compra no encontrada')
 
+        marcar_tabla_modificada(OrdenCompra.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return orden_compra  # Retorna la orden de compra actualizada.
+        return orden_compra  # Retorna las columnas de la orden de compra actualizada.
 
     @staticmethod
     def delete_orden_compra(id_orden_compra):
@@ -103,10 +186,9 @@ class OrdenCompraService:
         Returns:
             None
         """
-        # Busca la orden de compra por su ID en la base de datos.
-        orden_compra = OrdenCompra.query.get(id_orden_compra)
-        if not orden_compra:  # Si no se encuentra la orden, lanza un error.
+        # Un solo DELETE por clave primaria: si no afectó ninguna fila, la orden no existe.
+        if not eliminar(OrdenCompra, id_orden_compra):
             raise ValueError('Orden de compra no encontrada')
-        
-        db.session.delete(orden_compra)  # Elimina la orden de compra de la sesión de la base de datos.
+
+        marcar_tabla_modificada(OrdenCompra.__tablename__)  # El DELETE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
@@ -1,6 +1,33 @@
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.ordenVenta import OrdenVenta  # Importa el modelo OrdenVenta.
 from app.models.cliente import Cliente  # Importa el modelo Cliente.
+from app.models.detalleOrdenVenta import DetalleOrdenVenta  # Importa el modelo DetalleOrdenVenta (define la relación `detalles_venta`).
+from sqlalchemy import select  # Importa select para construir la consulta con carga anticipada.
+from sqlalchemy.orm import joinedload, selectinload  # Estrategias de carga anticipada de relaciones.
+from app.services.resumen_ventas_service import ResumenVentasService  # Importa el servicio del resumen diario de ventas.
+from app.utils.concurrencia import verificar_version  # Importa la verificación de If-Match del control de concurrencia optimista.
+from app.utils.escritura import actualizar, eliminar, valores_actualizables  # Importa los helpers de UPDATE y DELETE en una sola sentencia.
+from app.utils.paginacion import interpretar_orden, paginar  # Importa los helpers de paginación por cursor y ordenamiento.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+# Columnas por las que se puede ordenar el listado (lista blanca del parámetro `sort`).
+COLUMNAS_ORDENABLES = {
+    'id': OrdenVenta.id_orden_venta,
+    'fecha_inicio': OrdenVenta.fecha_inicio,
+    'fecha_final': OrdenVenta.fecha_final,
+    # MySQL ordena los ENUM por posición y no alfabéticamente; el CAST hace que ORDER BY y el cursor coincidan.
+    'estado': db.cast(OrdenVenta.estado, db.String),
+}
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    OrdenVenta.id_orden_venta,
+    OrdenVenta.id_cliente,
+    OrdenVenta.fecha_inicio,
+    OrdenVenta.fecha_final,
+    OrdenVenta.estado,
+    OrdenVenta.version,
+)
 
 class OrdenVentaService:
     @staticmethod
@@ -42,33 +69,90 @@ class OrdenVentaService:
         return orden_venta  # Retorna la orden de venta creada.
 
     @staticmethod
-    def get_all_ordenes_venta():
+    def get_all_ordenes_venta(after=None, limit=None, estado=None, desde=None, hasta=None, id_cliente=None, sort=None, ligero=False):
         """
-        Obtener todas las órdenes de venta de la base de datos.
+        Obtener una página de las órdenes de venta de la base de datos, filtrada, ordenada y paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            estado (str | None): Solo las órdenes con este estado.
+            desde (date | None): Solo las órdenes con fecha de inicio mayor o igual a esta fecha.
+            hasta (date | None): Solo las órdenes con fecha de inicio menor o igual a esta fecha.
+            id_cliente (int | None): Solo las órdenes del cliente indicado.
+            sort (str | None): Columna de ordenamiento de COLUMNAS_ORDENABLES; con "-" inicial el orden es descendente.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
         
         Returns:
-            List[OrdenVenta]: Lista de todas las órdenes de venta.
+            tuple: (List[OrdenVenta] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
+
+        Raises:
+            ValueError: Si el estado o la columna de ordenamiento no son válidos, o si el rango de fechas está invertido.
         """
-        # Devuelve todas las órdenes de venta almacenadas en la base de datos.
-        return OrdenVenta.query.all()  # Utiliza el método query de SQLAlchemy para obtener todos los registros.
+        if estado is not None and estado not in ['completado', 'pendiente', 'cancelado']:
+            raise ValueError("El estado proporcionado no es válido.")
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a la fecha 'desde'.")
+        orden, descendente = interpretar_orden(sort, COLUMNAS_ORDENABLES)
+
+        # Los filtros se traducen a WHERE para que la base de datos solo devuelva las filas pedidas.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else OrdenVenta.query
+        if estado is not None:
+            consulta = consulta.where(OrdenVenta.estado == estado)
+        if desde is not None:
+            consulta = consulta.where(OrdenVenta.fecha_inicio >= desde)
+        if hasta is not None:
+            consulta = consulta.where(OrdenVenta.fecha_inicio <= hasta)
+        if id_cliente is not None:
+            consulta = consulta.where(OrdenVenta.id_cliente == id_cliente)
+
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        return paginar(consulta, OrdenVenta.id_orden_venta, after, limit, orden, descendente)
 
     @staticmethod
-    def update_orden_venta(id_orden_venta, new_data):
+    def get_orden_venta_completa(id_orden_venta):
+        """
+        Obtener una orden de venta con su cliente, sus detalles y el producto de cada detalle.
+
+        Las relaciones se cargan de forma anticipada para que la cantidad de consultas sea fija
+        (la orden con su cliente en un JOIN y los detalles con sus productos en un SELECT ... IN),
+        sin importar cuántos detalles tenga la orden.
+
+        Args:
+            id_orden_venta (int): ID de la orden de venta.
+
+        Returns:
+            OrdenVenta: La orden de venta con las relaciones ya cargadas.
+
+        Raises:
+            ValueError: Si la orden de venta no existe.
+        """
+        consulta = select(OrdenVenta).options(
+            joinedload(OrdenVenta.cliente),  # El cliente se trae en el mismo SELECT de la orden.
+            selectinload(OrdenVenta.detalles_venta).joinedload(DetalleOrdenVenta.producto),  # Detalles y productos en una segunda consulta.
+        ).where(OrdenVenta.id_orden_venta == id_orden_venta)
+        orden_venta = db.session.execute(consulta).unique().scalar_one_or_none()
+        if not orden_venta:  # Si no se encuentra la orden, lanza un error.
+            raise ValueError('Orden de venta no encontrada')
+        return orden_venta
+
+    @staticmethod
+    def update_orden_venta(id_orden_venta, new_data, version=None):
         """
         Actualizar los datos de una orden de venta existente.
         
         Args:
             id_orden_venta (int): ID de la orden de venta a actualizar.
             new_data (dict): Diccionario con los nuevos datos.
+            version (set | None): Versiones que el cliente leyó (encabezado If-Match); None para no verificarla.
         
         Returns:
-            OrdenVenta: La orden de venta actualizada.
+            Row: Las columnas de COLUMNAS_LISTADO de la orden de venta actualizada.
+        
+        Raises:
+            ConflictoVersionError: Si el registro cambió desde la versión que leyó el cliente.
         """
-        # Busca la orden de venta por su ID en la base de datos.
-        orden_venta = OrdenVenta.query.get(id_orden_venta)
-        if not orden_venta:  # Si no se encuentra la orden, lanza un error.
-            raise ValueError('Orden de venta no encontrada')
-
         # Verifica que el ID del cliente proporcionado exista si se incluye en new_data.
         if 'id_cliente' in new_data:
             cliente = Cliente.query.get(new_data['id_cliente'])
@@ -84,13 +168,36 @@ class OrdenVentaService:
             if new_data['fecha_final'] < new_data['fecha_inicio']:
                 raise ValueError("La fecha final no puede ser anterior a la fecha de inicio.")
         
-        # Actualiza los atributos de la orden de venta con los nuevos datos proporcionados.
-        for key, value in new_data.items():
-            if hasattr(orden_venta, key):  # Verifica si la orden tiene el atributo que se quiere actualizar.
-                setattr(orden_venta, key, value)  # Actualiza el atributo con el nuevo valor.
+        valores = valores_actualizables(OrdenVenta, new_data)
+        versiones = version
+
+        # El resumen diario depende de la fecha y el estado: si cambian, las líneas de la orden se restan
+        # con los valores anteriores y se vuelven a sumar con los nuevos. Solo en este caso se lee antes la orden.
+        cambia_resumen = 'estado' in valores or 'fecha_inicio' in valores
+        if cambia_resumen:
+            actual = db.session.execute(
+                select(OrdenVenta.version).where(OrdenVenta.id_orden_venta == id_orden_venta)
+            ).scalar_one_or_none()
+            if actual is None:  # Si no se encuentra la orden, lanza un error.
+                raise ValueError('Orden de venta no encontrada')
+            verificar_version(actual, version)
+            # El UPDATE se condiciona a la versión leída: si otra petición cambia la orden en el medio,
+            # lo restado del resumen ya no sería correcto y la actualización falla como conflicto.
+            versiones = {actual}
+            ResumenVentasService.sumar_orden(id_orden_venta, -1)
 
+        # Un solo UPDATE por clave primaria (y versión, si corresponde) que devuelve la orden actualizada.
+        orden_venta = actualizar(OrdenVenta, id_orden_venta, valores, COLUMNAS_LISTADO, versiones)
+        if not orden_venta:  # Si el UPDATE no afectó ninguna fila, la orden no existe.
+            db.session.rollback()  # Descarta lo restado del resumen si la orden se eliminó entre la lectura y el UPDATE.
+            raise ValueError('Orden de venta no encontrada')
+
+        if cambia_resumen:
+            ResumenVentasService.sumar_orden(id_orden_venta, 1)  # El UPDATE ya se ejecutó: la consulta lee la fecha y el estado nuevos.
+
+        marcar_tabla_modificada(OrdenVenta.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return orden_venta  # Retorna la orden de venta actualizada.
+        return orden_venta  # Retorna las columnas de la orden de venta actualizada.
 
     @staticmethod
     def delete_orden_venta(id_orden_venta):
@@ -103,12 +210,11 @@ class OrdenVentaService:
         Returns:
             None
         """
-        # Busca la orden de venta por su ID en la base de datos.
-        orden_venta = OrdenVenta.query.get(id_orden_venta)
-        if not orden_venta:  # Si no se encuentra la orden, lanza un error.
+        ResumenVentasService.sumar_orden(id_orden_venta, -1)  # Quita las unidades de la orden del resumen diario.
+        # Un solo DELETE por clave primaria: si no afectó ninguna fila, la orden no existe.
+        if not eliminar(OrdenVenta, id_orden_venta):
+            db.session.rollback()
             raise ValueError('Orden de venta no encontrada')
-        
-        db.session.delete(orden_venta)  # Elimina la orden de venta de la sesión de la base de datos.
-        db.session.commit()  # Confirma los cambios en la base de datos.
-        
-        
\ No newline at end of file
+
+        marcar_tabla_modificada(OrdenVenta.__tablename__)  # El DELETE directo no pasa por el flush del ORM.
+        db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
@@ -1,5 +1,41 @@
+from sqlalchemy import func, select, update  # Importa las funciones para construir el UPDATE atómico de stock y las consultas por columnas.
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.producto import Producto  # Importa el modelo Producto.
+from app.services.stock_service import StockService  # Importa el servicio del libro de movimientos de stock.
+from app.utils.concurrencia import verificar_version  # Importa los helpers del control de concurrencia optimista.
+from app.utils.escritura import actualizar, eliminar, valores_actualizables  # Importa los helpers de UPDATE y DELETE en una sola sentencia.
+from app.utils.cache import marcar_para_invalidar, obtener_cache  # Importa los helpers de la caché de productos.
+from app.utils.paginacion import paginar  # Importa el helper de paginación por cursor.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    Producto.id_producto,
+    Producto.nombre,
+    Producto.costo,
+    Producto.precio_venta,
+    Producto.cantidad,
+    Producto.version,
+)
+
+
+def serializar_producto(p):
+    """Convierte un producto (objeto del ORM o fila de COLUMNAS_LISTADO) en un diccionario para la respuesta (y para guardarlo en la caché)."""
+    return {
+        'id_producto': p.id_producto,  # ID del producto.
+        'nombre': p.nombre,  # Nombre del producto.
+        'costo': float(p.costo),  # Convertir Decimal a float.
+        'precio_venta': float(p.precio_venta),  # Convertir Decimal a float.
+        'cantidad': p.cantidad,  # Cantidad disponible.
+        'version': p.version  # Versión del registro (ETag de la actualización con If-Match).
+    }
+
+
+def _invalidar_producto(id_producto):
+    """Anota que el producto cambió: su entrada y las páginas del catálogo se invalidan al confirmar la transacción."""
+    marcar_para_invalidar('productos', f'producto:{id_producto}')
+
 
 class ProductoService:
     @staticmethod
@@ -19,44 +55,104 @@ class ProductoService:
         # Crea una nueva instancia de Producto con los datos proporcionados.
         producto = Producto(nombre=nombre, costo=costo, precio_venta=precio_venta, cantidad=cantidad)
         db.session.add(producto)  # Agrega el nuevo producto a la sesión de la base de datos.
+        db.session.flush()  # Obtiene el ID del producto para registrar su stock inicial.
+        StockService.registrar_movimiento(producto.id_producto, cantidad or 0, 'ajuste')
+        _invalidar_producto(producto.id_producto)  # El catálogo cacheado ya no incluye el producto nuevo.
         db.session.commit()  # Confirma los cambios en la base de datos.
         return producto  # Retorna el producto creado.
 
     @staticmethod
-    def get_all_productos():
+    def get_all_productos(after=None, limit=None):
+        """
+        Obtener una página de los productos, paginada por cursor y servida desde la caché si es posible.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+        
+        Returns:
+            tuple: (List[dict], int | None) con los productos de la página y el cursor de la siguiente página.
+        """
+        def leer_pagina():
+            # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+            # Se leen solo las columnas del listado: la página se guarda como diccionarios y no necesita objetos del ORM.
+            productos, next_cursor = paginar(select(*COLUMNAS_LISTADO), Producto.id_producto, after, limit)
+            return [serializar_producto(p) for p in productos], next_cursor
+
+        cache = obtener_cache('productos')
+        if cache is None:
+            return leer_pagina()
+        # La versión forma parte de la clave: cualquier cambio en un producto deja obsoletas todas las páginas.
+        productos, next_cursor = cache.obtener(f'catalogo:{cache.version()}:{after}:{limit}', leer_pagina)
+        return productos, next_cursor
+
+    @staticmethod
+    def get_producto(id_producto):
         """
-        Obtener todos los productos de la base de datos.
+        Obtener un producto por su ID, servido desde la caché si es posible.
+        
+        Args:
+            id_producto (int): ID del producto.
         
         Returns:
-            List[Producto]: Lista de todos los productos.
+            dict: Datos del producto.
+
+        Raises:
+            ValueError: Si el producto no existe.
         """
-        # Devuelve todos los productos almacenados en la base de datos.
-        return Producto.query.all()  # Utiliza el método query de SQLAlchemy para obtener todos los registros.
+        def leer_producto():
+            producto = db.session.get(Producto, id_producto)
+            return serializar_producto(producto) if producto else None
+
+        cache = obtener_cache('productos')
+        producto = leer_producto() if cache is None else cache.obtener(f'producto:{id_producto}', leer_producto)
+        if producto is None:  # Si no se encuentra el producto, lanza un error.
+            raise ValueError('Producto no encontrado')
+        return producto
 
     @staticmethod
-    def update_producto(id_producto, new_data):
+    def update_producto(id_producto, new_data, version=None):
         """
         Actualizar los datos de un producto existente.
         
         Args:
             id_producto (int): ID del producto a actualizar.
             new_data (dict): Diccionario con los nuevos datos.
+            version (set | None): Versiones que el cliente leyó (encabezado If-Match); None para no verificarla.
         
         Returns:
-            Producto: El producto actualizado.
+            Row: Las columnas de COLUMNAS_LISTADO del producto actualizado.
+        
+        Raises:
+            ConflictoVersionError: Si el registro cambió desde la versión que leyó el cliente.
         """
-        # Busca el producto por su ID en la base de datos.
-        producto = Producto.query.get(id_producto)
-        if not producto:  # Si no se encuentra el producto, lanza un error.
-            raise ValueError('Producto no encontrado')
+        valores = valores_actualizables(Producto, new_data)
+        versiones = version
 
-        # Actualiza los atributos del producto con los nuevos datos proporcionados.
-        for key, value in new_data.items():
-            if hasattr(producto, key):  # Verifica si el producto tiene el atributo que se quiere actualizar.
-                setattr(producto, key, value)  # Actualiza el atributo con el nuevo valor.
+        # Solo el cambio manual de cantidad necesita leer antes el producto: la diferencia con el stock
+        # anterior se registra como ajuste en el libro de stock.
+        if 'cantidad' in valores:
+            anterior = db.session.execute(
+                select(Producto.cantidad, Producto.version).where(Producto.id_producto == id_producto)
+            ).first()
+            if not anterior:  # Si no se encuentra el producto, lanza un error.
+                raise ValueError('Producto no encontrado')
+            verificar_version(anterior.version, version)
+            # El UPDATE se condiciona a la versión leída: si otra petición cambia el stock en el medio,
+            # la diferencia registrada ya no sería correcta y la actualización falla como conflicto.
+            versiones = {anterior.version}
+            StockService.registrar_movimiento(id_producto, (valores['cantidad'] or 0) - (anterior.cantidad or 0), 'ajuste')
 
+        # Un solo UPDATE por clave primaria (y versión, si el cliente envió If-Match) que devuelve el producto actualizado.
+        producto = actualizar(Producto, id_producto, valores, COLUMNAS_LISTADO, versiones)
+        if not producto:  # Si el UPDATE no afectó ninguna fila, el producto no existe.
+            db.session.rollback()  # Descarta el movimiento de stock si el producto se eliminó entre la lectura y el UPDATE.
+            raise ValueError('Producto no encontrado')
+
+        _invalidar_producto(id_producto)  # El producto cacheado se invalida cuando se confirme la transacción.
+        marcar_tabla_modificada(Producto.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return producto  # Retorna el producto actualizado.
+        return producto  # Retorna las columnas del producto actualizado.
 
     @staticmethod
     def delete_producto(id_producto):
@@ -69,10 +165,47 @@ class ProductoService:
         Returns:
             None
         """
-        # Busca el producto por su ID en la base de datos.
-        producto = Producto.query.get(id_producto)
-        if not producto:  # Si no se encuentra el producto, lanza un error.
+        # Un solo DELETE por clave primaria que devuelve el stock que tenía el producto.
+        producto = eliminar(Producto, id_producto, (Producto.cantidad,))
+        if not producto:  # Si el DELETE no afectó ninguna fila, el producto no existe.
             raise ValueError('Producto no encontrado')
+
+        # El stock del producto eliminado sale del libro como ajuste.
+        StockService.registrar_movimiento(id_producto, -(producto.cantidad or 0), 'ajuste')
+        _invalidar_producto(id_producto)  # El producto cacheado se invalida cuando se confirme la transacción.
+        marcar_tabla_modificada(Producto.__tablename__)  # El DELETE directo no pasa por el flush del ORM.
+        db.session.commit()  # Confirma los cambios en la base de datos.
+
+    @staticmethod
+    def ajustar_stock(id_producto, delta, tipo='ajuste'):
+        """
+        Sumar o restar unidades al stock de un producto con un único UPDATE atómico.
         
-        db.session.delete(producto)  # Elimina el producto de la sesión de la base de datos.
-        db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
+        La operación se hace en la base de datos (`cantidad = cantidad + delta`) sin leer
+        antes el producto, por lo que dos ventas concurrentes no pueden sobrevender el mismo
+        artículo. Cuando `delta` es negativo, el UPDATE solo afecta al producto si tiene
+        stock suficiente. Si el stock cambia, registra el movimiento en el libro de stock.
+        No confirma la transacción: lo hace el servicio que llama.
+        
+        Args:
+            id_producto (int): ID del producto.
+            delta (int): Unidades a sumar (positivo) o a restar (negativo).
+            tipo (str): Origen del movimiento: "venta", "compra" o "ajuste".
+        
+        Returns:
+            bool: True si el stock se actualizó; False si el producto no existe o no tiene stock suficiente.
+        """
+        consulta = update(Producto).where(Producto.id_producto == id_producto)
+        if delta < 0:
+            # Rechaza la salida de stock si no hay unidades suficientes, sin bloquear la fila desde Python.
+            consulta = consulta.where(Producto.cantidad >= -delta)
+        # El UPDATE directo no pasa por el ORM: la versión se incrementa a mano para que un PUT con un If-Match viejo falle.
+        consulta = consulta.values(cantidad=func.coalesce(Producto.cantidad, 0) + delta, version=Producto.version + 1)
+
+        resultado = db.session.execute(consulta, execution_options={'synchronize_session': False})
+        if resultado.rowcount != 1:
+            return False
+        StockService.registrar_movimiento(id_producto, delta, tipo)  # Deja constancia del movimiento en el libro.
+        _invalidar_producto(id_producto)  # El stock cacheado se invalida cuando se confirme la transacción.
+        marcar_tabla_modificada(Producto.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
+        return True
@@ -1,5 +1,18 @@
+from sqlalchemy import select  # Importa select para las consultas por columnas.
 from app import db  # Importa la instancia de la base de datos desde la aplicación.
 from app.models.proveedor import Proveedor  # Importa el modelo Proveedor.
+from app.utils.escritura import actualizar, eliminar, valores_actualizables  # Importa los helpers de UPDATE y DELETE en una sola sentencia.
+from app.utils.paginacion import paginar  # Importa el helper de paginación por cursor.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+# Columnas que devuelven los listados en modo de filas ligeras.
+COLUMNAS_LISTADO = (
+    Proveedor.id_proveedor,
+    Proveedor.nombre,
+    Proveedor.contacto,
+    Proveedor.telefono,
+    Proveedor.direccion,
+)
 
 class ProveedorService:
     @staticmethod
@@ -27,15 +40,22 @@ class ProveedorService:
         return proveedor  # Retorna el proveedor creado.
 
     @staticmethod
-    def get_all_proveedores():
+    def get_all_proveedores(after=None, limit=None, ligero=False):
         """
-        Obtener todos los proveedores de la base de datos.
+        Obtener una página de los proveedores de la base de datos, paginada por cursor.
+        
+        Args:
+            after (int | None): ID del último registro de la página anterior; None para la primera página.
+            limit (int | None): Cantidad máxima de registros a devolver.
+            ligero (bool): Si es True, devuelve filas con solo las columnas de COLUMNAS_LISTADO en lugar de objetos del ORM.
         
         Returns:
-            List[Proveedor]: Lista de todos los proveedores.
+            tuple: (List[Proveedor] o List[Row], int | None) con los registros de la página y el cursor de la siguiente página.
         """
-        # Devuelve todos los proveedores almacenados en la base de datos.
-        return Proveedor.query.all()  # Utiliza el método query de SQLAlchemy para obtener todos los registros.
+        # Devuelve solo la página solicitada en lugar de cargar toda la tabla en memoria.
+        # Las filas ligeras evitan construir objetos del ORM y registrarlos en el identity map.
+        consulta = select(*COLUMNAS_LISTADO) if ligero else Proveedor.query
+        return paginar(consulta, Proveedor.id_proveedor, after, limit)
 
     @staticmethod
     def update_proveedor(id_proveedor, new_data):
@@ -47,20 +67,16 @@ class ProveedorService:
             new_data (dict): Diccionario con los nuevos datos.
         
         Returns:
-            Proveedor: El proveedor actualizado.
+            Row: Las columnas de COLUMNAS_LISTADO del proveedor actualizado.
         """
-        # Busca el proveedor por su ID en la base de datos.
-        proveedor = Proveedor.query.get(id_proveedor)
-        if not proveedor:  # Si no se encuentra el proveedor, lanza un error.
+        # Un solo UPDATE por clave primaria: no se lee el proveedor antes de modificarlo.
+        proveedor = actualizar(Proveedor, id_proveedor, valores_actualizables(Proveedor, new_data), COLUMNAS_LISTADO)
+        if not proveedor:  # Si el UPDATE no afectó ninguna fila, el proveedor no existe.
             raise ValueError('Proveedor no encontrado')
-        
-        # Actualiza los atributos del proveedor con los nuevos datos proporcionados.
-        for key, value in new_data.items():
-            if hasattr(proveedor, key):  # Verifica si el proveedor tiene el atributo que se quiere actualizar.
-                setattr(proveedor, key, value)  # Actualiza el atributo con el nuevo valor.
-        
+
+        marcar_tabla_modificada(Proveedor.__tablename__)  # El UPDATE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
-        return proveedor  # Retorna el proveedor actualizado.
+        return proveedor  # Retorna las columnas del proveedor actualizado.
 
     @staticmethod
     def delete_proveedor(id_proveedor):
@@ -73,10 +89,9 @@ class ProveedorService:
         Returns:
             None
         """
-        # Busca el proveedor por su ID en la base de datos.
-        proveedor = Proveedor.query.get(id_proveedor)
-        if not proveedor:  # Si no se encuentra el proveedor, lanza un error.
+        # Un solo DELETE por clave primaria: si no afectó ninguna fila, el proveedor no existe.
+        if not eliminar(Proveedor, id_proveedor):
             raise ValueError('Proveedor no encontrado')
-        
-        db.session.delete(proveedor)  # Elimina el proveedor de la sesión de la base de datos.
+
+        marcar_tabla_modificada(Proveedor.__tablename__)  # El DELETE directo no pasa por el flush del ORM.
         db.session.commit()  # Confirma los cambios en la base de datos.
\ No newline at end of file
@@ -0,0 +1,277 @@
+from sqlalchemy import Integer, case, cast, extract, func, select  # Importa las funciones para construir las consultas de agregación.
+from app import db  # Importa la instancia de la base de datos desde la aplicación.
+from app.models.cliente import Cliente  # Importa el modelo Cliente.
+from app.models.detalleOrdenCompra import DetalleOrdenCompra  # Importa el modelo DetalleOrdenCompra.
+from app.models.detalleOrdenVenta import DetalleOrdenVenta  # Importa el modelo DetalleOrdenVenta.
+from app.models.ordenCompra import OrdenCompra  # Importa el modelo OrdenCompra.
+from app.models.ordenVenta import OrdenVenta  # Importa el modelo OrdenVenta.
+from app.models.producto import Producto  # Importa el modelo Producto.
+from app.models.proveedor import Proveedor  # Importa el modelo Proveedor.
+from app.models.resumenVentasDiario import ResumenVentasDiario  # Importa el modelo ResumenVentasDiario.
+from app.services.resumen_ventas_service import ESTADO_RESUMEN  # Estado de las órdenes que cuenta el resumen diario.
+
+# Agrupaciones del reporte de ventas.
+AGRUPACIONES_VENTAS = ('producto', 'cliente', 'dia', 'mes')
+
+# Agrupaciones que se pueden responder con el resumen diario (no guarda el cliente).
+AGRUPACIONES_RESUMEN = ('producto', 'dia', 'mes')
+
+# Agrupaciones del reporte de compras: por proveedor o por proveedor y producto.
+AGRUPACIONES_COMPRAS = ('proveedor', 'producto')
+
+# Percentiles del plazo de entrega que devuelve el reporte de compras.
+PERCENTILES_PLAZO = (50, 90)
+
+# Versión mínima de cada motor con funciones de ventana (ROW_NUMBER() OVER ...).
+VERSION_MINIMA_VENTANAS = {'sqlite': (3, 25), 'mysql': (8, 0), 'mariadb': (10, 2), 'postgresql': (8, 4)}
+
+
+def _columnas_agrupacion(agrupar, fecha):
+    """Columnas del GROUP BY de la agrupación, con la etiqueta con la que aparecen en la respuesta."""
+    if agrupar == 'producto':
+        return Producto.id_producto.label('id_producto'), Producto.nombre.label('nombre')
+    if agrupar == 'cliente':
+        return Cliente.id_cliente.label('id_cliente'), Cliente.nombre.label('nombre')
+    if agrupar == 'dia':
+        return (fecha.label('fecha'),)
+    return extract('year', fecha).label('anio'), extract('month', fecha).label('mes')
+
+
+def _dias_entre(inicio, final):
+    """Expresión SQL con los días entre dos fechas, según el motor de la base de datos."""
+    dialecto = db.session.get_bind().dialect.name
+    if dialecto in ('mysql', 'mariadb'):
+        return func.datediff(final, inicio)
+    if dialecto == 'sqlite':
+        return cast(func.julianday(final) - func.julianday(inicio), Integer)
+    return final - inicio  # PostgreSQL y otros: la resta de fechas da días.
+
+
+def _soporta_ventanas():
+    """Indicar si la base de datos soporta funciones de ventana."""
+    dialecto = db.session.get_bind().dialect
+    nombre = 'mariadb' if getattr(dialecto, 'is_mariadb', False) else dialecto.name
+    minima = VERSION_MINIMA_VENTANAS.get(nombre)
+    return minima is not None and tuple(dialecto.server_version_info or ()) >= minima
+
+
+def _rango_percentil(percentil, total):
+    """Posición (desde 1) del percentil en una lista ordenada de `total` valores: el menor valor que cubre ese porcentaje."""
+    return max(1, -(-percentil * total // 100))
+
+
+class ReporteService:
+    @staticmethod
+    def get_reporte_ventas(desde=None, hasta=None, agrupar='producto', solo_completadas=True):
+        """
+        Obtener las unidades, los ingresos, el costo y el margen de las ventas agrupados por producto, cliente, día o mes.
+
+        Todo se calcula en la base de datos con una sola consulta y GROUP BY, por lo que solo viaja una
+        fila por grupo. Para las órdenes completadas agrupadas por producto, día o mes se lee el resumen
+        diario (`resumen_ventas_diario`), que tiene una fila por día y producto; en los demás casos se
+        agregan los detalles de venta. Los importes se calculan con el precio de venta y el costo actuales
+        de cada producto.
+
+        Args:
+            desde (date | None): Solo las órdenes con fecha de inicio mayor o igual a esta fecha.
+            hasta (date | None): Solo las órdenes con fecha de inicio menor o igual a esta fecha.
+            agrupar (str): Agrupación de AGRUPACIONES_VENTAS: "producto", "cliente", "dia" o "mes".
+            solo_completadas (bool): Si es True, solo se cuentan las órdenes en estado "completado".
+
+        Returns:
+            list[dict]: Un diccionario por grupo con sus columnas más unidades, ingresos, costo y margen.
+
+        Raises:
+            ValueError: Si la agrupación no es válida o si el rango de fechas está invertido.
+        """
+        if agrupar not in AGRUPACIONES_VENTAS:
+            raise ValueError(f"Agrupación no válida: {agrupar}. Use una de: {', '.join(AGRUPACIONES_VENTAS)}.")
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a la fecha 'desde'.")
+
+        if solo_completadas and agrupar in AGRUPACIONES_RESUMEN:
+            return ReporteService._ventas_desde_resumen(desde, hasta, agrupar)
+
+        columnas = _columnas_agrupacion(agrupar, OrdenVenta.fecha_inicio)
+        ingresos = func.sum(DetalleOrdenVenta.cantidad * Producto.precio_venta)
+        costo = func.sum(DetalleOrdenVenta.cantidad * Producto.costo)
+
+        consulta = select(
+            *columnas,
+            func.sum(DetalleOrdenVenta.cantidad).label('unidades'),
+            ingresos.label('ingresos'),
+            costo.label('costo'),
+            (ingresos - costo).label('margen'),
+        ).join(
+            OrdenVenta, OrdenVenta.id_orden_venta == DetalleOrdenVenta.id_orden_venta
+        ).join(
+            Producto, Producto.id_producto == DetalleOrdenVenta.id_producto
+        )
+        if agrupar == 'cliente':
+            consulta = consulta.join(Cliente, Cliente.id_cliente == OrdenVenta.id_cliente)
+
+        # Los filtros se aplican antes de agrupar, para que la base de datos descarte las filas con el índice.
+        if solo_completadas:
+            consulta = consulta.where(OrdenVenta.estado == ESTADO_RESUMEN)
+        if desde is not None:
+            consulta = consulta.where(OrdenVenta.fecha_inicio >= desde)
+        if hasta is not None:
+            consulta = consulta.where(OrdenVenta.fecha_inicio <= hasta)
+
+        consulta = consulta.group_by(*columnas).order_by(*columnas)
+        return [dict(fila._mapping) for fila in db.session.execute(consulta)]
+
+    @staticmethod
+    def _ventas_desde_resumen(desde, hasta, agrupar):
+        """Calcular el reporte de ventas de las órdenes completadas a partir del resumen diario."""
+        columnas = _columnas_agrupacion(agrupar, ResumenVentasDiario.fecha)
+        ingresos = func.sum(ResumenVentasDiario.unidades * Producto.precio_venta)
+        costo = func.sum(ResumenVentasDiario.unidades * Producto.costo)
+
+        consulta = select(
+            *columnas,
+            func.sum(ResumenVentasDiario.unidades).label('unidades'),
+            ingresos.label('ingresos'),
+            costo.label('costo'),
+            (ingresos - costo).label('margen'),
+        ).join(Producto, Producto.id_producto == ResumenVentasDiario.id_producto)
+        if desde is not None:
+            consulta = consulta.where(ResumenVentasDiario.fecha >= desde)
+        if hasta is not None:
+            consulta = consulta.where(ResumenVentasDiario.fecha <= hasta)
+
+        consulta = consulta.group_by(*columnas).order_by(*columnas)
+        return [dict(fila._mapping) for fila in db.session.execute(consulta)]
+
+    @staticmethod
+    def get_reporte_compras(desde=None, hasta=None, agrupar='proveedor', solo_completadas=True):
+        """
+        Obtener el gasto y el plazo de entrega de las compras por proveedor o por proveedor y producto.
+
+        El gasto (cantidad × costo del producto) se agrega con una consulta sobre órdenes, detalles y
+        productos. El plazo de entrega (días entre fecha_inicio y fecha_final de cada orden) se resume con
+        otra consulta: promedio y percentiles calculados con funciones de ventana si el motor las soporta,
+        o recorriendo los plazos ya ordenados por la base de datos si no, sin guardarlos en memoria.
+
+        Args:
+            desde (date | None): Solo las órdenes con fecha de inicio mayor o igual a esta fecha.
+            hasta (date | None): Solo las órdenes con fecha de inicio menor o igual a esta fecha.
+            agrupar (str): "proveedor" o "producto" (por proveedor y producto).
+            solo_completadas (bool): Si es True, solo se cuentan las órdenes en estado "completado".
+
+        Returns:
+            list[dict]: Un diccionario por grupo con órdenes, unidades, gasto, plazo promedio y percentiles del plazo.
+
+        Raises:
+            ValueError: Si la agrupación no es válida o si el rango de fechas está invertido.
+        """
+        if agrupar not in AGRUPACIONES_COMPRAS:
+            raise ValueError(f"Agrupación no válida: {agrupar}. Use una de: {', '.join(AGRUPACIONES_COMPRAS)}.")
+        if desde is not None and hasta is not None and hasta < desde:
+            raise ValueError("La fecha 'hasta' no puede ser anterior a la fecha 'desde'.")
+
+        def filtrar(consulta):
+            # Los mismos filtros para el gasto y para los plazos.
+            if solo_completadas:
+                consulta = consulta.where(OrdenCompra.estado == 'completado')
+            if desde is not None:
+                consulta = consulta.where(OrdenCompra.fecha_inicio >= desde)
+            if hasta is not None:
+                consulta = consulta.where(OrdenCompra.fecha_inicio <= hasta)
+            return consulta
+
+        # Gasto y unidades por grupo.
+        columnas = [Proveedor.id_proveedor.label('id_proveedor'), Proveedor.nombre.label('proveedor')]
+        if agrupar == 'producto':
+            columnas += [Producto.id_producto.label('id_producto'), Producto.nombre.label('producto')]
+        gasto = filtrar(select(
+            *columnas,
+            func.count(OrdenCompra.id_orden_compra.distinct()).label('ordenes'),
+            func.sum(DetalleOrdenCompra.cantidad).label('unidades'),
+            func.sum(DetalleOrdenCompra.cantidad * Producto.costo).label('gasto'),
+        ).select_from(DetalleOrdenCompra).join(
+            OrdenCompra, OrdenCompra.id_orden_compra == DetalleOrdenCompra.id_orden_compra
+        ).join(
+            Producto, Producto.id_producto == DetalleOrdenCompra.id_producto
+        ).join(
+            Proveedor, Proveedor.id_proveedor == OrdenCompra.id_proveedor
+        )).group_by(*columnas).order_by(*columnas)
+
+        # Plazo de cada orden (una fila por orden y grupo), solo para las órdenes con ambas fechas.
+        claves = [OrdenCompra.id_proveedor]
+        plazos = select(OrdenCompra.id_orden_compra, OrdenCompra.id_proveedor)
+        if agrupar == 'producto':
+            claves.append(DetalleOrdenCompra.id_producto)
+            plazos = plazos.add_columns(DetalleOrdenCompra.id_producto).join(
+                DetalleOrdenCompra, DetalleOrdenCompra.id_orden_compra == OrdenCompra.id_orden_compra
+            ).distinct()
+        plazos = filtrar(plazos.add_columns(
+            _dias_entre(OrdenCompra.fecha_inicio, OrdenCompra.fecha_final).label('plazo')
+        ).where(OrdenCompra.fecha_inicio.is_not(None), OrdenCompra.fecha_final.is_not(None))).subquery()
+
+        if _soporta_ventanas():
+            estadisticas = ReporteService._plazos_con_ventanas(plazos, len(claves))
+        else:
+            estadisticas = ReporteService._plazos_en_stream(plazos, len(claves))
+
+        vacio = dict.fromkeys(['plazo_promedio'] + [f'plazo_p{p}' for p in PERCENTILES_PLAZO])
+        resultado = []
+        for fila in db.session.execute(gasto):
+            grupo = dict(fila._mapping)
+            clave = (grupo['id_proveedor'], grupo['id_producto']) if agrupar == 'producto' else (grupo['id_proveedor'],)
+            grupo.update(estadisticas.get(clave, vacio))
+            resultado.append(grupo)
+        return resultado
+
+    @staticmethod
+    def _plazos_con_ventanas(plazos, cantidad_claves):
+        """Calcular promedio y percentiles del plazo por grupo con una consulta que usa ROW_NUMBER() y COUNT() OVER."""
+        claves = list(plazos.c)[1:1 + cantidad_claves]
+        ventana = select(
+            *claves,
+            plazos.c.plazo,
+            func.row_number().over(partition_by=claves, order_by=plazos.c.plazo).label('posicion'),
+            func.count().over(partition_by=claves).label('total'),
+        ).subquery()
+        claves = list(ventana.c)[:cantidad_claves]
+        # El percentil p es el primer plazo cuya posición cubre el p% del grupo: posicion * 100 >= p * total.
+        consulta = select(
+            *claves,
+            func.avg(ventana.c.plazo).label('plazo_promedio'),
+            *[func.min(case((ventana.c.posicion * 100 >= p * ventana.c.total, ventana.c.plazo))).label(f'plazo_p{p}')
+              for p in PERCENTILES_PLAZO],
+        ).group_by(*claves)
+        return {
+            tuple(fila[:cantidad_claves]): dict(list(fila._mapping.items())[cantidad_claves:])
+            for fila in db.session.execute(consulta)
+        }
+
+    @staticmethod
+    def _plazos_en_stream(plazos, cantidad_claves, tamano_lote=1000):
+        """
+        Calcular promedio y percentiles del plazo por grupo sin funciones de ventana.
+
+        Primero se cuentan las órdenes de cada grupo; después se recorren los plazos ordenados por
+        grupo y plazo en lotes (`yield_per`) y se toma el valor de la posición de cada percentil,
+        de modo que en memoria solo hay un lote a la vez.
+        """
+        claves = list(plazos.c)[1:1 + cantidad_claves]
+        estadisticas = {}
+        totales = {}
+        for fila in db.session.execute(select(*claves, func.count(), func.avg(plazos.c.plazo)).group_by(*claves)):
+            clave = tuple(fila[:cantidad_claves])
+            totales[clave] = fila[cantidad_claves]
+            estadisticas[clave] = {'plazo_promedio': fila[cantidad_claves + 1]}
+
+        consulta = select(*claves, plazos.c.plazo).order_by(*claves, plazos.c.plazo).execution_options(yield_per=tamano_lote)
+        clave_actual, posicion, rangos = None, 0, {}
+        for fila in db.session.execute(consulta):
+            clave = tuple(fila[:cantidad_claves])
+            if clave != clave_actual:
+                clave_actual, posicion = clave, 0
+                rangos = {p: _rango_percentil(p, totales[clave]) for p in PERCENTILES_PLAZO}
+            posicion += 1
+            for p, rango in rangos.items():
+                if posicion == rango:
+                    estadisticas[clave][f'plazo_p{p}'] = fila.plazo
+        return estadisticas
@@ -0,0 +1,172 @@
+from datetime import timedelta  # Importa timedelta para recorrer los rangos de fechas de la reconstrucción.
+from sqlalchemy import delete, func, insert, select, update  # Importa las funciones para construir las consultas.
+from sqlalchemy.dialects.mysql import insert as mysql_insert  # INSERT ... ON DUPLICATE KEY UPDATE de MySQL.
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert  # INSERT ... ON CONFLICT de PostgreSQL.
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # INSERT ... ON CONFLICT de SQLite.
+from app import db  # Importa la instancia de la base de datos desde la aplicación.
+from app.models.detalleOrdenVenta import DetalleOrdenVenta  # Importa el modelo DetalleOrdenVenta.
+from app.models.ordenVenta import OrdenVenta  # Importa el modelo OrdenVenta.
+from app.models.resumenVentasDiario import ResumenVentasDiario  # Importa el modelo ResumenVentasDiario.
+from app.utils.versiones import marcar_tabla_modificada  # Importa el registro de tablas modificadas para los ETag.
+
+# Estado de las órdenes que cuentan en el resumen.
+ESTADO_RESUMEN = 'completado'
+
+
+def _upsert(filas):
+    """Sumar las unidades a cada fila (fecha, id_producto) del resumen, creándola si no existe, con un solo executemany."""
+    dialecto = db.session.get_bind().dialect.name
+    tabla = ResumenVentasDiario.__table__
+    if dialecto in ('mysql', 'mariadb'):
+        consulta = mysql_insert(tabla)
+        consulta = consulta.on_duplicate_key_update(unidades=tabla.c.unidades + consulta.inserted.unidades)
+    elif dialecto in ('sqlite', 'postgresql'):
+        consulta = (sqlite_insert if dialecto == 'sqlite' else postgresql_insert)(tabla)
+        consulta = consulta.on_conflict_do_update(
+            index_elements=[tabla.c.fecha, tabla.c.id_producto],
+            set_={'unidades': tabla.c.unidades + consulta.excluded.unidades},
+        )
+    else:
+        # Motores sin upsert: UPDATE y, si no había fila, INSERT.
+        for fila in filas:
+            resultado = db.session.execute(
+                update(tabla).where(tabla.c.fecha == fila['fecha'], tabla.c.id_producto == fila['id_producto'])
+                .values(unidades=tabla.c.unidades + fila['unidades'])
+            )
+            if resultado.rowcount == 0:
+                db.session.execute(insert(tabla).values(**fila))
+        return
+    db.session.execute(consulta, filas)
+
+
+class ResumenVentasService:
+    @staticmethod
+    def sumar(unidades_por_clave):
+        """
+        Sumar (o restar) unidades al resumen diario.
+
+        No confirma la transacción: el resumen se actualiza junto con el cambio que lo originó.
+
+        Args:
+            unidades_por_clave (dict): Diccionario {(fecha, id_producto): unidades}; las unidades negativas restan.
+        """
+        filas = [
+            {'fecha': fecha, 'id_producto': id_producto, 'unidades': unidades}
+            for (fecha, id_producto), unidades in sorted(unidades_por_clave.items())  # Orden fijo de bloqueo de filas.
+            if unidades and fecha is not None
+        ]
+        if not filas:
+            return
+        _upsert(filas)
+        if any(fila['unidades'] < 0 for fila in filas):
+            # Las filas que quedan en cero se eliminan para que el resumen solo tenga días con ventas.
+            db.session.execute(delete(ResumenVentasDiario).where(
+                ResumenVentasDiario.unidades <= 0,
+                ResumenVentasDiario.fecha.in_({fila['fecha'] for fila in filas}),
+            ))
+        marcar_tabla_modificada(ResumenVentasDiario.__tablename__)  # Las sentencias directas no pasan por el flush del ORM.
+
+    @staticmethod
+    def sumar_lineas(lineas, signo=1):
+        """
+        Sumar al resumen las unidades de líneas de venta, según la fecha y el estado actuales de su orden.
+
+        Las líneas de órdenes que no están completadas no cambian el resumen. Las órdenes se leen
+        con una sola consulta `IN (...)`.
+
+        Args:
+            lineas (Iterable[tuple]): Tuplas (id_orden_venta, id_producto, cantidad).
+            signo (int): 1 para sumar las unidades, -1 para restarlas.
+        """
+        lineas = [linea for linea in lineas if linea[2]]
+        if not lineas:
+            return
+        fechas = dict(db.session.execute(
+            select(OrdenVenta.id_orden_venta, OrdenVenta.fecha_inicio).where(
+                OrdenVenta.id_orden_venta.in_({id_orden for id_orden, _, _ in lineas}),
+                OrdenVenta.estado == ESTADO_RESUMEN,
+            )
+        ).all())
+        unidades_por_clave = {}
+        for id_orden, id_producto, cantidad in lineas:
+            if id_orden in fechas:
+                clave = (fechas[id_orden], id_producto)
+                unidades_por_clave[clave] = unidades_por_clave.get(clave, 0) + signo * cantidad
+        ResumenVentasService.sumar(unidades_por_clave)
+
+    @staticmethod
+    def sumar_orden(id_orden_venta, signo=1):
+        """
+        Sumar al resumen todas las líneas de una orden de venta, según su fecha y estado en la base de datos.
+
+        Se llama con signo -1 antes de cambiar la fecha o el estado de una orden y con signo 1 después,
+        de modo que las unidades pasan de un día a otro (o entran y salen del resumen) sin recalcular nada más.
+
+        Args:
+            id_orden_venta (int): ID de la orden de venta.
+            signo (int): 1 para sumar las unidades, -1 para restarlas.
+        """
+        filas = db.session.execute(
+            select(OrdenVenta.fecha_inicio, DetalleOrdenVenta.id_producto, func.sum(DetalleOrdenVenta.cantidad))
+            .join(OrdenVenta, OrdenVenta.id_orden_venta == DetalleOrdenVenta.id_orden_venta)
+            .where(OrdenVenta.id_orden_venta == id_orden_venta, OrdenVenta.estado == ESTADO_RESUMEN)
+            .group_by(OrdenVenta.fecha_inicio, DetalleOrdenVenta.id_producto)
+        )
+        ResumenVentasService.sumar({
+            (fecha, id_producto): signo * int(unidades or 0) for fecha, id_producto, unidades in filas
+        })
+
+    @staticmethod
+    def reconstruir(dias_por_lote=31):
+        """
+        Recalcular el resumen desde cero a partir de los detalles de venta, por rangos de fechas.
+
+        Cada rango se borra y se vuelve a cargar con un INSERT ... SELECT agregado en su propia
+        transacción, por lo que los datos no pasan por Python y las transacciones son cortas.
+
+        Args:
+            dias_por_lote (int): Cantidad de días que se recalculan en cada transacción.
+
+        Returns:
+            int: Cantidad de filas del resumen después de la reconstrucción.
+
+        Raises:
+            ValueError: Si la cantidad de días por lote no es positiva.
+        """
+        if dias_por_lote <= 0:
+            raise ValueError("La cantidad de días por lote debe ser mayor que cero.")
+
+        primera, ultima = db.session.execute(
+            select(func.min(OrdenVenta.fecha_inicio), func.max(OrdenVenta.fecha_inicio))
+            .where(OrdenVenta.estado == ESTADO_RESUMEN)
+        ).one()
+
+        # Elimina las filas fuera del rango con ventas (por ejemplo, de órdenes ya borradas).
+        fuera_de_rango = delete(ResumenVentasDiario)
+        if primera is not None:
+            fuera_de_rango = fuera_de_rango.where(
+                (ResumenVentasDiario.fecha < primera) | (ResumenVentasDiario.fecha > ultima)
+            )
+        db.session.execute(fuera_de_rango)
+        marcar_tabla_modificada(ResumenVentasDiario.__tablename__)
+        db.session.commit()
+
+        desde = primera
+        while desde is not None and desde <= ultima:
+            hasta = min(desde + timedelta(days=dias_por_lote - 1), ultima)
+            db.session.execute(delete(ResumenVentasDiario).where(ResumenVentasDiario.fecha.between(desde, hasta)))
+            agregado = select(
+                OrdenVenta.fecha_inicio, DetalleOrdenVenta.id_producto, func.sum(DetalleOrdenVenta.cantidad)
+            ).join(
+                OrdenVenta, OrdenVenta.id_orden_venta == DetalleOrdenVenta.id_orden_venta
+            ).where(
+                OrdenVenta.estado == ESTADO_RESUMEN,
+                OrdenVenta.fecha_inicio.between(desde, hasta),
+                DetalleOrdenVenta.cantidad.is_not(None),
+            ).group_by(OrdenVenta.fecha_inicio, DetalleOrdenVenta.id_producto)
+            db.session.execute(insert(ResumenVentasDiario).from_select(['fecha', 'id_producto', 'unidades'], agregado))
+            marcar_tabla_modificada(ResumenVentasDiario.__tablename__)
+            db.session.commit()  # Cada rango se confirma por separado para no mantener bloqueos largos.
+            desde = hasta + timedelta(days=1)
+
+        return db.session.scalar(select(func.count()).select_from(ResumenVentasDiario))
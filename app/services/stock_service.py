@@ -0,0 +1,161 @@
+from datetime import date  # Importa date para fechar los movimientos de stock.
+from sqlalchemy import and_, delete, exists, insert, literal, or_, select, func  # Importa las funciones para construir las consultas.
+from app import db  # Importa la instancia de la base de datos desde la aplicación.
+from app.models.movimientoStock import MovimientoStock  # Importa el modelo MovimientoStock.
+from app.models.snapshotStock import SnapshotStock  # Importa el modelo SnapshotStock.
+from app.models.producto import Producto  # Importa el modelo Producto.
+
+class StockService:
+    @staticmethod
+    def registrar_movimiento(id_producto, cantidad, tipo):
+        """
+        Registrar un movimiento en el libro de stock.
+
+        No confirma la transacción: el movimiento se guarda junto con el cambio de stock que lo originó.
+
+        Args:
+            id_producto (int): ID del producto.
+            cantidad (int): Unidades sumadas (positivo) o restadas (negativo).
+            tipo (str): Origen del movimiento: "venta", "compra" o "ajuste".
+        """
+        # Un movimiento sin unidades no cambia el stock, por lo que no se registra.
+        if not cantidad:
+            return
+        db.session.execute(insert(MovimientoStock).values(
+            id_producto=id_producto, fecha=date.today(), cantidad=cantidad, tipo=tipo
+        ))
+
+    @staticmethod
+    def get_stock_en_fecha_lote(fecha, ids_producto=None):
+        """
+        Obtener el stock de varios productos al final de una fecha.
+
+        Para cada producto toma el último snapshot con fecha menor o igual y le suma los
+        movimientos registrados después de ese snapshot, por lo que el costo depende del
+        tiempo transcurrido desde el último snapshot y no del historial completo.
+
+        Args:
+            fecha (date): Fecha de la consulta.
+            ids_producto (Iterable[int] | None): IDs de los productos; None para todos los que tengan historial.
+
+        Returns:
+            dict: Diccionario {id_producto: cantidad} con el stock de cada producto.
+        """
+        if ids_producto is not None:
+            ids_producto = set(ids_producto)
+            if not ids_producto:
+                return {}
+
+        # Último snapshot de cada producto hasta la fecha consultada.
+        ultimas_fechas = select(
+            SnapshotStock.id_producto, func.max(SnapshotStock.fecha).label('fecha')
+        ).where(SnapshotStock.fecha <= fecha).group_by(SnapshotStock.id_producto)
+        if ids_producto is not None:
+            ultimas_fechas = ultimas_fechas.where(SnapshotStock.id_producto.in_(ids_producto))
+        ultimas_fechas = ultimas_fechas.subquery()
+
+        snapshots = select(SnapshotStock.id_producto, SnapshotStock.fecha, SnapshotStock.cantidad).join(
+            ultimas_fechas,
+            and_(SnapshotStock.id_producto == ultimas_fechas.c.id_producto, SnapshotStock.fecha == ultimas_fechas.c.fecha),
+        ).subquery()
+
+        stock = {fila.id_producto: fila.cantidad for fila in db.session.execute(select(snapshots))}
+
+        # Suma de los movimientos posteriores al snapshot (o de todos, si el producto no tiene snapshot).
+        movimientos = select(
+            MovimientoStock.id_producto, func.sum(MovimientoStock.cantidad).label('cantidad')
+        ).outerjoin(
+            snapshots, snapshots.c.id_producto == MovimientoStock.id_producto
+        ).where(
+            MovimientoStock.fecha <= fecha,
+            or_(snapshots.c.fecha.is_(None), MovimientoStock.fecha > snapshots.c.fecha),
+        ).group_by(MovimientoStock.id_producto)
+        if ids_producto is not None:
+            movimientos = movimientos.where(MovimientoStock.id_producto.in_(ids_producto))
+
+        for fila in db.session.execute(movimientos):
+            stock[fila.id_producto] = stock.get(fila.id_producto, 0) + int(fila.cantidad)
+
+        # Los productos sin historial hasta esa fecha tenían stock cero.
+        if ids_producto is not None:
+            for id_producto in ids_producto:
+                stock.setdefault(id_producto, 0)
+        return stock
+
+    @staticmethod
+    def get_stock_en_fecha(id_producto, fecha):
+        """
+        Obtener el stock de un producto al final de una fecha.
+
+        Args:
+            id_producto (int): ID del producto.
+            fecha (date): Fecha de la consulta.
+
+        Returns:
+            int: Stock del producto en esa fecha.
+
+        Raises:
+            ValueError: Si el producto no existe.
+        """
+        if not db.session.execute(select(exists().where(Producto.id_producto == id_producto))).scalar():
+            raise ValueError('Producto no encontrado')
+        return StockService.get_stock_en_fecha_lote(fecha, [id_producto])[id_producto]
+
+    @staticmethod
+    def crear_snapshots(fecha):
+        """
+        Guardar el stock de todos los productos con historial al final de una fecha.
+
+        Si ya existían snapshots para esa fecha se reemplazan, de modo que el comando
+        puede ejecutarse varias veces sin duplicar filas.
+
+        Args:
+            fecha (date): Fecha del snapshot; debe ser un día ya cerrado.
+
+        Returns:
+            int: Cantidad de snapshots guardados.
+
+        Raises:
+            ValueError: Si la fecha no es anterior a hoy.
+        """
+        # Los movimientos se fechan con el día actual, por lo que solo un día cerrado tiene stock definitivo.
+        if fecha >= date.today():
+            raise ValueError("Solo se pueden generar snapshots de fechas anteriores a hoy.")
+
+        db.session.execute(delete(SnapshotStock).where(SnapshotStock.fecha == fecha))
+        stock = StockService.get_stock_en_fecha_lote(fecha)
+        if stock:
+            db.session.execute(insert(SnapshotStock), [
+                {'id_producto': id_producto, 'fecha': fecha, 'cantidad': cantidad}
+                for id_producto, cantidad in stock.items()
+            ])
+        db.session.commit()  # Confirma los cambios en la base de datos.
+        return len(stock)
+
+    @staticmethod
+    def crear_movimientos_iniciales():
+        """
+        Registrar como ajuste la diferencia entre el stock actual de cada producto y la suma de sus movimientos.
+
+        La migración del libro ya registra el saldo de apertura; este comando lo corrige en las bases
+        donde se creó sin él (o donde el stock se modificó por fuera de la aplicación). Puede ejecutarse
+        varias veces: los productos cuyo libro ya coincide con su stock no reciben movimientos.
+
+        Returns:
+            int: Cantidad de movimientos registrados.
+        """
+        # Un solo INSERT ... SELECT con la diferencia de cada producto cuyo libro no coincide con su stock.
+        movimientos = select(
+            MovimientoStock.id_producto, func.sum(MovimientoStock.cantidad).label('cantidad')
+        ).group_by(MovimientoStock.id_producto).subquery()
+        diferencia = func.coalesce(Producto.cantidad, 0) - func.coalesce(movimientos.c.cantidad, 0)
+        sin_conciliar = select(
+            Producto.id_producto, literal(date.today()), diferencia, literal('ajuste')
+        ).outerjoin(
+            movimientos, movimientos.c.id_producto == Producto.id_producto
+        ).where(diferencia != 0)
+        resultado = db.session.execute(insert(MovimientoStock).from_select(
+            ['id_producto', 'fecha', 'cantidad', 'tipo'], sin_conciliar
+        ))
+        db.session.commit()  # Confirma los cambios en la base de datos.
+        return resultado.rowcount
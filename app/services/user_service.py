@@ -0,0 +1,173 @@
+from flask import current_app  # Importa current_app para leer el rol por defecto de la configuración.
+from sqlalchemy import select  # Importa select para las consultas por columnas.
+from sqlalchemy.exc import IntegrityError  # Error de la base de datos al repetir un nombre de usuario.
+from sqlalchemy.orm import joinedload  # Carga el rol junto con el usuario en la misma consulta.
+from app import db  # Importa la instancia de la base de datos desde la aplicación.
+from app.models.role import Role  # Importa el modelo Role.
+from app.models.user import User  # Importa el modelo User.
+from app.utils.cache import marcar_para_invalidar, obtener_cache  # Importa los helpers de la caché de usuarios.
+from app.utils.contrasenas import generar_hash, hash_ficticio, necesita_rehash, verificar  # Hash bcrypt en el pool de hilos.
+
+# Longitud mínima de las contraseñas.
+LONGITUD_MINIMA_PASSWORD = 8
+
+
+def _invalidar_usuario(username):
+    """Anota que el usuario cambió: su estado en caché se invalida al confirmar la transacción."""
+    marcar_para_invalidar('usuarios', f'usuario:{username}')
+
+
+class UserService:
+    @staticmethod
+    def create_user(username, password, rol=None):
+        """
+        Crear un nuevo usuario con el hash bcrypt de su contraseña.
+
+        Args:
+            username (str): Nombre de usuario.
+            password (str): Contraseña en texto plano.
+            rol (str | None): Nombre del rol; None para usar AUTH_ROL_POR_DEFECTO.
+
+        Returns:
+            User: El usuario creado.
+
+        Raises:
+            ValueError: Si faltan datos, la contraseña es corta, el rol no existe o el nombre de usuario ya está en uso.
+        """
+        if not username or not username.strip():
+            raise ValueError("El nombre de usuario es obligatorio.")
+        if not password or len(password) < LONGITUD_MINIMA_PASSWORD:
+            raise ValueError(f"La contraseña debe tener al menos {LONGITUD_MINIMA_PASSWORD} caracteres.")
+
+        nombre_rol = rol or current_app.config['AUTH_ROL_POR_DEFECTO']
+        role = db.session.execute(select(Role).where(Role.name == nombre_rol)).scalar_one_or_none()
+        if role is None:
+            raise ValueError("El rol especificado no existe.")
+        if db.session.execute(select(User.id_usuario).where(User.username == username)).first():
+            raise ValueError("El nombre de usuario ya está en uso.")
+
+        user = User(username=username, password_hash=generar_hash(password), id_rol=role.id_rol)
+        db.session.add(user)  # Agrega el nuevo usuario a la sesión de la base de datos.
+        _invalidar_usuario(username)  # Descarta un "no existe" que haya quedado en la caché.
+        try:
+            db.session.commit()  # Confirma los cambios en la base de datos.
+        except IntegrityError:
+            # Otro registro con el mismo nombre se confirmó entre la verificación y el commit.
+            db.session.rollback()
+            raise ValueError("El nombre de usuario ya está en uso.")
+        return user  # Retorna el usuario creado.
+
+    @staticmethod
+    def autenticar(username, password):
+        """
+        Verificar las credenciales de un usuario activo.
+
+        Si el hash guardado se generó con un costo distinto de BCRYPT_LOG_ROUNDS, se recalcula con
+        la contraseña recibida, de modo que cambiar el costo no obliga a los usuarios a cambiar su contraseña.
+        Un usuario inexistente cuesta lo mismo que una contraseña incorrecta (ver `hash_ficticio`).
+
+        Args:
+            username (str): Nombre de usuario.
+            password (str): Contraseña en texto plano.
+
+        Returns:
+            User: El usuario autenticado, con su rol cargado.
+
+        Raises:
+            ValueError: Si el usuario no existe, está inactivo o la contraseña es incorrecta.
+        """
+        user = UserService.get_user_by_username(username)
+        # La contraseña se verifica siempre, en el mismo pool de hashing: con un usuario inexistente se usa un hash
+        # ficticio, para que el tiempo de respuesta no revele qué nombres de usuario existen.
+        valida = verificar(user.password_hash if user else hash_ficticio(), password or '')
+        if user is None or not user.activo or not password or not valida:
+            raise ValueError("Credenciales inválidas.")
+
+        if necesita_rehash(user.password_hash):
+            user.password_hash = generar_hash(password)
+            db.session.commit()  # Guarda el hash con el costo nuevo.
+        return user
+
+    @staticmethod
+    def get_user_by_username(username):
+        """
+        Obtener un usuario por su nombre de usuario, con su rol ya cargado.
+
+        Args:
+            username (str): Nombre de usuario.
+
+        Returns:
+            User | None: El usuario, o None si no existe.
+        """
+        return db.session.execute(
+            select(User).options(joinedload(User.role)).where(User.username == username)
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def get_claims(user):
+        """
+        Obtener los claims adicionales que se guardan en el token JWT del usuario.
+
+        Args:
+            user (User): Usuario con su rol.
+
+        Returns:
+            dict: Claims del token; "rol" es el nombre del rol del usuario.
+        """
+        return {'rol': user.role.name}
+
+    @staticmethod
+    def get_estado_usuario(username):
+        """
+        Obtener si el usuario sigue activo y su rol actual, servido desde la caché si es posible.
+
+        `role_required` lo usa para detectar tokens revocados (usuario desactivado o con otro rol)
+        con una consulta por usuario cada AUTH_REVOCACION_TTL segundos, en lugar de una por petición.
+
+        Args:
+            username (str): Nombre de usuario.
+
+        Returns:
+            dict | None: Diccionario con "activo" y "rol", o None si el usuario no existe.
+        """
+        def leer_estado():
+            fila = db.session.execute(
+                select(User.activo, Role.name).join(Role, Role.id_rol == User.id_rol).where(User.username == username)
+            ).first()
+            return {'activo': fila.activo, 'rol': fila.name} if fila else None
+
+        cache = obtener_cache('usuarios')
+        return leer_estado() if cache is None else cache.obtener(f'usuario:{username}', leer_estado)
+
+    @staticmethod
+    def update_user(username, rol=None, activo=None):
+        """
+        Cambiar el rol de un usuario o activarlo y desactivarlo.
+
+        Los tokens ya emitidos con el rol anterior (o de un usuario desactivado) dejan de aceptarse
+        en este proceso al confirmar el cambio, y en los demás cuando vence su caché.
+
+        Args:
+            username (str): Nombre de usuario.
+            rol (str | None): Nombre del nuevo rol; None para no cambiarlo.
+            activo (bool | None): Nuevo estado; None para no cambiarlo.
+
+        Returns:
+            User: El usuario actualizado.
+
+        Raises:
+            ValueError: Si el usuario o el rol no existen.
+        """
+        user = UserService.get_user_by_username(username)
+        if user is None:  # Si no se encuentra el usuario, lanza un error.
+            raise ValueError('Usuario no encontrado')
+        if rol is not None:
+            role = db.session.execute(select(Role).where(Role.name == rol)).scalar_one_or_none()
+            if role is None:
+                raise ValueError("El rol especificado no existe.")
+            user.role = role
+        if activo is not None:
+            user.activo = activo
+        _invalidar_usuario(username)
+        db.session.commit()  # Confirma los cambios en la base de datos.
+        return user
@@ -0,0 +1,237 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from werkzeug.utils import import_string
+from app import db
+
+# Valor centinela para distinguir "no está en la caché" de un valor guardado como None.
+AUSENTE = object()
+
+
+class BackendCache(ABC):
+    """
+    Interfaz de los backends de caché.
+
+    El backend por defecto es `CacheLRU` (en memoria, por proceso). Para compartir la caché
+    entre procesos se puede indicar en CACHE_BACKEND la ruta de otra subclase que implemente
+    estos métodos (por ejemplo una que use Redis); los valores guardados son siempre
+    diccionarios y listas serializables en JSON.
+
+    Atributos:
+        lock (threading.Lock): Lock del proceso que protege los datos del backend; `Cache` también
+            lo usa para sus contadores de aciertos y fallos.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, clave):
+        """Devolver el valor guardado o `AUSENTE` si no existe o expiró."""
+
+    @abstractmethod
+    def set(self, clave, valor):
+        """Guardar un valor con el TTL configurado en el backend."""
+
+    @abstractmethod
+    def delete(self, clave):
+        """Eliminar una clave si existe."""
+
+    @abstractmethod
+    def incr(self, clave):
+        """Incrementar un contador entero (creándolo en 1) y devolver el nuevo valor."""
+
+
+class CacheLRU(BackendCache):
+    """
+    Caché en memoria con política LRU y tiempo de vida (TTL) por entrada.
+
+    Args:
+        maxsize (int): Cantidad máxima de entradas; al superarla se descarta la usada hace más tiempo.
+        ttl (float): Segundos de vida de cada entrada; 0 para que no expiren.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._datos = OrderedDict()  # clave -> (vencimiento, valor)
+        self._contadores = {}  # Los contadores no expiran ni cuentan para el LRU.
+
+    def get(self, clave):
+        with self.lock:
+            if clave in self._contadores:
+                return self._contadores[clave]
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return AUSENTE
+            vencimiento, valor = entrada
+            if vencimiento and vencimiento < time.monotonic():
+                del self._datos[clave]
+                return AUSENTE
+            self._datos.move_to_end(clave)  # Marca la entrada como usada recientemente.
+            return valor
+
+    def set(self, clave, valor):
+        vencimiento = time.monotonic() + self.ttl if self.ttl else 0
+        with self.lock:
+            self._datos[clave] = (vencimiento, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)  # Descarta la entrada usada hace más tiempo.
+
+    def delete(self, clave):
+        with self.lock:
+            self._datos.pop(clave, None)
+
+    def incr(self, clave):
+        with self.lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + 1
+            return self._contadores[clave]
+
+
+class Cache:
+    """
+    Caché de lectura (read-through) con contadores de aciertos y fallos.
+
+    Args:
+        backend (BackendCache): Backend donde se guardan los valores.
+        prefijo (str): Prefijo de todas las claves, para separar cachés que comparten backend.
+    """
+
+    def __init__(self, backend, prefijo):
+        self.backend = backend
+        self.prefijo = prefijo
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _clave(self, clave):
+        return f'{self.prefijo}:{clave}'
+
+    def version(self):
+        """Obtener la versión actual de la caché; cambia con cada invalidación."""
+        version = self.backend.get(self._clave('version'))
+        return 0 if version is AUSENTE else version
+
+    def obtener(self, clave, calcular):
+        """
+        Devolver el valor de la caché o calcularlo y guardarlo si no está.
+
+        El valor calculado solo se guarda si no hubo una invalidación mientras se calculaba,
+        para no dejar en la caché datos leídos antes de un cambio ya confirmado.
+
+        Args:
+            clave (str): Clave del valor.
+            calcular (Callable): Función sin argumentos que obtiene el valor de la base de datos.
+
+        Returns:
+            El valor guardado o recién calculado.
+        """
+        valor = self.backend.get(self._clave(clave))
+        # `+=` no es atómico entre hilos: los contadores se actualizan con el lock del backend.
+        if valor is not AUSENTE:
+            with self.backend.lock:
+                self.aciertos += 1
+            return valor
+        with self.backend.lock:
+            self.fallos += 1
+        version = self.version()
+        valor = calcular()
+        if self.version() == version:
+            self.backend.set(self._clave(clave), valor)
+        return valor
+
+    def invalidar(self, *claves):
+        """
+        Eliminar las claves indicadas y cambiar la versión de la caché.
+
+        Args:
+            claves (str): Claves a eliminar.
+        """
+        for clave in claves:
+            self.backend.delete(self._clave(clave))
+        self.backend.incr(self._clave('version'))
+
+
+def marcar_para_invalidar(nombre, *claves):
+    """
+    Anotar en la sesión las claves de caché que deben invalidarse cuando se confirme la transacción.
+
+    La invalidación se hace recién después del commit: si la transacción se revierte,
+    las anotaciones se descartan y la caché sigue siendo válida.
+
+    Args:
+        nombre (str): Nombre de la caché (por ejemplo "productos").
+        claves (str): Claves a eliminar de esa caché.
+    """
+    pendientes = db.session.info.setdefault('cache_invalidar', {})
+    pendientes.setdefault(nombre, set()).update(claves)
+
+
+def _invalidar_despues_del_commit(session):
+    """Aplicar las invalidaciones anotadas en la sesión una vez confirmada la transacción."""
+    pendientes = session.info.pop('cache_invalidar', None)
+    if not pendientes or not has_app_context():
+        return
+    for nombre, claves in pendientes.items():
+        cache = obtener_cache(nombre)
+        if cache is not None:
+            cache.invalidar(*claves)
+
+
+def _descartar_despues_del_rollback(session):
+    """Descartar las invalidaciones anotadas si la transacción se revierte."""
+    session.info.pop('cache_invalidar', None)
+
+
+def crear_backend(app, ttl=None):
+    """
+    Crear el backend de caché configurado en CACHE_BACKEND.
+
+    Args:
+        app (Flask): Aplicación con la configuración.
+        ttl (float | None): Segundos de vida de las entradas; None para usar CACHE_TTL.
+
+    Returns:
+        BackendCache: `CacheLRU` si CACHE_BACKEND es "memoria"; si no, una instancia de la clase indicada por su ruta.
+    """
+    backend = app.config['CACHE_BACKEND']
+    clase = CacheLRU if backend == 'memoria' else import_string(backend)
+    return clase(maxsize=app.config['CACHE_MAXSIZE'], ttl=app.config['CACHE_TTL'] if ttl is None else ttl)
+
+
+def obtener_cache(nombre):
+    """
+    Obtener una caché registrada en la aplicación actual.
+
+    Args:
+        nombre (str): Nombre con el que se registró la caché (por ejemplo "productos").
+
+    Returns:
+        Cache | None: La caché, o None si la caché está desactivada.
+    """
+    return current_app.extensions['caches'].get(nombre)
+
+
+def init_cache(app):
+    """
+    Crear las cachés de la aplicación y registrar la invalidación después de cada commit.
+
+    Con CACHE_BACKEND vacío la caché queda desactivada y los servicios leen siempre de la base de datos.
+
+    Args:
+        app (Flask): Aplicación en la que se registran las cachés.
+    """
+    app.extensions['caches'] = {}
+    if app.config['CACHE_BACKEND']:
+        app.extensions['caches']['productos'] = Cache(crear_backend(app), 'productos')
+        # Estado de los usuarios para `role_required`: su TTL es la demora máxima para revocar un token.
+        app.extensions['caches']['usuarios'] = Cache(crear_backend(app, app.config['AUTH_REVOCACION_TTL']), 'usuarios')
+
+    # Los eventos se registran una sola vez aunque se creen varias aplicaciones.
+    if not event.contains(db.session, 'after_commit', _invalidar_despues_del_commit):
+        event.listen(db.session, 'after_commit', _invalidar_despues_del_commit)
+        event.listen(db.session, 'after_rollback', _descartar_despues_del_rollback)
@@ -0,0 +1,51 @@
+import re
+from flask import request
+
+# ETag de un registro versionado: la versión, con el sufijo que agrega la compresión si la respuesta se comprimió.
+ETAG_VERSION = re.compile(r'(\d+)(?:-(?:gzip|br|deflate))?')
+
+
+class ConflictoVersionError(Exception):
+    """El registro cambió desde la versión que leyó el cliente (control de concurrencia optimista)."""
+
+
+def versiones_de_if_match():
+    """
+    Leer las versiones aceptadas por el cliente en el encabezado If-Match.
+
+    El ETag de un registro versionado es su número de versión entre comillas (por ejemplo `"3"`),
+    con "-gzip", "-br" o "-deflate" si la respuesta se comprimió. Cualquier otro ETag (por ejemplo
+    el de un listado, que identifica la versión de toda la tabla) no es una versión del registro.
+
+    Returns:
+        set | None: Versiones aceptadas, o None si el cliente no envió If-Match o envió "*".
+
+    Raises:
+        ConflictoVersionError: Si If-Match contiene un ETag que no es una versión del registro, o ninguno fuerte.
+    """
+    if 'If-Match' not in request.headers or request.if_match.star_tag:
+        return None
+    coincidencias = [ETAG_VERSION.fullmatch(etag) for etag in request.if_match.as_set()]
+    if not coincidencias or not all(coincidencias):
+        raise ConflictoVersionError("El encabezado If-Match no corresponde a ninguna versión del registro.")
+    return {int(coincidencia.group(1)) for coincidencia in coincidencias}
+
+
+def verificar_version(actual, esperadas):
+    """
+    Verificar que la versión actual del registro sea una de las que espera el cliente.
+
+    Args:
+        actual (int): Versión actual del registro.
+        esperadas (set | None): Versiones aceptadas (de `versiones_de_if_match`); None para no verificar.
+
+    Raises:
+        ConflictoVersionError: Si la versión actual no es ninguna de las esperadas.
+    """
+    if esperadas is not None and actual not in esperadas:
+        raise ConflictoVersionError("El registro fue modificado por otra petición; vuelva a leerlo e intente de nuevo.")
+
+
+def encabezado_etag(version):
+    """Encabezado ETag de un registro versionado."""
+    return {'ETag': f'"{version}"'}
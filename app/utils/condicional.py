@@ -0,0 +1,91 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import Response, request
+from app.utils.concurrencia import encabezado_etag
+from app.utils.serializacion import respuesta_json
+from app.utils.versiones import obtener_versiones
+
+
+def _calcular_etag(versiones):
+    """Generar un ETag fuerte a partir de las versiones de las tablas y de la URL pedida (ruta y parámetros)."""
+    parametros = '&'.join(f'{clave}={valor}' for clave, valor in sorted(request.args.items(multi=True)))
+    huella = hashlib.sha1(f'{request.path}?{parametros}'.encode()).hexdigest()[:16]
+    version = '.'.join(str(versiones[tabla][0]) for tabla in sorted(versiones))
+    return f'{version}-{huella}'
+
+
+def _sin_cambios(etag, ultima_modificacion):
+    """Indicar si la copia del cliente sigue vigente según If-None-Match o, si no lo envía, If-Modified-Since."""
+    # Si el cliente envía If-None-Match, If-Modified-Since se ignora aunque el ETag no se pueda interpretar.
+    if 'If-None-Match' in request.headers:
+        # La compresión agrega "-gzip", "-br" o "-deflate" al ETag; cualquier variante de la misma versión es válida.
+        return any(request.if_none_match.contains(variante) for variante in
+                   (etag, f'{etag}-gzip', f'{etag}-br', f'{etag}-deflate'))
+    if request.if_modified_since and ultima_modificacion:
+        # Las fechas HTTP tienen precisión de segundos: otro cambio en el mismo segundo que la fecha del cliente
+        # no se distinguiría, por eso la copia solo es vigente si la modificación es anterior a ese segundo.
+        return ultima_modificacion.replace(microsecond=0) < request.if_modified_since
+    return False
+
+
+def condicional(*tablas):
+    """
+    Decorador de GET que agrega ETag y Last-Modified y responde 304 si el cliente ya tiene la versión actual.
+
+    El ETag se calcula con la versión de las tablas indicadas (una sola consulta a `versiones_tabla`),
+    de modo que un 304 se responde sin leer los registros. Cualquier cambio en esas tablas cambia el ETag.
+
+    Args:
+        tablas (str): Tablas de las que depende la respuesta del endpoint.
+
+    Returns:
+        Función decoradora para métodos de `Resource`.
+    """
+    def decorator(func):
+        @wraps(func)  # Mantiene el nombre y la docstring original de la función decorada
+        def wrapper(*args, **kwargs):
+            versiones = obtener_versiones(*tablas)
+            etag = _calcular_etag(versiones)
+            fechas = [actualizado for _, actualizado in versiones.values() if actualizado]
+            ultima_modificacion = max(fechas).replace(tzinfo=timezone.utc) if fechas else None
+
+            encabezados = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}  # no-cache: el cliente debe revalidar.
+            if ultima_modificacion:
+                encabezados['Last-Modified'] = ultima_modificacion.strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+            if _sin_cambios(etag, ultima_modificacion):
+                return Response(status=304, headers=encabezados)
+
+            respuesta = func(*args, **kwargs)
+            if isinstance(respuesta, Response):
+                if respuesta.status_code == 200:
+                    respuesta.headers.extend(encabezados)
+                return respuesta
+            # Los recursos devuelven (datos, código) o (datos, código, encabezados).
+            datos, codigo, *resto = respuesta if isinstance(respuesta, tuple) else (respuesta, 200)
+            if codigo != 200:
+                return respuesta
+            return datos, codigo, {**(resto[0] if resto else {}), **encabezados}
+        return wrapper
+    return decorator
+
+
+def respuesta_versionada(datos, version):
+    """
+    Responder un registro versionado con su propio ETag (`"<version>"`), o 304 si el cliente ya tiene esa versión.
+
+    Es el mismo ETag que esperan los PUT con If-Match, a diferencia del de `condicional`, que
+    identifica la versión de toda la tabla y cambia cuando se modifica cualquier otro registro.
+
+    Args:
+        datos (dict): Registro a devolver.
+        version (int): Versión actual del registro.
+
+    Returns:
+        Response: 200 con el registro o 304 sin cuerpo, ambos con ETag y Cache-Control.
+    """
+    encabezados = {**encabezado_etag(version), 'Cache-Control': 'no-cache'}  # no-cache: el cliente debe revalidar.
+    if _sin_cambios(str(version), None):
+        return Response(status=304, headers=encabezados)
+    return respuesta_json(datos, headers=encabezados)
@@ -0,0 +1,108 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app import bcrypt
+
+# Pool de hilos compartido por el proceso para calcular los hash bcrypt; se crea en el primer uso.
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Hash de una contraseña aleatoria por cada costo, para verificar contra él cuando el usuario no existe.
+_hashes_ficticios = {}
+
+
+def _obtener_executor():
+    """Obtener el pool de hilos de hashing del proceso actual, creándolo la primera vez (o después de un fork)."""
+    global _executor, _executor_pid
+    # Los hilos no sobreviven a un fork: un worker creado a partir del proceso padre necesita su propio pool.
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config['AUTH_HASH_HILOS'], thread_name_prefix='bcrypt'
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def _en_pool(funcion, *args):
+    """Ejecutar una función de bcrypt en el pool y esperar su resultado."""
+    return _obtener_executor().submit(funcion, *args).result()
+
+
+def costo_actual(password_hash):
+    """
+    Obtener el factor de costo (log rounds) con el que se generó un hash bcrypt.
+
+    Args:
+        password_hash (str): Hash con el formato "$2b$<costo>$...".
+
+    Returns:
+        int | None: El costo, o None si el hash no tiene el formato esperado.
+    """
+    partes = password_hash.split('$')
+    return int(partes[2]) if len(partes) > 3 and partes[2].isdigit() else None
+
+
+def generar_hash(password):
+    """
+    Calcular el hash bcrypt de una contraseña con el costo BCRYPT_LOG_ROUNDS.
+
+    El cálculo se hace en el pool de AUTH_HASH_HILOS hilos: bcrypt libera el GIL mientras calcula,
+    y el pool limita cuántos hash se calculan a la vez para que un pico de inicios de sesión no
+    deje sin CPU al resto de las peticiones.
+
+    Args:
+        password (str): Contraseña en texto plano.
+
+    Returns:
+        str: Hash bcrypt.
+    """
+    rondas = current_app.config['BCRYPT_LOG_ROUNDS']
+    return _en_pool(bcrypt.generate_password_hash, password, rondas).decode('utf-8')
+
+
+def verificar(password_hash, password):
+    """
+    Verificar una contraseña contra su hash bcrypt, en el pool de hilos de hashing.
+
+    Args:
+        password_hash (str): Hash guardado.
+        password (str): Contraseña recibida.
+
+    Returns:
+        bool: True si la contraseña es correcta.
+    """
+    return _en_pool(bcrypt.check_password_hash, password_hash, password)
+
+
+def hash_ficticio():
+    """
+    Obtener un hash bcrypt de una contraseña aleatoria, con el costo BCRYPT_LOG_ROUNDS.
+
+    Verificar una contraseña contra este hash cuesta lo mismo que contra el de un usuario real,
+    de modo que un inicio de sesión con un usuario inexistente no responde antes que uno con la
+    contraseña incorrecta. Se calcula una vez por proceso y por costo.
+
+    Returns:
+        str: Hash bcrypt que ninguna contraseña verifica en la práctica.
+    """
+    rondas = current_app.config['BCRYPT_LOG_ROUNDS']
+    if rondas not in _hashes_ficticios:
+        _hashes_ficticios[rondas] = generar_hash(os.urandom(16).hex())
+    return _hashes_ficticios[rondas]
+
+
+def necesita_rehash(password_hash):
+    """
+    Indicar si un hash se generó con un costo distinto del configurado en BCRYPT_LOG_ROUNDS.
+
+    Args:
+        password_hash (str): Hash guardado.
+
+    Returns:
+        bool: True si conviene volver a calcular el hash en el próximo inicio de sesión.
+    """
+    return costo_actual(password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
@@ -0,0 +1,119 @@
+from sqlalchemy import delete, select, update
+from app import db
+from app.utils.concurrencia import ConflictoVersionError
+
+# Las sentencias se ejecutan sin sincronizar la sesión: los servicios no cargan el objeto antes de modificarlo.
+SIN_SINCRONIZAR = {'synchronize_session': False}
+
+
+def _soporta_returning(sentencia):
+    """Indicar si el motor admite RETURNING en UPDATE o DELETE ("update" o "delete"); MySQL no lo admite."""
+    return getattr(db.session.get_bind().dialect, f'{sentencia}_returning', False)
+
+
+def _clave_primaria(modelo):
+    """Columna de la clave primaria del modelo (todos los modelos tienen una sola)."""
+    return getattr(modelo, modelo.__mapper__.primary_key[0].key)
+
+
+def _columna_version(modelo):
+    """Columna de versión del modelo (`version_id_col`), o None si el modelo no tiene control de concurrencia."""
+    columna = modelo.__mapper__.version_id_col
+    return getattr(modelo, columna.key) if columna is not None else None
+
+
+def valores_actualizables(modelo, datos):
+    """
+    Quedarse con los datos que corresponden a columnas modificables del modelo.
+
+    Se descartan las claves que no son columnas, la clave primaria y la versión (que administra la aplicación).
+
+    Args:
+        modelo: Modelo del ORM.
+        datos (dict): Datos recibidos en la petición.
+
+    Returns:
+        dict: Diccionario {columna: valor} para el UPDATE.
+    """
+    excluidas = {_clave_primaria(modelo).key}
+    if _columna_version(modelo) is not None:
+        excluidas.add(_columna_version(modelo).key)
+    columnas = {atributo.key for atributo in modelo.__mapper__.column_attrs} - excluidas
+    return {clave: valor for clave, valor in datos.items() if clave in columnas}
+
+
+def actualizar(modelo, id_registro, valores, columnas, versiones=None):
+    """
+    Actualizar un registro con un único UPDATE por clave primaria, sin cargarlo antes.
+
+    Si el modelo tiene columna de versión, el UPDATE la incrementa y, si se indican versiones,
+    solo afecta al registro si su versión actual es una de ellas. Las columnas pedidas se leen
+    con RETURNING en la misma sentencia; si el motor no lo admite se leen con un SELECT por
+    clave primaria (solo cuando el UPDATE afectó al registro).
+
+    Args:
+        modelo: Modelo del ORM.
+        id_registro (int): Clave primaria del registro.
+        valores (dict): Columnas a modificar (ver `valores_actualizables`).
+        columnas (tuple): Columnas del registro actualizado que se devuelven.
+        versiones (set | None): Versiones aceptadas (If-Match); None para no verificarla.
+
+    Returns:
+        Row | None: Las columnas pedidas del registro actualizado, o None si el registro no existe.
+
+    Raises:
+        ConflictoVersionError: Si el registro existe pero su versión no es ninguna de las indicadas.
+    """
+    clave = _clave_primaria(modelo)
+    version = _columna_version(modelo)
+    if not valores and version is None:
+        # Un UPDATE sin columnas no es válido: basta con leer el registro.
+        return db.session.execute(select(*columnas).where(clave == id_registro)).first()
+
+    consulta = update(modelo).where(clave == id_registro).values(valores)
+    if version is not None:
+        consulta = consulta.values({version.key: version + 1})
+        if versiones is not None:
+            consulta = consulta.where(version.in_(versiones))
+
+    if _soporta_returning('update'):
+        fila = db.session.execute(consulta.returning(*columnas), execution_options=SIN_SINCRONIZAR).first()
+    elif db.session.execute(consulta, execution_options=SIN_SINCRONIZAR).rowcount == 1:
+        fila = db.session.execute(select(*columnas).where(clave == id_registro)).first()
+    else:
+        fila = None
+
+    # Si no se actualizó nada, una consulta más (solo en este caso) distingue "no existe" de "cambió de versión".
+    if fila is None and versiones is not None and db.session.execute(select(clave).where(clave == id_registro)).first():
+        db.session.rollback()
+        raise ConflictoVersionError("El registro fue modificado por otra petición; vuelva a leerlo e intente de nuevo.")
+    return fila
+
+
+def eliminar(modelo, id_registro, columnas=()):
+    """
+    Eliminar un registro con un único DELETE por clave primaria, sin cargarlo antes.
+
+    Las columnas pedidas (por ejemplo el stock de un producto) se leen con RETURNING; si el motor
+    no lo admite se leen antes con SELECT ... FOR UPDATE, para que nadie las cambie hasta el DELETE.
+    Las filas que dependen del registro las protege la clave foránea de la base de datos.
+
+    Args:
+        modelo: Modelo del ORM.
+        id_registro (int): Clave primaria del registro.
+        columnas (tuple): Columnas del registro eliminado que se devuelven.
+
+    Returns:
+        Row | bool | None: Las columnas pedidas (o True si no se pidió ninguna), o None si el registro no existe.
+    """
+    clave = _clave_primaria(modelo)
+    consulta = delete(modelo).where(clave == id_registro)
+    if not columnas:
+        return True if db.session.execute(consulta, execution_options=SIN_SINCRONIZAR).rowcount == 1 else None
+    if _soporta_returning('delete'):
+        return db.session.execute(consulta.returning(*columnas), execution_options=SIN_SINCRONIZAR).first()
+
+    fila = db.session.execute(select(*columnas).where(clave == id_registro).with_for_update()).first()
+    if fila is not None:
+        db.session.execute(consulta, execution_options=SIN_SINCRONIZAR)
+    return fila
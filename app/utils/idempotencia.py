@@ -0,0 +1,228 @@
+import hashlib
+import hmac
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import Response, current_app, request
+from werkzeug.datastructures import Headers
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.claveIdempotencia import ClaveIdempotencia
+from app.utils.serializacion import codificar
+
+# Longitud máxima del encabezado Idempotency-Key (la de la columna `clave`).
+LONGITUD_MAXIMA_CLAVE = 100
+
+# Encabezados de la respuesta original que se guardan con la clave y se repiten en los reintentos.
+ENCABEZADOS_REPETIDOS = ('ETag', 'Last-Modified', 'Location', 'Content-Location', 'Retry-After')
+
+
+def _ahora():
+    """Fecha y hora actual en UTC, sin zona horaria (como se guarda en la base de datos)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _huella():
+    """
+    HMAC-SHA-256 del método, la ruta con sus parámetros y el cuerpo de la petición.
+
+    Se firma con SECRET_KEY porque el cuerpo puede traer contraseñas (`/auth/register`):
+    un SHA-256 sin clave permitiría probar contraseñas contra la huella guardada.
+    """
+    datos = f'{request.method} {request.full_path}\n'.encode() + request.get_data()
+    return hmac.new(current_app.config['SECRET_KEY'].encode(), datos, hashlib.sha256).hexdigest()
+
+
+def _inicio_reserva():
+    """Momento de una reserva nueva, en segundos enteros para que se compare igual en todos los motores."""
+    return _ahora().replace(microsecond=0)
+
+
+def _reservar(clave, huella):
+    """
+    Registrar la clave como "en_proceso" en su propia transacción.
+
+    Returns:
+        datetime | None: El momento de la reserva, que identifica a esta petición como su dueña; None si la clave ya existía.
+    """
+    reservada = _inicio_reserva()
+    expira = reservada + timedelta(seconds=current_app.config['IDEMPOTENCIA_TTL'])
+    try:
+        db.session.execute(insert(ClaveIdempotencia).values(
+            clave=clave, huella=huella, estado='en_proceso', reservada=reservada, expira=expira
+        ))
+        db.session.commit()  # Se confirma enseguida para que los reintentos concurrentes la vean.
+        return reservada
+    except IntegrityError:
+        db.session.rollback()
+        return None
+
+
+def _tomar_reserva_vencida(clave, fila):
+    """
+    Tomar una clave "en_proceso" cuya reserva venció: la petición original se da por muerta.
+
+    El UPDATE se condiciona a la reserva leída, de modo que entre varios reintentos solo uno la toma.
+
+    Returns:
+        datetime | None: El momento de la nueva reserva; None si la reserva sigue vigente o la tomó otra petición.
+    """
+    limite = _ahora() - timedelta(seconds=current_app.config['IDEMPOTENCIA_RESERVA'])
+    if fila.reservada is not None and fila.reservada > limite:
+        return None
+    reservada = _inicio_reserva()
+    anterior = ClaveIdempotencia.reservada.is_(None) if fila.reservada is None else ClaveIdempotencia.reservada == fila.reservada
+    tomada = db.session.execute(update(ClaveIdempotencia).where(
+        ClaveIdempotencia.clave == clave, ClaveIdempotencia.estado == 'en_proceso', anterior
+    ).values(reservada=reservada)).rowcount == 1
+    db.session.commit()
+    return reservada if tomada else None
+
+
+def _leer(clave):
+    """Leer la fila de una clave en una transacción nueva (para ver lo que confirmaron otras peticiones)."""
+    db.session.rollback()
+    return db.session.execute(
+        select(ClaveIdempotencia.huella, ClaveIdempotencia.estado, ClaveIdempotencia.codigo, ClaveIdempotencia.cuerpo,
+               ClaveIdempotencia.encabezados, ClaveIdempotencia.expira, ClaveIdempotencia.reservada).where(ClaveIdempotencia.clave == clave)
+    ).first()
+
+
+def _de_la_reserva(clave, reservada):
+    """Condición de la fila de `clave` mientras siga reservada por la petición que la reservó en `reservada`."""
+    return (ClaveIdempotencia.clave == clave, ClaveIdempotencia.estado == 'en_proceso',
+            ClaveIdempotencia.reservada == reservada)
+
+
+def _liberar(clave, reservada):
+    """Eliminar la reserva de una petición que falló, para que un reintento pueda ejecutarla."""
+    db.session.rollback()
+    # Si la reserva venció y la tomó otra petición, la fila ya no es de esta y no se toca.
+    db.session.execute(delete(ClaveIdempotencia).where(*_de_la_reserva(clave, reservada)))
+    db.session.commit()
+
+
+def _encabezados_a_guardar(encabezados):
+    """Los encabezados de ENCABEZADOS_REPETIDOS presentes en la respuesta, o None si no hay ninguno."""
+    guardados = {nombre: encabezados[nombre] for nombre in ENCABEZADOS_REPETIDOS if nombre in encabezados}
+    return guardados or None
+
+
+def _repetir(fila):
+    """Devolver la respuesta guardada de la petición original, con sus encabezados."""
+    encabezados = {**(fila.encabezados or {}), 'Idempotent-Replayed': 'true'}
+    return Response(fila.cuerpo, status=fila.codigo, mimetype='application/json', headers=encabezados)
+
+
+def idempotente(func):
+    """
+    Decorador de POST que respeta el encabezado Idempotency-Key.
+
+    - La primera petición con una clave la reserva, ejecuta el servicio y guarda la respuesta.
+    - Un reintento con la misma clave y la misma petición recibe la respuesta guardada, con los
+      encabezados de ENCABEZADOS_REPETIDOS, sin ejecutar el servicio otra vez.
+    - Un reintento que llega mientras la original se ejecuta espera hasta IDEMPOTENCIA_ESPERA
+      segundos su resultado, en lugar de ejecutarse en paralelo; si no termina, recibe 409.
+    - Si la reserva de la original tiene más de IDEMPOTENCIA_RESERVA segundos (por ejemplo,
+      porque el proceso murió antes de guardar la respuesta), el reintento la toma y ejecuta el
+      servicio. La original, si seguía viva, ya no puede guardar ni liberar la clave.
+    - La misma clave con otra petición (otra ruta o cuerpo) recibe 422.
+
+    Las respuestas con error 5xx no se guardan, para que el cliente pueda reintentar. Sin el
+    encabezado, el endpoint funciona igual que antes.
+
+    Args:
+        func (Callable): Método `post` de un `Resource`.
+
+    Returns:
+        Callable: El método decorado.
+    """
+    @wraps(func)  # Mantiene el nombre y la docstring original de la función decorada
+    def wrapper(*args, **kwargs):
+        clave = request.headers.get('Idempotency-Key')
+        if not clave:
+            return func(*args, **kwargs)
+        if len(clave) > LONGITUD_MAXIMA_CLAVE:
+            return {'message': f'El encabezado Idempotency-Key no puede superar {LONGITUD_MAXIMA_CLAVE} caracteres.'}, 400
+
+        huella = _huella()
+        limite_espera = time.monotonic() + current_app.config['IDEMPOTENCIA_ESPERA']
+        pausa = 0.05
+        while True:
+            reservada = _reservar(clave, huella)
+            if reservada is not None:
+                break
+            fila = _leer(clave)
+            if fila is None:
+                continue  # La reserva se liberó entre el INSERT y la lectura: se vuelve a intentar.
+            if fila.expira <= _ahora():
+                # Clave vencida: se elimina y se trata la petición como nueva.
+                db.session.execute(delete(ClaveIdempotencia).where(
+                    ClaveIdempotencia.clave == clave, ClaveIdempotencia.expira <= _ahora()
+                ))
+                db.session.commit()
+                continue
+            if fila.huella != huella:
+                return {'message': 'La Idempotency-Key ya se usó con otra petición.'}, 422
+            if fila.estado == 'completado':
+                return _repetir(fila)
+            reservada = _tomar_reserva_vencida(clave, fila)
+            if reservada is not None:
+                break  # La petición original murió sin responder: esta la reemplaza.
+            if time.monotonic() >= limite_espera:
+                return {'message': 'La petición original con esta Idempotency-Key todavía se está procesando.'}, 409, {'Retry-After': '1'}
+            time.sleep(pausa)  # La petición original sigue en proceso: se espera su resultado.
+            pausa = min(pausa * 2, 0.5)
+
+        try:
+            respuesta = func(*args, **kwargs)
+        except Exception:
+            _liberar(clave, reservada)
+            raise
+
+        if isinstance(respuesta, Response):
+            codigo, cuerpo, encabezados = respuesta.status_code, respuesta.get_data(), respuesta.headers
+        else:
+            # Los recursos devuelven (datos, código) o (datos, código, encabezados).
+            datos, codigo, *resto = respuesta if isinstance(respuesta, tuple) else (respuesta, 200)
+            cuerpo, encabezados = None, Headers(resto[0] if resto else None)
+        if codigo >= 500:
+            _liberar(clave, reservada)
+            return respuesta
+
+        if cuerpo is None:
+            cuerpo = codificar(datos)
+        db.session.rollback()  # Descarta lo que haya quedado pendiente en la sesión tras el commit del servicio.
+        guardada = db.session.execute(update(ClaveIdempotencia).where(*_de_la_reserva(clave, reservada)).values(
+            estado='completado', codigo=codigo, cuerpo=cuerpo, encabezados=_encabezados_a_guardar(encabezados)
+        )).rowcount == 1
+        db.session.commit()
+        if not guardada:
+            current_app.logger.warning('La reserva de la Idempotency-Key %s venció antes de guardar la respuesta.', clave)
+        if isinstance(respuesta, Response):
+            return respuesta
+        return Response(cuerpo, status=codigo, headers=encabezados, mimetype='application/json')
+    return wrapper
+
+
+def purgar_vencidas(tamano_lote=1000):
+    """
+    Eliminar las claves vencidas en lotes, cada uno en su propia transacción.
+
+    Args:
+        tamano_lote (int): Cantidad máxima de filas eliminadas por transacción.
+
+    Returns:
+        int: Cantidad total de claves eliminadas.
+    """
+    total = 0
+    while True:
+        claves = db.session.execute(
+            select(ClaveIdempotencia.clave).where(ClaveIdempotencia.expira <= _ahora()).limit(tamano_lote)
+        ).scalars().all()
+        if not claves:
+            return total
+        db.session.execute(delete(ClaveIdempotencia).where(ClaveIdempotencia.clave.in_(claves)))
+        db.session.commit()
+        total += len(claves)
@@ -0,0 +1,107 @@
+from flask import current_app
+from flask_restx import inputs, reqparse
+from sqlalchemy import insert, select, text
+from app import db
+from app.utils.versiones import marcar_tabla_modificada
+
+# Valores como máximo en cada INSERT de varias filas (SQLite admite 32766 y MySQL 65535).
+MAXIMO_PARAMETROS_POR_SENTENCIA = 30000
+
+# Parser compartido por los endpoints de creación en lote.
+lote_parser = reqparse.RequestParser()
+lote_parser.add_argument(
+    'partial', type=inputs.boolean, location='args', required=False, default=False,
+    help='Si es verdadero, crea las líneas válidas y reporta los errores de las demás en lugar de cancelar todo el lote'
+)
+
+
+def validar_tamano_lote(lineas):
+    """
+    Verificar que un lote recibido no esté vacío ni supere el máximo configurado.
+
+    Args:
+        lineas (list): Líneas recibidas en la petición.
+
+    Raises:
+        ValueError: Si el lote está vacío o supera LOTE_MAXIMO_LINEAS.
+    """
+    if not lineas:
+        raise ValueError("Debe enviar al menos una línea.")
+    maximo = current_app.config['LOTE_MAXIMO_LINEAS']
+    if len(lineas) > maximo:
+        raise ValueError(f"No se pueden enviar más de {maximo} líneas por petición.")
+
+
+def ids_existentes(columna_id, ids):
+    """
+    Obtener cuáles de los IDs indicados existen, con una sola consulta `IN (...)`.
+
+    Args:
+        columna_id (Column): Columna de la clave primaria del modelo a consultar.
+        ids (Iterable[int]): IDs a verificar.
+
+    Returns:
+        set: Conjunto con los IDs que existen en la tabla.
+    """
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.session.execute(select(columna_id).where(columna_id.in_(ids))).scalars())
+
+
+def _ids_generados(dialecto, resultado, cantidad):
+    """
+    Calcular los IDs autoincrementales que generó un INSERT de varias filas a partir de `lastrowid`.
+
+    En MySQL `lastrowid` es LAST_INSERT_ID(): el ID de la primera fila insertada. InnoDB asigna
+    IDs consecutivos a todas las filas de un INSERT ... VALUES con una cantidad de filas conocida
+    (modos 0, 1 y 2 de innodb_autoinc_lock_mode), por lo que el resto se obtiene sumando el
+    incremento. En SQLite `lastrowid` es el ID de la última fila, y las filas de una misma
+    sentencia reciben rowids consecutivos porque la base de datos está bloqueada para escritura.
+    """
+    if dialecto.name == 'sqlite':
+        primero = resultado.lastrowid - cantidad + 1
+        return list(range(primero, resultado.lastrowid + 1))
+    # auto_increment_increment es una variable de sesión de MySQL: se lee una sola vez por conexión.
+    info = db.session.connection().info
+    if 'auto_increment_increment' not in info:
+        info['auto_increment_increment'] = db.session.execute(text('SELECT @@auto_increment_increment')).scalar()
+    incremento = info['auto_increment_increment']
+    return [resultado.lastrowid + indice * incremento for indice in range(cantidad)]
+
+
+def insertar_en_lote(modelo, columna_id, filas):
+    """
+    Insertar varias filas con un solo INSERT ... VALUES (...), (...) por lote y devolver sus IDs en el mismo orden.
+
+    Cada sentencia lleva hasta MAXIMO_PARAMETROS_POR_SENTENCIA valores, de modo que un lote de
+    LOTE_MAXIMO_LINEAS líneas de pocas columnas se inserta con una sola sentencia. En MySQL y SQLite
+    los IDs se calculan a partir de `lastrowid` (ver `_ids_generados`); en los demás motores se
+    leen con RETURNING en la misma sentencia. No se hace commit: lo decide el servicio que llama.
+
+    Args:
+        modelo (db.Model): Modelo en el que se insertan las filas.
+        columna_id (Column): Columna de la clave primaria autoincremental del modelo.
+        filas (list[dict]): Valores de cada fila, con los nombres de las columnas como claves
+            (todas las filas con las mismas columnas).
+
+    Returns:
+        list[int]: IDs generados, en el mismo orden que `filas`.
+    """
+    if not filas:
+        return []
+
+    dialecto = db.session.get_bind().dialect
+    por_sentencia = max(1, MAXIMO_PARAMETROS_POR_SENTENCIA // len(filas[0]))
+    tabla = modelo.__table__  # Sentencias de Core: el resultado expone `lastrowid`.
+    ids = []
+    for inicio in range(0, len(filas), por_sentencia):
+        lote = filas[inicio:inicio + por_sentencia]
+        consulta = insert(tabla).values(lote)
+        if dialecto.name in ('mysql', 'sqlite'):
+            ids.extend(_ids_generados(dialecto, db.session.execute(consulta), len(lote)))
+        else:
+            # RETURNING devuelve las filas en el orden de VALUES al insertar con una sola sentencia.
+            ids.extend(db.session.execute(consulta.returning(tabla.c[columna_id.key])).scalars())
+    marcar_tabla_modificada(modelo.__tablename__)  # El INSERT directo no pasa por el flush del ORM.
+    return ids
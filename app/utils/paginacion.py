@@ -0,0 +1,128 @@
+from flask import current_app
+from flask_restx import reqparse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.sql import Select
+from app import db
+
+# Parser compartido por todos los endpoints de listado.
+# Define los parámetros de la paginación por cursor (keyset) y los documenta en Swagger.
+paginacion_parser = reqparse.RequestParser()
+paginacion_parser.add_argument(
+    'after', type=int, location='args', required=False,
+    help='Cursor: devuelve los registros cuyo ID es mayor que este valor (usar el next_cursor de la respuesta anterior)'
+)
+paginacion_parser.add_argument(
+    'limit', type=int, location='args', required=False,
+    help='Cantidad máxima de registros a devolver'
+)
+
+
+def normalizar_limite(limit):
+    """
+    Ajustar el límite solicitado a los valores permitidos por la configuración.
+
+    Args:
+        limit (int | None): Límite solicitado por el cliente.
+
+    Returns:
+        int: Límite entre 1 y PAGINACION_LIMITE_MAXIMO.
+    """
+    # Si no se indica un límite, se usa el valor por defecto de la configuración.
+    if limit is None:
+        return current_app.config['PAGINACION_LIMITE_POR_DEFECTO']
+    # Evita páginas vacías o demasiado grandes.
+    return max(1, min(limit, current_app.config['PAGINACION_LIMITE_MAXIMO']))
+
+
+def interpretar_orden(sort, columnas_ordenables):
+    """
+    Traducir el parámetro `sort` a una columna de la lista blanca y una dirección.
+
+    Args:
+        sort (str | None): Nombre de la columna, con un "-" inicial para orden descendente (por ejemplo "-fecha_inicio").
+        columnas_ordenables (dict): Diccionario {nombre: Column} con las columnas permitidas.
+
+    Returns:
+        tuple: (Column o None, bool descendente).
+
+    Raises:
+        ValueError: Si la columna no está en la lista blanca.
+    """
+    if not sort:
+        return None, False
+    descendente = sort.startswith('-')
+    nombre = sort.lstrip('-')
+    if nombre not in columnas_ordenables:
+        raise ValueError("No se puede ordenar por '%s'. Columnas permitidas: %s." % (nombre, ', '.join(sorted(columnas_ordenables))))
+    return columnas_ordenables[nombre], descendente
+
+
+def _condicion_cursor(columna, columna_id, valor, after, descendente):
+    """
+    Construir la condición "posterior al cursor" para un orden (columna, clave primaria).
+
+    Sigue el orden de NULL de MySQL y SQLite: primero en orden ascendente y último en descendente.
+    """
+    if descendente:
+        if valor is None:
+            return and_(columna.is_(None), columna_id < after)
+        return or_(columna < valor, and_(columna == valor, columna_id < after), columna.is_(None))
+    if valor is None:
+        return or_(and_(columna.is_(None), columna_id > after), columna.is_not(None))
+    return or_(columna > valor, and_(columna == valor, columna_id > after))
+
+
+def paginar(consulta, columna_id, after=None, limit=None, orden=None, descendente=False):
+    """
+    Paginar una consulta por cursor usando la clave primaria autoincremental.
+
+    En lugar de OFFSET, filtra por `columna_id > after` y ordena por la clave primaria,
+    de modo que cada página cuesta lo mismo sin importar qué tan avanzada esté.
+    Si se ordena por otra columna, el orden es (columna, clave primaria) y el valor de la
+    columna en el registro del cursor se obtiene con una búsqueda por clave primaria.
+    La consulta puede ser un `Query` del ORM o un `select()` de columnas sueltas; en ese
+    caso se devuelven filas livianas (`Row`) en lugar de objetos del modelo.
+
+    Args:
+        consulta (Query | Select): Consulta base sobre el modelo (por ejemplo `Producto.query` o `select(Producto.id_producto, ...)`).
+        columna_id (Column): Columna de la clave primaria del modelo.
+        after (int | None): Último ID recibido por el cliente; None para la primera página.
+        limit (int | None): Cantidad máxima de registros de la página.
+        orden (Column | None): Columna por la que se ordena; None para ordenar por la clave primaria.
+        descendente (bool): Si es True, el orden es descendente.
+
+    Returns:
+        tuple: (lista de registros de la página, next_cursor o None si no hay más registros).
+
+    Raises:
+        ValueError: Si el registro del cursor ya no existe al ordenar por otra columna.
+    """
+    limite = normalizar_limite(limit)
+    if orden is columna_id:
+        orden = None
+
+    # Solo se leen los registros posteriores al cursor.
+    if after is not None:
+        if orden is None:
+            consulta = consulta.where(columna_id < after if descendente else columna_id > after)
+        else:
+            # Busca el valor de la columna de orden en el registro del cursor.
+            fila = db.session.execute(select(orden).where(columna_id == after)).first()
+            if fila is None:
+                raise ValueError("El cursor indicado no es válido.")
+            consulta = consulta.where(_condicion_cursor(orden, columna_id, fila[0], after, descendente))
+
+    # La clave primaria desempata los registros con el mismo valor en la columna de orden.
+    columnas = [columna_id] if orden is None else [orden, columna_id]
+    consulta = consulta.order_by(*[c.desc() if descendente else c for c in columnas])
+
+    # Se pide un registro extra para saber si existe una página siguiente sin hacer un COUNT.
+    consulta = consulta.limit(limite + 1)
+    registros = db.session.execute(consulta).all() if isinstance(consulta, Select) else consulta.all()
+
+    next_cursor = None
+    if len(registros) > limite:
+        registros = registros[:limite]
+        next_cursor = getattr(registros[-1], columna_id.key)  # El ID del último registro es el siguiente cursor.
+
+    return registros, next_cursor
@@ -0,0 +1,131 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from flask import Response
+from sqlalchemy.engine import Row
+
+try:  # orjson es opcional: si no está instalado se usa el módulo json de la biblioteca estándar.
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+def _convertir(valor):
+    """Convertir los tipos que el codificador no conoce: Decimal a número y fechas a ISO 8601."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    raise TypeError(f'Tipo no serializable: {type(valor).__name__}')
+
+
+def _codificar_orjson(datos):
+    # orjson ya serializa date y datetime; solo Decimal pasa por _convertir.
+    return orjson.dumps(datos, default=_convertir)
+
+
+def _codificar_json(datos):
+    return json.dumps(datos, default=_convertir, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# Codificadores disponibles; 'auto' elige orjson si está instalado.
+CODIFICADORES = {'json': _codificar_json}
+if orjson is not None:
+    CODIFICADORES['orjson'] = _codificar_orjson
+CODIFICADORES['auto'] = CODIFICADORES.get('orjson', _codificar_json)
+
+# Codificador en uso; se puede reemplazar con `usar_codificador`.
+_codificador = CODIFICADORES['auto']
+
+
+def usar_codificador(nombre):
+    """
+    Elegir el codificador JSON ("auto", "orjson" o "json").
+
+    Args:
+        nombre (str): Nombre del codificador.
+
+    Raises:
+        ValueError: Si el codificador no existe o no está instalado.
+    """
+    global _codificador
+    if nombre not in CODIFICADORES:
+        raise ValueError(f"Codificador JSON no disponible: {nombre}")
+    _codificador = CODIFICADORES[nombre]
+
+
+def codificar(datos):
+    """
+    Convertir datos a JSON en bytes, admitiendo Decimal y fechas.
+
+    Args:
+        datos: Diccionarios, listas y valores simples (incluidos Decimal, date y datetime).
+
+    Returns:
+        bytes: JSON codificado en UTF-8.
+    """
+    return _codificador(datos)
+
+
+def _lector_de_filas(campos, ejemplo=None):
+    """
+    Crear una función que lee de una fila los valores de `campos`, en orden, como una tupla.
+
+    Con filas de `session.execute(select(...))` (`Row`) se toman los valores por posición
+    con `itemgetter`, que arma la tupla en C; leer cada columna de un `Row` como atributo es
+    mucho más lento. Con objetos del ORM se lee cada columna como atributo.
+
+    Args:
+        campos (dict): Diccionario {clave en la respuesta: nombre de la columna}.
+        ejemplo: Una de las filas que se van a leer (todas deben ser del mismo tipo); None si no hay filas.
+
+    Returns:
+        Callable: Función fila -> tuple.
+    """
+    columnas = tuple(campos.values())
+    if isinstance(ejemplo, Row):
+        leer = itemgetter(*map(ejemplo._fields.index, columnas))
+    else:
+        leer = attrgetter(*columnas)
+    # Con un solo nombre itemgetter y attrgetter devuelven el valor, no una tupla.
+    return leer if len(columnas) > 1 else lambda fila: (leer(fila),)
+
+
+def a_diccionarios(filas, campos):
+    """
+    Convertir filas en diccionarios con las claves de la respuesta.
+
+    Sirve tanto para filas de `session.execute(select(...))` como para objetos del ORM
+    (ver `_lector_de_filas`). Los valores se copian tal cual (sin `float()` ni
+    `strftime()`): el codificador se encarga de Decimal y fechas.
+
+    Args:
+        filas (Iterable): Filas u objetos a convertir.
+        campos (dict): Diccionario {clave en la respuesta: nombre de la columna}.
+
+    Returns:
+        list[dict]: Un diccionario por fila.
+    """
+    filas = list(filas)
+    claves = tuple(campos)
+    leer = _lector_de_filas(campos, filas[0] if filas else None)
+    return [dict(zip(claves, leer(fila))) for fila in filas]
+
+
+def respuesta_json(datos, status=200, headers=None):
+    """
+    Crear una respuesta JSON codificada con el codificador rápido.
+
+    Los recursos de Flask-RESTX pueden devolverla directamente: al ser un `Response`
+    no se vuelve a codificar con el módulo json.
+
+    Args:
+        datos: Contenido de la respuesta.
+        status (int): Código de estado HTTP.
+        headers (dict | None): Encabezados adicionales.
+
+    Returns:
+        Response: Respuesta de Flask con el JSON ya codificado.
+    """
+    return Response(codificar(datos), status=status, headers=headers, mimetype='application/json')
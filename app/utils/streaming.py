@@ -0,0 +1,73 @@
+from flask import Response, request, stream_with_context
+from flask_restx import inputs
+from app.utils.paginacion import paginacion_parser
+from app.utils.serializacion import a_diccionarios, codificar
+
+# Tipo MIME de JSON delimitado por saltos de línea: un objeto JSON por línea.
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Cantidad de líneas que se agrupan antes de enviarlas al cliente, para no escribir fila por fila.
+LINEAS_POR_BLOQUE = 500
+
+# Parser de los listados que además admiten exportación en streaming.
+# Extiende los parámetros de paginación con `stream` para documentarlo en Swagger.
+exportacion_parser = paginacion_parser.copy()
+exportacion_parser.add_argument(
+    'stream', type=inputs.boolean, location='args', required=False,
+    help='Si es verdadero, devuelve todos los registros como NDJSON en streaming (ignora la paginación)'
+)
+
+
+def solicita_stream(stream=None):
+    """
+    Indicar si el cliente pidió la exportación en streaming.
+
+    Se activa con `?stream=1` o con el encabezado `Accept: application/x-ndjson`.
+
+    Args:
+        stream (bool | None): Valor del parámetro `stream` ya leído por `exportacion_parser`.
+
+    Returns:
+        bool: True si la respuesta debe enviarse como NDJSON en streaming.
+    """
+    # El parámetro de la URL tiene prioridad sobre el encabezado Accept.
+    if stream is not None:
+        return stream
+    # Solo se usa NDJSON si el cliente lo prefiere explícitamente sobre JSON.
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _codificar_bloque(filas, campos):
+    """Codificar un bloque de filas como líneas NDJSON en bytes."""
+    return b'\n'.join(codificar(d) for d in a_diccionarios(filas, campos)) + b'\n'
+
+
+def respuesta_ndjson(filas, campos):
+    """
+    Crear una respuesta que escribe las filas como NDJSON a medida que se leen de la base de datos.
+
+    La memoria usada no depende del tamaño de la tabla: solo se mantiene en memoria
+    el bloque de líneas que se está enviando.
+
+    Args:
+        filas (Iterable): Filas a exportar, normalmente un resultado leído con `yield_per`.
+        campos (dict): Diccionario {clave en la respuesta: nombre de la columna}, como en `a_diccionarios`.
+
+    Returns:
+        Response: Respuesta de Flask con el contenido generado de forma incremental.
+    """
+    def generar():
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            # Envía el bloque acumulado cuando alcanza el tamaño configurado.
+            if len(bloque) >= LINEAS_POR_BLOQUE:
+                yield _codificar_bloque(bloque, campos)
+                bloque = []
+        # Envía las líneas restantes.
+        if bloque:
+            yield _codificar_bloque(bloque, campos)
+
+    # stream_with_context mantiene el contexto de la petición (y la sesión de la base de datos)
+    # abierto mientras el generador sigue leyendo filas.
+    return Response(stream_with_context(generar()), mimetype=NDJSON_MIMETYPE)
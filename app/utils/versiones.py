@@ -0,0 +1,84 @@
+import itertools
+from datetime import datetime, timezone
+from sqlalchemy import event, insert, select, update
+from app import db
+from app.models.versionTabla import VersionTabla
+
+
+def marcar_tabla_modificada(*tablas):
+    """
+    Anotar tablas modificadas con sentencias que no pasan por el flush del ORM (UPDATE/INSERT directos).
+
+    Las modificaciones hechas con objetos del ORM se detectan solas en cada flush.
+
+    Args:
+        tablas (str): Nombres de las tablas modificadas.
+    """
+    db.session.info.setdefault('tablas_modificadas', set()).update(tablas)
+
+
+def _anotar_tablas_del_flush(session, flush_context):
+    """Anotar las tablas de los objetos insertados, modificados o eliminados en el flush."""
+    tablas = session.info.setdefault('tablas_modificadas', set())
+    for objeto in itertools.chain(session.new, session.deleted):
+        tablas.add(objeto.__table__.name)
+    for objeto in session.dirty:
+        if session.is_modified(objeto, include_collections=False):
+            tablas.add(objeto.__table__.name)
+    tablas.discard(VersionTabla.__tablename__)
+
+
+def _incrementar_versiones(session):
+    """Incrementar, antes del commit y en la misma transacción, la versión de cada tabla modificada."""
+    session.flush()  # Los cambios pendientes también cuentan.
+    tablas = session.info.pop('tablas_modificadas', None)
+    if not tablas:
+        return
+    ahora = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    # Se recorren en orden para que dos transacciones bloqueen las filas siempre en el mismo orden.
+    for tabla in sorted(tablas):
+        resultado = session.execute(
+            update(VersionTabla).where(VersionTabla.tabla == tabla).values(
+                version=VersionTabla.version + 1, actualizado=ahora
+            ),
+            execution_options={'synchronize_session': False},
+        )
+        if resultado.rowcount == 0:
+            # Primera modificación de una tabla sin fila de versión.
+            session.execute(insert(VersionTabla).values(tabla=tabla, version=1, actualizado=ahora))
+
+
+def _descartar_tablas(session):
+    """Descartar las tablas anotadas si la transacción se revierte."""
+    session.info.pop('tablas_modificadas', None)
+
+
+def obtener_versiones(*tablas):
+    """
+    Leer la versión y la fecha de última modificación de varias tablas con una sola consulta.
+
+    Args:
+        tablas (str): Nombres de las tablas.
+
+    Returns:
+        dict: Diccionario {tabla: (version, actualizado)}; las tablas sin fila tienen versión 0 y fecha None.
+    """
+    filas = db.session.execute(
+        select(VersionTabla.tabla, VersionTabla.version, VersionTabla.actualizado).where(VersionTabla.tabla.in_(tablas))
+    )
+    versiones = {tabla: (0, None) for tabla in tablas}
+    versiones.update({fila.tabla: (fila.version, fila.actualizado) for fila in filas})
+    return versiones
+
+
+def init_versiones(app):
+    """
+    Registrar los eventos de sesión que mantienen actualizada la tabla `versiones_tabla`.
+
+    Args:
+        app (Flask): Aplicación (los eventos se registran una sola vez sobre la sesión compartida).
+    """
+    if not event.contains(db.session, 'before_commit', _incrementar_versiones):
+        event.listen(db.session, 'after_flush', _anotar_tablas_del_flush)
+        event.listen(db.session, 'before_commit', _incrementar_versiones)
+        event.listen(db.session, 'after_rollback', _descartar_tablas)
@@ -0,0 +1,155 @@
+"""
+Prueba de carga del pool de conexiones y del límite de tiempo de las consultas.
+
+Levanta la aplicación con las opciones de pool indicadas y lanza peticiones concurrentes a un
+endpoint de la API (`--ruta`). Cada conexión entregada por el pool se retiene `--retencion`
+segundos antes de usarse, como si la petición ejecutara una consulta lenta. Informa cuántas
+peticiones se atendieron, cuántas recibieron 503 con Retry-After por pool agotado, el máximo
+de conexiones usadas a la vez y los percentiles de latencia.
+
+Con una URI de MySQL (`--db`) además verifica que `max_execution_time` de ProductionConfig
+interrumpe un SELECT que supera DB_STATEMENT_TIMEOUT_MS; con SQLite esa verificación se omite.
+
+Uso:
+    python -m benchmarks.carga_pool --hilos 20 --peticiones 200 --pool-size 4 --max-overflow 2 --pool-timeout 1
+
+Resultados medidos (SQLite en archivo, 20 hilos, 200 peticiones a GET /Clientes/):
+    pool_size=4,  max_overflow=2,  pool_timeout=1, retención 0.1 s -> 166 x 200, 34 x 503 (todos con Retry-After);
+        máx. 6 conexiones en uso; p50 0.11 s, p99 1.17 s
+    pool_size=4,  max_overflow=2,  pool_timeout=1, retención 0.6 s -> 89 x 200, 111 x 503; máx. 6 conexiones;
+        p50 1.00 s, p99 1.24 s (la espera por una conexión nunca supera pool_timeout más la retención)
+    pool_size=10, max_overflow=10, pool_timeout=5, retención 0.1 s -> 200 x 200; máx. 20 conexiones; p50 0.13 s, p99 0.23 s
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from sqlalchemy import event, text
+from app import config as configuracion, create_app, db
+
+
+def _crear_app(uri, pool_size, max_overflow, pool_timeout):
+    """Crear la aplicación con las opciones de pool indicadas y el esquema creado."""
+    base = configuracion.ProductionConfig if uri.startswith('mysql') else configuracion.Config
+
+    class ConfigCarga(base):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_ECHO = False
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            **base.SQLALCHEMY_ENGINE_OPTIONS,
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+        }
+
+    configuracion.config_por_entorno['carga'] = ConfigCarga
+    app = create_app('carga')
+    # Bajo carga las peticiones superan el umbral de "petición lenta" y cada 503 se registra con su traza.
+    app.logger.setLevel(logging.CRITICAL)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _medir_pool(app, retencion):
+    """Retener cada conexión entregada por el pool y registrar el máximo de conexiones en uso a la vez."""
+    estado = {'en_uso': 0, 'maximo': 0}
+    lock = threading.Lock()
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'checkout')
+    def entregada(*args):
+        with lock:
+            estado['en_uso'] += 1
+            estado['maximo'] = max(estado['maximo'], estado['en_uso'])
+        time.sleep(retencion)  # La conexión queda ocupada como durante una consulta lenta.
+
+    @event.listens_for(engine, 'checkin')
+    def devuelta(*args):
+        with lock:
+            estado['en_uso'] -= 1
+
+    return estado
+
+
+def _lanzar(app, ruta, hilos, peticiones):
+    """Repartir las peticiones entre los hilos y devolver (código, duración, Retry-After) de cada una."""
+    resultados = []
+    lock = threading.Lock()
+    pendientes = iter(range(peticiones))
+
+    def trabajador():
+        cliente = app.test_client()
+        while True:
+            with lock:
+                if next(pendientes, None) is None:
+                    return
+            inicio = time.perf_counter()
+            respuesta = cliente.get(ruta)
+            with lock:
+                resultados.append((respuesta.status_code, time.perf_counter() - inicio, respuesta.headers.get('Retry-After')))
+
+    trabajadores = [threading.Thread(target=trabajador) for _ in range(hilos)]
+    for trabajador_ in trabajadores:
+        trabajador_.start()
+    for trabajador_ in trabajadores:
+        trabajador_.join()
+    return resultados
+
+
+def _verificar_max_execution_time(app):
+    """Ejecutar un SELECT más largo que DB_STATEMENT_TIMEOUT_MS y devolver (segundos, resultado)."""
+    limite = app.config['DB_STATEMENT_TIMEOUT_MS'] / 1000
+    with app.app_context():
+        inicio = time.perf_counter()
+        try:
+            # MySQL interrumpe SLEEP al superar max_execution_time y devuelve 1 en lugar de 0.
+            resultado = db.session.execute(text('SELECT SLEEP(:s)'), {'s': limite + 2}).scalar()
+        except Exception as e:  # El servidor también puede cancelar la sentencia con un error.
+            resultado = f'error: {e}'
+        return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--db', default=None, help='URI de la base de datos; por defecto un archivo SQLite temporal')
+    parser.add_argument('--hilos', type=int, default=20)
+    parser.add_argument('--peticiones', type=int, default=200)
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--max-overflow', type=int, default=2)
+    parser.add_argument('--pool-timeout', type=int, default=1, help='Segundos enteros (ver Config.SQLALCHEMY_ENGINE_OPTIONS)')
+    parser.add_argument('--ruta', default='/Clientes/', help='Endpoint de la API al que se envían las peticiones')
+    parser.add_argument('--retencion', type=float, default=0.1, help='Segundos que cada petición retiene su conexión')
+    args = parser.parse_args()
+
+    uri = args.db or f'sqlite:///{os.path.join(tempfile.mkdtemp(), "carga.db")}'
+    app = _crear_app(uri, args.pool_size, args.max_overflow, args.pool_timeout)
+    pool = _medir_pool(app, args.retencion)
+
+    resultados = _lanzar(app, args.ruta, args.hilos, args.peticiones)
+    codigos = {}
+    for codigo, _, _ in resultados:
+        codigos[codigo] = codigos.get(codigo, 0) + 1
+    duraciones = sorted(duracion for _, duracion, _ in resultados)
+    percentiles = statistics.quantiles(duraciones, n=100)
+    sin_retry_after = sum(1 for codigo, _, retry in resultados if codigo == 503 and retry is None)
+
+    print(f'GET {args.ruta}: pool_size={args.pool_size}, max_overflow={args.max_overflow}, pool_timeout={args.pool_timeout}')
+    print(f'  peticiones: {len(resultados)} ' + ', '.join(f'{n} x {codigo}' for codigo, n in sorted(codigos.items())))
+    print(f'  503 sin Retry-After: {sin_retry_after}')
+    print(f'  máximo de conexiones en uso: {pool["maximo"]} (límite {args.pool_size + args.max_overflow})')
+    print(f'  latencia p50 {percentiles[49]:.2f} s, p99 {percentiles[98]:.2f} s, máx. {duraciones[-1]:.2f} s')
+
+    if uri.startswith('mysql'):
+        segundos, resultado = _verificar_max_execution_time(app)
+        print(f'  max_execution_time={app.config["DB_STATEMENT_TIMEOUT_MS"]} ms: SELECT SLEEP cortado a los {segundos:.2f} s ({resultado})')
+    else:
+        print('  max_execution_time: se verifica solo con MySQL (--db mysql://...)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Bytes enviados y costo de CPU de la compresión de respuestas según su tamaño.
+
+Genera listados JSON de productos de distintos tamaños con `codificar` (el mismo formato que
+envían los endpoints de listado) y los comprime con `_Compresor`, igual que
+`init_compresion`, con cada codificación disponible. Para cada tamaño informa los bytes
+sin comprimir y comprimidos y el tiempo de CPU por respuesta. También compara un listado
+enviado de una vez con el mismo listado en streaming NDJSON, comprimido bloque por bloque
+(LINEAS_POR_BLOQUE líneas) con Z_SYNC_FLUSH.
+
+Uso:
+    python -m benchmarks.compresion --nivel 6 --repeticiones 50
+
+Resultados medidos (nivel 6, zlib de la biblioteca estándar; brotli no estaba instalado):
+     filas  sin comprimir  gzip (bytes / CPU)     deflate (bytes / CPU)
+         3        298 B     149 B / 0.02 ms        137 B / 0.02 ms
+        10        994 B     239 B / 0.03 ms        227 B / 0.02 ms
+       100        9.9 KB    1.3 KB / 0.11 ms       1.3 KB / 0.11 ms
+      1000      102.2 KB    9.6 KB / 1.18 ms       9.6 KB / 1.07 ms
+     10000        1.0 MB   91.8 KB / 12.6 ms      91.8 KB / 11.5 ms
+    Streaming NDJSON de 10000 filas en 20 bloques (gzip): 90.8 KB, 12.7 ms; el Z_SYNC_FLUSH de cada
+        bloque no cuesta más que comprimir el mismo NDJSON de una vez.
+    Nivel 1: 10000 filas -> 116.1 KB / 4.2 ms; nivel 9: 88.7 KB / 45.9 ms. El nivel 6 ahorra un 21 % de
+        bytes frente al nivel 1 por 3 veces su CPU; el nivel 9 ahorra un 3 % más por casi 4 veces la del 6.
+    Debajo de 1 KB se ahorran menos de 800 bytes por 0.02 ms: de ahí COMPRESION_UMBRAL_BYTES = 1024.
+"""
+import argparse
+import time
+from decimal import Decimal
+from app.middlewares.compresion_middleware import CODIFICACIONES, _Compresor
+from app.utils.serializacion import codificar
+from app.utils.streaming import LINEAS_POR_BLOQUE
+
+TAMANIOS = (3, 10, 100, 1000, 10000)
+
+
+def _productos(cantidad):
+    """Generar filas con las mismas claves que el listado de productos."""
+    return [
+        {'id_producto': i, 'nombre': f'Producto {i}', 'costo': Decimal(f'{10 + i % 90}.50'),
+         'precio_venta': Decimal(f'{15 + i % 90}.75'), 'cantidad': i % 500, 'version': 1 + i % 3}
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def _medir(funcion, repeticiones):
+    """Ejecutar `funcion` varias veces y devolver (resultado, segundos de CPU por ejecución)."""
+    inicio = time.process_time()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return resultado, (time.process_time() - inicio) / repeticiones
+
+
+def _comprimir(datos, codificacion, nivel):
+    compresor = _Compresor(codificacion, nivel)
+    return compresor.parcial(datos) + compresor.final()
+
+
+def _comprimir_bloques(bloques, codificacion, nivel):
+    compresor = _Compresor(codificacion, nivel)
+    return b''.join(compresor.parcial(bloque) for bloque in bloques) + compresor.final()
+
+
+def _tamanio(cantidad):
+    return f'{cantidad / 1024 / 1024:.1f} MB' if cantidad >= 1024 * 1024 else \
+        f'{cantidad / 1024:.1f} KB' if cantidad >= 1024 else f'{cantidad} B'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nivel', type=int, default=6, help='Nivel de compresión (COMPRESION_NIVEL)')
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'nivel {args.nivel}; codificaciones: {", ".join(CODIFICACIONES)}')
+    for filas in TAMANIOS:
+        datos = codificar(_productos(filas))
+        columnas = []
+        for codificacion in CODIFICACIONES:
+            comprimido, segundos = _medir(lambda: _comprimir(datos, codificacion, args.nivel), args.repeticiones)
+            columnas.append(f'{codificacion} {_tamanio(len(comprimido))} / {segundos * 1000:.2f} ms')
+        print(f'{filas:>6} filas, {_tamanio(len(datos)):>9}: ' + '; '.join(columnas))
+
+    # Streaming: las mismas filas como NDJSON, comprimidas en bloques como en `respuesta_ndjson`.
+    productos = _productos(TAMANIOS[-1])
+    bloques = [
+        b'\n'.join(codificar(p) for p in productos[i:i + LINEAS_POR_BLOQUE]) + b'\n'
+        for i in range(0, len(productos), LINEAS_POR_BLOQUE)
+    ]
+    codificacion = CODIFICACIONES[0]
+    entero, _ = _medir(lambda: _comprimir(b''.join(bloques), codificacion, args.nivel), args.repeticiones)
+    por_bloques, segundos = _medir(lambda: _comprimir_bloques(bloques, codificacion, args.nivel), args.repeticiones)
+    print(f'streaming NDJSON de {len(productos)} filas en {len(bloques)} bloques ({codificacion}): '
+          f'{_tamanio(len(por_bloques))} ({len(por_bloques) / len(entero) - 1:+.1%} frente a una sola vez), '
+          f'{segundos * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
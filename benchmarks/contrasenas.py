@@ -0,0 +1,156 @@
+"""
+Costo de bcrypt por factor de costo, rendimiento del pool de hashing y tiempo de un login fallido.
+
+Mide tres cosas sobre un archivo SQLite temporal:
+
+    1. El tiempo de un hash y de una verificación bcrypt para cada costo de `--costos`.
+    2. Cuántos inicios de sesión por segundo atiende `UserService.autenticar` con `--concurrencia`
+       hilos pidiendo a la vez, para cada tamaño del pool de hashing (AUTH_HASH_HILOS) de `--hilos`,
+       con sus percentiles de latencia.
+    3. La mediana del tiempo de un login con un usuario inexistente frente a uno con la contraseña
+       incorrecta: con el hash ficticio (`hash_ficticio`) ambos deben costar lo mismo.
+
+Uso:
+    python -m benchmarks.contrasenas --costos 10 11 12 13 --hilos 1 2 4 8 --concurrencia 16
+
+Resultados medidos (1 CPU, bcrypt de Flask-Bcrypt):
+    costo 10 -> hash 89 ms, verificación 86 ms
+    costo 11 -> hash 174 ms, verificación 175 ms
+    costo 12 -> hash 356 ms, verificación 365 ms
+    costo 13 -> hash 713 ms, verificación 712 ms
+    costo 12, 64 logins con 16 clientes a la vez:
+        AUTH_HASH_HILOS=1 -> 2.9 logins/s, p50 5.52 s, p99 5.61 s
+        AUTH_HASH_HILOS=4 -> 2.9 logins/s, p50 5.50 s, p99 5.65 s
+        Con una sola CPU el pool no agrega capacidad: el rendimiento lo fija el costo (1 / 0.35 s).
+        Con N CPU escala hasta AUTH_HASH_HILOS = N, y el pool evita que los logins ocupen más.
+    costo 12, mediana de 20 intentos: usuario inexistente 347 ms, contraseña incorrecta 340 ms
+        (sin el hash ficticio, el usuario inexistente respondía en 0.5 ms).
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from app import bcrypt, config as configuracion, create_app, db
+from app.models.role import Role
+from app.services.user_service import UserService
+from app.utils import contrasenas
+
+USUARIO = 'benchmark'
+PASSWORD = 'contraseña-de-prueba'
+
+
+def _crear_app(uri, costo, hilos):
+    class ConfigContrasenas(configuracion.Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_ECHO = False
+        BCRYPT_LOG_ROUNDS = costo
+        AUTH_HASH_HILOS = hilos
+
+    configuracion.config_por_entorno['contrasenas'] = ConfigContrasenas
+    app = create_app('contrasenas')
+    app.logger.setLevel(logging.CRITICAL)
+    contrasenas._executor = None  # Cada configuración usa un pool nuevo con su cantidad de hilos.
+    return app
+
+
+def _preparar(app):
+    """Crear el esquema, el rol por defecto y el usuario del benchmark."""
+    with app.app_context():
+        db.create_all()
+        db.session.add(Role(app.config['AUTH_ROL_POR_DEFECTO']))
+        db.session.commit()
+        UserService.create_user(USUARIO, PASSWORD)
+
+
+def _login(username, password):
+    try:
+        UserService.autenticar(username, password)
+    except ValueError:
+        pass
+
+
+def _medir_costos(costos):
+    for costo in costos:
+        inicio = time.perf_counter()
+        password_hash = bcrypt.generate_password_hash(PASSWORD, costo)
+        generado = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        bcrypt.check_password_hash(password_hash, PASSWORD)
+        print(f'costo {costo}: hash {generado * 1000:.0f} ms, verificación {(time.perf_counter() - inicio) * 1000:.0f} ms')
+
+
+def _medir_pool(uri, costo, hilos, concurrencia, logins):
+    """Lanzar `logins` inicios de sesión correctos desde `concurrencia` hilos y devolver (logins/s, duraciones)."""
+    app = _crear_app(uri, costo, hilos)
+    duraciones = []
+    lock = threading.Lock()
+    pendientes = iter(range(logins))
+
+    def cliente():
+        with app.app_context():
+            while True:
+                with lock:
+                    if next(pendientes, None) is None:
+                        return
+                inicio = time.perf_counter()
+                _login(USUARIO, PASSWORD)
+                with lock:
+                    duraciones.append(time.perf_counter() - inicio)
+                db.session.remove()
+
+    clientes = [threading.Thread(target=cliente) for _ in range(concurrencia)]
+    inicio = time.perf_counter()
+    for hilo in clientes:
+        hilo.start()
+    for hilo in clientes:
+        hilo.join()
+    return logins / (time.perf_counter() - inicio), sorted(duraciones)
+
+
+def _medir_login_fallido(uri, costo, intentos):
+    """Devolver la mediana de un login con usuario inexistente y con contraseña incorrecta."""
+    app = _crear_app(uri, costo, 1)
+    medianas = {}
+    with app.app_context():
+        _login('no-existe', PASSWORD)  # El hash ficticio se calcula en el primer intento.
+        for nombre, username, password in (('usuario inexistente', 'no-existe', PASSWORD),
+                                           ('contraseña incorrecta', USUARIO, 'otra-contraseña')):
+            tiempos = []
+            for _ in range(intentos):
+                inicio = time.perf_counter()
+                _login(username, password)
+                tiempos.append(time.perf_counter() - inicio)
+            medianas[nombre] = statistics.median(tiempos)
+    return medianas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--costos', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--costo', type=int, default=12, help='Costo del usuario para las mediciones del pool y del login fallido')
+    parser.add_argument('--hilos', type=int, nargs='+', default=[1, 2, 4, 8], help='Tamaños de AUTH_HASH_HILOS a medir')
+    parser.add_argument('--concurrencia', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--intentos', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} CPU')
+    _medir_costos(args.costos)
+
+    uri = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "contrasenas.db")}'
+    _preparar(_crear_app(uri, args.costo, 1))
+    for hilos in args.hilos:
+        por_segundo, duraciones = _medir_pool(uri, args.costo, hilos, args.concurrencia, args.logins)
+        percentiles = statistics.quantiles(duraciones, n=100)
+        print(f'costo {args.costo}, AUTH_HASH_HILOS={hilos}, {args.concurrencia} clientes: {por_segundo:.1f} logins/s, '
+              f'p50 {percentiles[49]:.2f} s, p99 {percentiles[98]:.2f} s')
+
+    for nombre, mediana in _medir_login_fallido(uri, args.costo, args.intentos).items():
+        print(f'costo {args.costo}, {nombre}: mediana {mediana * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Escrituras por segundo y sentencias SQL de las actualizaciones y eliminaciones por clave primaria.
+
+Crea `--operaciones` registros por camino en un archivo SQLite temporal y los modifica o
+elimina uno por uno, cada operación en su propia transacción, por tres caminos:
+
+    antes: `db.session.get` del registro, setattr o `session.delete` y commit (los servicios
+        antes de `escritura`, reproducidos aquí);
+    servicio: el método actual del servicio, un solo UPDATE ... RETURNING o DELETE;
+    sin RETURNING: el mismo método con `_soporta_returning` forzado a False, como en MySQL
+        (UPDATE y luego SELECT por clave primaria; DELETE ... RETURNING pasa a SELECT ... FOR UPDATE).
+
+Para cada caso informa las escrituras por segundo y las sentencias enviadas a la base de
+datos por operación (contadas con el evento before_cursor_execute).
+
+Uso:
+    python -m benchmarks.escrituras --operaciones 2000
+
+Resultados medidos (SQLite en archivo, 2000 operaciones por caso, 1 CPU; rango de tres corridas):
+    caso                antes: escrituras/s (SQL)   servicio            sin RETURNING
+    update_cliente      300-400/s (3)               345-470/s (2)       355-395/s (3)
+    update_producto     285-335/s (3)               360-380/s (2)       340-370/s (3)
+    delete_cliente      300-310/s (4)               450-560/s (2)       445-590/s (2)
+    delete_producto     215-295/s (6)               370-510/s (3)       345-405/s (4)
+    delete_orden_venta  290-310/s (5)               380-460/s (3)       355-450/s (3)
+    Los dos caminos cuentan el UPDATE de la versión de la tabla (`marcar_tabla_modificada`) y, en
+    productos y órdenes, el libro de stock o la lectura del resumen de ventas.
+    Los UPDATE ganan un 10-20 % (un SELECT menos por operación, el commit en disco domina el resto);
+    sin RETURNING el SELECT vuelve después del UPDATE y la ganancia se pierde en el ruido. Los DELETE
+    ganan un 40-75 %: además del SELECT del registro, `session.delete` cargaba las relaciones en
+    cascada (órdenes del cliente, detalles del producto o de la orden) antes de borrar.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import date
+from sqlalchemy import event, insert
+from app import config as configuracion, create_app, db
+from app.models.cliente import Cliente
+from app.models.ordenVenta import OrdenVenta
+from app.models.producto import Producto
+from app.services.cliente_service import ClienteService
+from app.services.orden_venta_service import OrdenVentaService
+from app.services.producto_service import ProductoService
+from app.services.resumen_ventas_service import ResumenVentasService
+from app.services.stock_service import StockService
+from app.utils import escritura
+from app.utils.cache import marcar_para_invalidar
+
+
+def _actualizar_antes(modelo, id_registro, valores):
+    registro = db.session.get(modelo, id_registro)
+    if not registro:
+        raise ValueError('Registro no encontrado')
+    for clave, valor in valores.items():
+        setattr(registro, clave, valor)
+    if modelo is Producto:
+        marcar_para_invalidar('productos', f'producto:{id_registro}')
+    db.session.commit()
+
+
+def _eliminar_cliente_antes(id_cliente):
+    db.session.delete(db.session.get(Cliente, id_cliente))
+    db.session.commit()
+
+
+def _eliminar_producto_antes(id_producto):
+    producto = db.session.get(Producto, id_producto)
+    StockService.registrar_movimiento(id_producto, -(producto.cantidad or 0), 'ajuste')
+    marcar_para_invalidar('productos', f'producto:{id_producto}')
+    db.session.delete(producto)
+    db.session.commit()
+
+
+def _eliminar_orden_venta_antes(id_orden_venta):
+    orden_venta = db.session.get(OrdenVenta, id_orden_venta)
+    ResumenVentasService.sumar_orden(id_orden_venta, -1)
+    db.session.delete(orden_venta)
+    db.session.commit()
+
+
+# Nombre -> (tabla, camino anterior, método actual del servicio); cada camino recibe el ID del registro.
+CASOS = {
+    'update_cliente': (
+        Cliente,
+        lambda i: _actualizar_antes(Cliente, i, {'telefono': '555-0199'}),
+        lambda i: ClienteService.update_cliente(i, {'telefono': '555-0199'}),
+    ),
+    'update_producto': (
+        Producto,
+        lambda i: _actualizar_antes(Producto, i, {'precio_venta': 19.5}),
+        lambda i: ProductoService.update_producto(i, {'precio_venta': 19.5}),
+    ),
+    'delete_cliente': (Cliente, _eliminar_cliente_antes, ClienteService.delete_cliente),
+    'delete_producto': (Producto, _eliminar_producto_antes, ProductoService.delete_producto),
+    'delete_orden_venta': (OrdenVenta, _eliminar_orden_venta_antes, OrdenVentaService.delete_orden_venta),
+}
+
+
+def _crear_app(uri):
+    class ConfigEscrituras(configuracion.Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_ECHO = False
+
+    configuracion.config_por_entorno['escrituras'] = ConfigEscrituras
+    app = create_app('escrituras')
+    app.logger.setLevel(logging.CRITICAL)
+    return app
+
+
+def _poblar(modelo, cantidad):
+    """Insertar `cantidad` registros nuevos en la tabla de `modelo` y devolver sus IDs."""
+    if modelo is Cliente:
+        filas = [{'nombre': f'Cliente {i}', 'contacto': f'Contacto {i}', 'telefono': '555-0100', 'direccion': f'Calle {i}'}
+                 for i in range(cantidad)]
+    elif modelo is Producto:
+        filas = [{'nombre': f'Producto {i}', 'costo': 10.5, 'precio_venta': 15.75, 'cantidad': i % 500} for i in range(cantidad)]
+    else:
+        hoy = date.today()
+        id_cliente = _poblar(Cliente, 1)[0]
+        filas = [{'fecha_inicio': hoy, 'fecha_final': hoy, 'estado': 'completado', 'id_cliente': id_cliente} for _ in range(cantidad)]
+    clave = escritura._clave_primaria(modelo)
+    return db.session.scalars(insert(modelo).returning(clave), filas).all()
+
+
+def _medir(camino, ids):
+    """Aplicar `camino` a cada ID y devolver (escrituras por segundo, sentencias SQL por operación)."""
+    sentencias = 0
+
+    def contar(*_):
+        nonlocal sentencias
+        sentencias += 1
+
+    db.session.expunge_all()  # Los registros no están en el identity map, como en una petición nueva.
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    inicio = time.perf_counter()
+    for id_registro in ids:
+        camino(id_registro)
+    segundos = time.perf_counter() - inicio
+    event.remove(db.engine, 'before_cursor_execute', contar)
+    return len(ids) / segundos, sentencias / len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--operaciones', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = _crear_app(f'sqlite:///{os.path.join(tempfile.mkdtemp(), "escrituras.db")}')
+    soporta_returning = escritura._soporta_returning
+    with app.app_context():
+        db.create_all()
+        print(f'{args.operaciones} operaciones por caso')
+        for nombre, (modelo, antes, servicio) in CASOS.items():
+            columnas = []
+            for etiqueta, camino, returning in (('antes', antes, True), ('servicio', servicio, True),
+                                                ('sin RETURNING', servicio, False)):
+                ids = _poblar(modelo, args.operaciones)
+                db.session.commit()
+                escritura._soporta_returning = soporta_returning if returning else (lambda sentencia: False)
+                try:
+                    por_segundo, sentencias = _medir(camino, ids)
+                finally:
+                    escritura._soporta_returning = soporta_returning
+                columnas.append(f'{etiqueta} {por_segundo:.0f}/s ({sentencias:.0f} SQL)')
+            print(f'  {nombre:<20} ' + '   '.join(columnas))
+
+
+if __name__ == '__main__':
+    main()
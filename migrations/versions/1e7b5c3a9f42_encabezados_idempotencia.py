@@ -0,0 +1,28 @@
+"""Encabezados de las respuestas guardadas por Idempotency-Key
+
+Revision ID: 1e7b5c3a9f42
+Revises: d9a4c2e6f1b8
+Create Date: 2026-10-16 23:00:00.000000
+
+Agrega `encabezados` a `claves_idempotencia`. Las respuestas guardadas antes de esta revisión se
+repiten sin encabezados, como hasta ahora.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1e7b5c3a9f42'
+down_revision = 'd9a4c2e6f1b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claves_idempotencia', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('encabezados', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('claves_idempotencia', schema=None) as batch_op:
+        batch_op.drop_column('encabezados')
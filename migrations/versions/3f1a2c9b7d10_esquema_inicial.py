@@ -0,0 +1,91 @@
+"""Esquema inicial: proveedores, clientes, productos, órdenes y detalles
+
+Revision ID: 3f1a2c9b7d10
+Revises: 
+Create Date: 2026-10-16 12:00:00.000000
+
+Las bases de datos creadas antes de usar las migraciones ya tienen estas tablas:
+en ese caso se debe marcar esta revisión como aplicada con `flask db stamp 3f1a2c9b7d10`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a2c9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('clientes',
+    sa.Column('id_cliente', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=True),
+    sa.Column('contacto', sa.String(length=100), nullable=True),
+    sa.Column('telefono', sa.String(length=15), nullable=True),
+    sa.Column('direccion', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id_cliente')
+    )
+    op.create_table('productos',
+    sa.Column('id_producto', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=True),
+    sa.Column('costo', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('precio_venta', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('cantidad', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id_producto')
+    )
+    op.create_table('proveedores',
+    sa.Column('id_proveedor', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nombre', sa.String(length=100), nullable=True),
+    sa.Column('contacto', sa.String(length=100), nullable=True),
+    sa.Column('telefono', sa.String(length=15), nullable=True),
+    sa.Column('direccion', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id_proveedor')
+    )
+    op.create_table('ordenes_compra',
+    sa.Column('id_orden_compra', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('fecha_inicio', sa.Date(), nullable=True),
+    sa.Column('fecha_final', sa.Date(), nullable=True),
+    sa.Column('estado', sa.Enum('completado', 'pendiente', 'cancelado'), nullable=True),
+    sa.Column('id_proveedor', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_proveedor'], ['proveedores.id_proveedor'], ),
+    sa.PrimaryKeyConstraint('id_orden_compra')
+    )
+    op.create_table('ordenes_venta',
+    sa.Column('id_orden_venta', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('fecha_inicio', sa.Date(), nullable=True),
+    sa.Column('fecha_final', sa.Date(), nullable=True),
+    sa.Column('estado', sa.Enum('completado', 'pendiente', 'cancelado'), nullable=True),
+    sa.Column('id_cliente', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_cliente'], ['clientes.id_cliente'], ),
+    sa.PrimaryKeyConstraint('id_orden_venta')
+    )
+    op.create_table('detalle_orden_compra',
+    sa.Column('id_detalle_compra', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('id_orden_compra', sa.Integer(), nullable=False),
+    sa.Column('id_producto', sa.Integer(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_orden_compra'], ['ordenes_compra.id_orden_compra'], ),
+    sa.ForeignKeyConstraint(['id_producto'], ['productos.id_producto'], ),
+    sa.PrimaryKeyConstraint('id_detalle_compra')
+    )
+    op.create_table('detalle_orden_venta',
+    sa.Column('id_detalle_venta', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('id_orden_venta', sa.Integer(), nullable=False),
+    sa.Column('id_producto', sa.Integer(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['id_orden_venta'], ['ordenes_venta.id_orden_venta'], ),
+    sa.ForeignKeyConstraint(['id_producto'], ['productos.id_producto'], ),
+    sa.PrimaryKeyConstraint('id_detalle_venta')
+    )
+
+
+def downgrade():
+    op.drop_table('detalle_orden_venta')
+    op.drop_table('detalle_orden_compra')
+    op.drop_table('ordenes_venta')
+    op.drop_table('ordenes_compra')
+    op.drop_table('proveedores')
+    op.drop_table('productos')
+    op.drop_table('clientes')
@@ -0,0 +1,55 @@
+"""Índices para claves foráneas y filtros de órdenes y detalles
+
+Revision ID: 5b9d3e7f4a22
+Revises: 8c4e6d2a1b37
+Create Date: 2026-10-16 12:20:00.000000
+
+Agrega índices compuestos (estado, fecha_inicio) en ambas tablas de órdenes para los
+filtros por estado y rango de fechas, e índices sobre las claves foráneas de las órdenes
+y los detalles para que las búsquedas no dependan de que el motor los cree solo.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9d3e7f4a22'
+down_revision = '8c4e6d2a1b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ordenes_compra', schema=None) as batch_op:
+        batch_op.create_index('ix_ordenes_compra_estado_fecha_inicio', ['estado', 'fecha_inicio'], unique=False)
+        batch_op.create_index('ix_ordenes_compra_id_proveedor', ['id_proveedor'], unique=False)
+
+    with op.batch_alter_table('ordenes_venta', schema=None) as batch_op:
+        batch_op.create_index('ix_ordenes_venta_estado_fecha_inicio', ['estado', 'fecha_inicio'], unique=False)
+        batch_op.create_index('ix_ordenes_venta_id_cliente', ['id_cliente'], unique=False)
+
+    with op.batch_alter_table('detalle_orden_compra', schema=None) as batch_op:
+        batch_op.create_index('ix_detalle_orden_compra_id_orden_compra', ['id_orden_compra'], unique=False)
+        batch_op.create_index('ix_detalle_orden_compra_producto_orden', ['id_producto', 'id_orden_compra'], unique=False)
+
+    with op.batch_alter_table('detalle_orden_venta', schema=None) as batch_op:
+        batch_op.create_index('ix_detalle_orden_venta_id_orden_venta', ['id_orden_venta'], unique=False)
+        batch_op.create_index('ix_detalle_orden_venta_producto_orden', ['id_producto', 'id_orden_venta'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('detalle_orden_venta', schema=None) as batch_op:
+        batch_op.drop_index('ix_detalle_orden_venta_producto_orden')
+        batch_op.drop_index('ix_detalle_orden_venta_id_orden_venta')
+
+    with op.batch_alter_table('detalle_orden_compra', schema=None) as batch_op:
+        batch_op.drop_index('ix_detalle_orden_compra_producto_orden')
+        batch_op.drop_index('ix_detalle_orden_compra_id_orden_compra')
+
+    with op.batch_alter_table('ordenes_venta', schema=None) as batch_op:
+        batch_op.drop_index('ix_ordenes_venta_id_cliente')
+        batch_op.drop_index('ix_ordenes_venta_estado_fecha_inicio')
+
+    with op.batch_alter_table('ordenes_compra', schema=None) as batch_op:
+        batch_op.drop_index('ix_ordenes_compra_id_proveedor')
+        batch_op.drop_index('ix_ordenes_compra_estado_fecha_inicio')
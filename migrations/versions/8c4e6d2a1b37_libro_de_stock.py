@@ -0,0 +1,53 @@
+"""Libro de movimientos de stock y snapshots
+
+Revision ID: 8c4e6d2a1b37
+Revises: 3f1a2c9b7d10
+Create Date: 2026-10-16 12:10:00.000000
+
+Registra el stock existente como movimiento de ajuste inicial en la misma migración, antes
+de que la aplicación pueda escribir en el libro.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e6d2a1b37'
+down_revision = '3f1a2c9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('movimiento_stock',
+    sa.Column('id_movimiento', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('id_producto', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.Enum('venta', 'compra', 'ajuste'), nullable=False),
+    sa.PrimaryKeyConstraint('id_movimiento')
+    )
+    with op.batch_alter_table('movimiento_stock', schema=None) as batch_op:
+        batch_op.create_index('ix_movimiento_stock_producto_fecha', ['id_producto', 'fecha'], unique=False)
+
+    op.create_table('snapshot_stock',
+    sa.Column('id_producto', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id_producto', 'fecha')
+    )
+
+    # Saldo de apertura: el stock actual de cada producto entra al libro como ajuste.
+    op.execute(
+        "INSERT INTO movimiento_stock (id_producto, fecha, cantidad, tipo) "
+        "SELECT id_producto, CURRENT_DATE, cantidad, 'ajuste' FROM productos "
+        "WHERE cantidad IS NOT NULL AND cantidad <> 0"
+    )
+
+
+def downgrade():
+    op.drop_table('snapshot_stock')
+    with op.batch_alter_table('movimiento_stock', schema=None) as batch_op:
+        batch_op.drop_index('ix_movimiento_stock_producto_fecha')
+
+    op.drop_table('movimiento_stock')
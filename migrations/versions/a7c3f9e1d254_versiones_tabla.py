@@ -0,0 +1,38 @@
+"""Tabla de versiones por tabla para los ETag
+
+Revision ID: a7c3f9e1d254
+Revises: 5b9d3e7f4a22
+Create Date: 2026-10-16 12:30:00.000000
+
+Crea `versiones_tabla` y carga una fila por cada tabla de la aplicación, para que el
+primer cambio de cada tabla solo tenga que incrementar su contador.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3f9e1d254'
+down_revision = '5b9d3e7f4a22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    versiones_tabla = op.create_table('versiones_tabla',
+    sa.Column('tabla', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('actualizado', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('tabla')
+    )
+    op.bulk_insert(versiones_tabla, [
+        {'tabla': tabla, 'version': 0, 'actualizado': None}
+        for tabla in (
+            'clientes', 'proveedores', 'productos', 'ordenes_venta', 'ordenes_compra',
+            'detalle_orden_venta', 'detalle_orden_compra', 'movimiento_stock', 'snapshot_stock',
+        )
+    ])
+
+
+def downgrade():
+    op.drop_table('versiones_tabla')
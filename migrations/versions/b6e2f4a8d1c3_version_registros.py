@@ -0,0 +1,31 @@
+"""Columna version para el control de concurrencia optimista
+
+Revision ID: b6e2f4a8d1c3
+Revises: f8b3d5a1c7e9
+Create Date: 2026-10-16 18:00:00.000000
+
+Agrega `version` a productos, ordenes_venta y ordenes_compra. Las filas existentes quedan en 1.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2f4a8d1c3'
+down_revision = 'f8b3d5a1c7e9'
+branch_labels = None
+depends_on = None
+
+TABLAS = ('productos', 'ordenes_venta', 'ordenes_compra')
+
+
+def upgrade():
+    for tabla in TABLAS:
+        with op.batch_alter_table(tabla, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for tabla in reversed(TABLAS):
+        with op.batch_alter_table(tabla, schema=None) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,40 @@
+"""Resumen diario de ventas por producto
+
+Revision ID: c2d6e8a4b913
+Revises: a7c3f9e1d254
+Create Date: 2026-10-16 15:00:00.000000
+
+Crea `resumen_ventas_diario` y lo carga con las unidades de las órdenes completadas ya
+existentes. Desde ahí lo mantienen los servicios; `flask resumen reconstruir` lo recalcula.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d6e8a4b913'
+down_revision = 'a7c3f9e1d254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resumen_ventas_diario',
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('id_producto', sa.Integer(), nullable=False),
+    sa.Column('unidades', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('fecha', 'id_producto')
+    )
+    op.execute(
+        "INSERT INTO resumen_ventas_diario (fecha, id_producto, unidades) "
+        "SELECT o.fecha_inicio, d.id_producto, SUM(d.cantidad) "
+        "FROM detalle_orden_venta d JOIN ordenes_venta o ON o.id_orden_venta = d.id_orden_venta "
+        "WHERE o.estado = 'completado' AND o.fecha_inicio IS NOT NULL AND d.cantidad IS NOT NULL "
+        "GROUP BY o.fecha_inicio, d.id_producto"
+    )
+    op.execute("INSERT INTO versiones_tabla (tabla, version, actualizado) VALUES ('resumen_ventas_diario', 0, NULL)")
+
+
+def downgrade():
+    op.execute("DELETE FROM versiones_tabla WHERE tabla = 'resumen_ventas_diario'")
+    op.drop_table('resumen_ventas_diario')
@@ -0,0 +1,28 @@
+"""Reserva con vencimiento de las claves Idempotency-Key
+
+Revision ID: d9a4c2e6f1b8
+Revises: b6e2f4a8d1c3
+Create Date: 2026-10-16 22:00:00.000000
+
+Agrega `reservada` a `claves_idempotencia`. Las claves que ya estaban "en_proceso" quedan sin
+reserva y un reintento puede tomarlas enseguida.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a4c2e6f1b8'
+down_revision = 'b6e2f4a8d1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('claves_idempotencia', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reservada', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('claves_idempotencia', schema=None) as batch_op:
+        batch_op.drop_column('reservada')
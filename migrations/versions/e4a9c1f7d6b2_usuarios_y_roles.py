@@ -0,0 +1,42 @@
+"""Usuarios y roles
+
+Revision ID: e4a9c1f7d6b2
+Revises: c2d6e8a4b913
+Create Date: 2026-10-16 16:00:00.000000
+
+Crea `roles` y `usuarios` y carga los roles "admin" y "usuario".
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c1f7d6b2'
+down_revision = 'c2d6e8a4b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    roles = op.create_table('roles',
+    sa.Column('id_rol', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id_rol'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('usuarios',
+    sa.Column('id_usuario', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('username', sa.String(length=80), nullable=False),
+    sa.Column('password_hash', sa.String(length=128), nullable=False),
+    sa.Column('id_rol', sa.Integer(), nullable=False),
+    sa.Column('activo', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['id_rol'], ['roles.id_rol'], ),
+    sa.PrimaryKeyConstraint('id_usuario'),
+    sa.UniqueConstraint('username')
+    )
+    op.bulk_insert(roles, [{'name': 'admin'}, {'name': 'usuario'}])
+
+
+def downgrade():
+    op.drop_table('usuarios')
+    op.drop_table('roles')
@@ -0,0 +1,35 @@
+"""Claves Idempotency-Key de las peticiones POST
+
+Revision ID: f8b3d5a1c7e9
+Revises: e4a9c1f7d6b2
+Create Date: 2026-10-16 17:00:00.000000
+
+Crea `claves_idempotencia` con un índice por vencimiento para `flask idempotencia purgar`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8b3d5a1c7e9'
+down_revision = 'e4a9c1f7d6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('claves_idempotencia',
+    sa.Column('clave', sa.String(length=100), nullable=False),
+    sa.Column('huella', sa.String(length=64), nullable=False),
+    sa.Column('estado', sa.Enum('en_proceso', 'completado'), nullable=False),
+    sa.Column('codigo', sa.SmallInteger(), nullable=True),
+    sa.Column('cuerpo', sa.LargeBinary(), nullable=True),
+    sa.Column('expira', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('clave')
+    )
+    op.create_index('ix_claves_idempotencia_expira', 'claves_idempotencia', ['expira'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_claves_idempotencia_expira', table_name='claves_idempotencia')
+    op.drop_table('claves_idempotencia')
@@ -0,0 +1,84 @@
+import os
+import re
+from contextlib import contextmanager
+from datetime import date
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.cliente import Cliente
+from app.models.ordenCompra import OrdenCompra
+from app.models.ordenVenta import OrdenVenta
+from app.models.producto import Producto
+from app.models.proveedor import Proveedor
+
+# Directorio de las migraciones de Alembic.
+MIGRACIONES = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+
+@pytest.fixture
+def app():
+    """Aplicación con la configuración de pruebas y el esquema creado en SQLite en memoria."""
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def app_migrada(tmp_path, monkeypatch):
+    """Aplicación sobre un archivo SQLite con el esquema creado por las migraciones (`flask db upgrade`)."""
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "migrada.db"}')
+    app = create_app('testing')
+    with app.app_context():
+        upgrade(directory=MIGRACIONES)
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    """Cliente HTTP de pruebas."""
+    return app.test_client()
+
+
+@pytest.fixture
+def datos(app):
+    """Un cliente, un proveedor, una orden de venta completada, una orden de compra y dos productos con stock."""
+    cliente = Cliente('Cliente', 'Contacto', '555', 'Calle 1')
+    proveedor = Proveedor('Proveedor', 'Contacto', '555', 'Calle 2')
+    productos = [Producto('Producto A', 10, 15, 1000), Producto('Producto B', 20, 30, 1000)]
+    db.session.add_all([cliente, proveedor, *productos])
+    db.session.flush()
+    orden_venta = OrdenVenta(date.today(), date.today(), 'completado', cliente.id_cliente)
+    orden_compra = OrdenCompra(date.today(), date.today(), 'completado', proveedor.id_proveedor)
+    db.session.add_all([orden_venta, orden_compra])
+    db.session.commit()
+    return {
+        'id_orden_venta': orden_venta.id_orden_venta,
+        'id_orden_compra': orden_compra.id_orden_compra,
+        'ids_producto': [p.id_producto for p in productos],
+    }
+
+
+@contextmanager
+def sentencias_sql():
+    """Registrar el texto de cada sentencia SQL ejecutada dentro del bloque."""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+
+
+def inserts_en(sentencias, tabla):
+    """Sentencias INSERT sobre una tabla."""
+    return [s for s in sentencias if re.match(rf'\s*INSERT INTO {tabla}\b', s)]
@@ -0,0 +1,18 @@
+import pytest
+from app.services import user_service
+from app.services.user_service import UserService
+from app.utils.contrasenas import costo_actual
+
+
+def test_un_usuario_inexistente_verifica_la_contrasena_contra_un_hash_ficticio(app, monkeypatch):
+    verificados = []
+    verificar = user_service.verificar
+    monkeypatch.setattr(user_service, 'verificar', lambda h, p: verificados.append(h) or verificar(h, p))
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match='Credenciales inválidas.'):
+            UserService.autenticar('no-existe', 'una-contraseña')
+
+    # Se calcula un bcrypt completo, con el costo configurado, y el hash se reutiliza entre intentos.
+    assert len(verificados) == 2 and verificados[0] == verificados[1]
+    assert costo_actual(verificados[0]) == app.config['BCRYPT_LOG_ROUNDS']
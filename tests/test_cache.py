@@ -0,0 +1,31 @@
+import threading
+import pytest
+from app.utils.cache import BackendCache, Cache, CacheLRU
+
+
+def test_un_backend_incompleto_no_se_puede_instanciar():
+    class SoloGet(BackendCache):
+        def get(self, clave):
+            return None
+
+    with pytest.raises(TypeError):
+        SoloGet()
+
+
+def test_los_contadores_suman_todas_las_lecturas_concurrentes():
+    cache = Cache(CacheLRU(maxsize=10, ttl=0), 'prueba')
+    barrera = threading.Barrier(8)
+
+    def leer():
+        barrera.wait()
+        for i in range(2000):
+            cache.obtener(f'clave:{i % 20}', lambda: i)
+
+    hilos = [threading.Thread(target=leer) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert cache.aciertos + cache.fallos == 8 * 2000
+    assert cache.fallos >= 20  # Con 20 claves y 10 entradas, la caché no puede acertar siempre.
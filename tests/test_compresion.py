@@ -0,0 +1,100 @@
+import gzip
+import json
+import zlib
+import pytest
+from app import db
+from app.middlewares.compresion_middleware import brotli
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.models.producto import Producto
+
+DETALLES = '/Detalles%20de%20ordenes%20de%20venta/'
+CAMBIOS = {'nombre': 'Producto A', 'costo': 10, 'precio_venta': 16, 'cantidad': 1000}
+
+
+@pytest.fixture
+def catalogo(datos):
+    """Suficientes productos para que el listado supere COMPRESION_UMBRAL_BYTES."""
+    db.session.add_all(Producto(f'Producto {i}', 1, 2, 10) for i in range(50))
+    db.session.commit()
+    return datos
+
+
+@pytest.fixture
+def sin_umbral(app, monkeypatch):
+    """Comprimir también las respuestas chicas (la de un producto ocupa menos de 1 KB)."""
+    monkeypatch.setitem(app.config, 'COMPRESION_UMBRAL_BYTES', 0)
+
+
+def test_las_respuestas_bajo_el_umbral_no_se_comprimen(client, datos):
+    respuesta = client.get(f'/Productos/{datos["ids_producto"][0]}', headers={'Accept-Encoding': 'gzip'})
+    assert len(respuesta.get_data()) < client.application.config['COMPRESION_UMBRAL_BYTES']
+    assert 'Content-Encoding' not in respuesta.headers
+    assert 'Accept-Encoding' in respuesta.vary
+
+
+def test_las_respuestas_grandes_se_comprimen_con_gzip(client, catalogo):
+    sin_comprimir = client.get('/Productos/')
+    respuesta = client.get('/Productos/', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in sin_comprimir.headers
+    assert respuesta.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in respuesta.vary and 'Accept-Encoding' in sin_comprimir.vary
+    assert len(respuesta.get_data()) < len(sin_comprimir.get_data())
+    assert json.loads(gzip.decompress(respuesta.get_data())) == sin_comprimir.json
+
+
+@pytest.mark.parametrize('accept_encoding, esperada', [
+    ('br, gzip', 'br' if brotli else 'gzip'),
+    ('gzip;q=0.5, deflate', 'deflate'),
+    ('deflate;q=0.1, gzip;q=0.9', 'gzip'),
+    ('identity', None),
+    ('br', 'br' if brotli else None),
+])
+def test_la_codificacion_se_negocia_con_accept_encoding(client, catalogo, accept_encoding, esperada):
+    respuesta = client.get('/Productos/', headers={'Accept-Encoding': accept_encoding})
+    assert respuesta.headers.get('Content-Encoding') == esperada
+    if esperada == 'deflate':
+        assert json.loads(zlib.decompress(respuesta.get_data()))['productos']
+
+
+def test_el_ndjson_en_streaming_se_comprime_por_bloques_sin_umbral(client, datos):
+    for id_producto in datos['ids_producto']:
+        db.session.add(DetalleOrdenVenta(datos['id_orden_venta'], id_producto, 3))
+    db.session.commit()
+
+    respuesta = client.get(DETALLES + '?stream=1', headers={'Accept-Encoding': 'gzip'})
+    # Aunque el NDJSON ocupa menos que el umbral, el streaming no se acumula para medirlo: se comprime igual.
+    assert respuesta.is_streamed and respuesta.mimetype == 'application/x-ndjson'
+    assert respuesta.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in respuesta.headers
+    lineas = gzip.decompress(respuesta.get_data()).splitlines()
+    assert [json.loads(linea)['id_producto'] for linea in lineas] == datos['ids_producto']
+
+    sin_comprimir = client.get(DETALLES + '?stream=1')
+    assert 'Content-Encoding' not in sin_comprimir.headers
+    assert len(sin_comprimir.get_data().splitlines()) == 2
+
+
+def test_el_etag_comprimido_sirve_para_if_none_match_e_if_match(client, datos, sin_umbral):
+    url = f'/Productos/{datos["ids_producto"][0]}'
+    lectura = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert lectura.headers['Content-Encoding'] == 'gzip'
+    assert lectura.headers['ETag'] == '"1-gzip"'
+
+    # El 304 repite el ETag de la variante comprimida que el cliente ya tiene.
+    no_modificado = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"1-gzip"'})
+    assert no_modificado.status_code == 304 and no_modificado.headers['ETag'] == '"1-gzip"'
+
+    # Un If-Match con el sufijo se interpreta como la versión 1 del registro.
+    escritura = client.put(url, json=CAMBIOS, headers={'Accept-Encoding': 'gzip', 'If-Match': '"1-gzip"'})
+    assert escritura.status_code == 200 and escritura.headers['ETag'] == '"2-gzip"'
+    assert client.put(url, json=CAMBIOS, headers={'If-Match': '"1-gzip"'}).status_code == 412
+    assert client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"1-gzip"'}).status_code == 200
+
+
+def test_el_etag_de_un_listado_comprimido_sirve_para_if_none_match(client, catalogo):
+    lectura = client.get('/Productos/', headers={'Accept-Encoding': 'gzip'})
+    etag = lectura.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    respuesta = client.get('/Productos/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert respuesta.status_code == 304 and respuesta.headers['ETag'] == etag
@@ -0,0 +1,30 @@
+import pytest
+
+CAMBIOS = {'nombre': 'Producto A', 'costo': 10, 'precio_venta': 16, 'cantidad': 1000}
+
+
+def test_el_etag_del_producto_es_su_version_y_sirve_para_if_match(client, datos):
+    url = f'/Productos/{datos["ids_producto"][0]}'
+    lectura = client.get(url)
+    assert lectura.headers['ETag'] == '"1"'
+
+    escritura = client.put(url, json=CAMBIOS, headers={'If-Match': lectura.headers['ETag']})
+    assert escritura.status_code == 200 and escritura.headers['ETag'] == '"2"'
+    assert client.get(url, headers={'If-None-Match': '"2"'}).status_code == 304
+    assert client.get(url, headers={'If-None-Match': '"1"'}).status_code == 200
+
+
+@pytest.mark.parametrize('if_match', [
+    '"1-8a302c3d75fc24dd"',  # ETag de un listado: no es la versión del registro aunque empiece con ella.
+    '"1", "abc"',
+    'W/"1"',
+    '',
+])
+def test_if_match_que_no_es_una_version_se_rechaza(client, datos, if_match):
+    respuesta = client.put(f'/Productos/{datos["ids_producto"][0]}', json=CAMBIOS, headers={'If-Match': if_match})
+    assert respuesta.status_code == 412
+
+
+def test_if_match_acepta_el_sufijo_de_la_compresion(client, datos):
+    respuesta = client.put(f'/Productos/{datos["ids_producto"][0]}', json=CAMBIOS, headers={'If-Match': '"1-gzip"'})
+    assert respuesta.status_code == 200
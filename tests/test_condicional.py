@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+from app.utils.condicional import _sin_cambios
+
+MODIFICADO = datetime(2024, 5, 1, 12, 0, 0, 600000, tzinfo=timezone.utc)
+
+
+def _vigente(app, encabezados, ultima_modificacion=MODIFICADO):
+    with app.test_request_context('/Productos/', headers=encabezados):
+        return _sin_cambios('3-abc', ultima_modificacion)
+
+
+def test_if_none_match_tiene_prioridad_sobre_if_modified_since(app):
+    futuro = 'Wed, 01 May 2030 00:00:00 GMT'
+    assert not _vigente(app, {'If-None-Match': '"2-abc"', 'If-Modified-Since': futuro})
+    # Un If-None-Match que no se puede interpretar tampoco deja que decida la fecha.
+    assert not _vigente(app, {'If-None-Match': '', 'If-Modified-Since': futuro})
+    assert _vigente(app, {'If-None-Match': '"3-abc-gzip"'})
+
+
+def test_if_modified_since_del_mismo_segundo_no_es_vigente(app):
+    # Otro cambio pudo ocurrir más tarde en ese mismo segundo aunque la modificación sea exacta.
+    exacto = MODIFICADO.replace(microsecond=0)
+    assert not _vigente(app, {'If-Modified-Since': 'Wed, 01 May 2024 12:00:00 GMT'}, exacto)
+    assert not _vigente(app, {'If-Modified-Since': 'Wed, 01 May 2024 12:00:00 GMT'})
+    assert not _vigente(app, {'If-Modified-Since': 'Wed, 01 May 2024 11:59:59 GMT'})
+    assert _vigente(app, {'If-Modified-Since': 'Wed, 01 May 2024 12:00:01 GMT'})
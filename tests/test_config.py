@@ -0,0 +1,32 @@
+from app import config as configuracion, create_app, db
+
+
+def _app_con_pool(tmp_path, monkeypatch, **opciones):
+    class ConfigPool(configuracion.Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "pool.db"}'
+        SQLALCHEMY_ENGINE_OPTIONS = {**configuracion.Config.SQLALCHEMY_ENGINE_OPTIONS, **opciones}
+
+    monkeypatch.setitem(configuracion.config_por_entorno, 'pool', ConfigPool)
+    app = create_app('pool')
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def test_el_pool_usa_las_opciones_configuradas(tmp_path, monkeypatch):
+    app = _app_con_pool(tmp_path, monkeypatch, pool_size=3, max_overflow=1, pool_timeout=7)
+    with app.app_context():
+        assert (db.engine.pool.size(), db.engine.pool._max_overflow, db.engine.pool.timeout()) == (3, 1, 7)
+
+
+def test_pool_agotado_responde_503_con_retry_after(tmp_path, monkeypatch):
+    app = _app_con_pool(tmp_path, monkeypatch, pool_size=1, max_overflow=0, pool_timeout=0)
+    with app.app_context():
+        ocupada = db.engine.connect()  # Retiene la única conexión del pool.
+        try:
+            respuesta = app.test_client().get('/Clientes/')
+        finally:
+            ocupada.close()
+
+    assert respuesta.status_code == 503
+    assert respuesta.headers['Retry-After'] == '5'
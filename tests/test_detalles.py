@@ -0,0 +1,52 @@
+import pytest
+from app import db
+from app.models.producto import Producto
+from app.services.detalle_orden_compra_service import DetalleOrdenCompraService
+from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from tests.conftest import sentencias_sql
+
+URL_VENTA = '/Detalles%20de%20ordenes%20de%20venta/'
+
+
+def test_crear_detalle_venta_descuenta_stock(client, datos):
+    id_producto = datos['ids_producto'][0]
+    with sentencias_sql() as sentencias:
+        respuesta = client.post(URL_VENTA, json={
+            'id_orden_venta': datos['id_orden_venta'], 'id_producto': id_producto, 'cantidad': 5,
+        })
+
+    assert respuesta.status_code == 201
+    # Ninguna lectura después del commit: el ID del detalle sale del INSERT.
+    assert not sentencias[-1].lstrip().startswith('SELECT')
+    assert db.session.get(Producto, id_producto).cantidad == 995
+
+
+def test_crear_detalle_venta_distingue_producto_inexistente_de_stock_insuficiente(client, datos):
+    linea = {'id_orden_venta': datos['id_orden_venta'], 'id_producto': 999, 'cantidad': 1}
+    respuesta = client.post(URL_VENTA, json=linea)
+    assert (respuesta.status_code, respuesta.json['message']) == (400, 'El producto especificado no existe.')
+
+    linea.update(id_producto=datos['ids_producto'][0], cantidad=5000)
+    respuesta = client.post(URL_VENTA, json=linea)
+    assert (respuesta.status_code, respuesta.json['message']) == (400, 'Stock insuficiente para el producto especificado.')
+
+
+def test_error_de_stock_no_descarta_las_escrituras_pendientes(app, datos):
+    # Un error del servicio no deshace la transacción: lo pendiente queda a cargo de quien llama.
+    producto = Producto('Pendiente', 1, 2, 10)
+    db.session.add(producto)
+    with pytest.raises(ValueError):
+        DetalleOrdenVentaService.create_detalle_orden_venta(datos['id_orden_venta'], datos['ids_producto'][0], 5000)
+    assert producto in db.session
+
+
+def test_cambiar_producto_sin_stock_no_modifica_el_anterior(app, datos):
+    id_a, id_b = datos['ids_producto']
+    id_detalle = DetalleOrdenCompraService.create_detalle_orden_compra(datos['id_orden_compra'], id_a, 10)
+    db.session.execute(db.update(Producto).where(Producto.id_producto == id_a).values(cantidad=0))
+    db.session.commit()
+
+    with pytest.raises(ValueError, match='Stock insuficiente'):
+        DetalleOrdenCompraService.update_detalle_orden_compra(id_detalle, id_b, 10)
+    db.session.commit()
+    assert db.session.get(Producto, id_b).cantidad == 1000
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import select
+from app import db
+from app.models.cliente import Cliente
+from app.models.movimientoStock import MovimientoStock
+from app.models.producto import Producto
+from app.utils import escritura
+from app.utils.concurrencia import ConflictoVersionError
+from app.utils.escritura import actualizar, eliminar
+from tests.conftest import sentencias_sql
+
+CAMBIOS = {'nombre': 'Producto A', 'costo': 10, 'precio_venta': 16, 'cantidad': 1000}
+CLIENTE = {'nombre': 'Cliente', 'contacto': 'Otro contacto', 'telefono': '556', 'direccion': 'Calle 1'}
+
+
+@pytest.fixture
+def sin_returning(monkeypatch):
+    """Simular un motor sin RETURNING en UPDATE ni DELETE, como MySQL."""
+    monkeypatch.setattr(escritura, '_soporta_returning', lambda sentencia: False)
+
+
+@pytest.fixture(params=['returning', 'sin_returning'])
+def motor(request):
+    """Repetir la prueba con RETURNING y con la lectura por separado."""
+    if request.param == 'sin_returning':
+        request.getfixturevalue('sin_returning')
+
+
+def test_actualizar_usa_un_solo_update_con_returning(client, datos):
+    id_cliente = db.session.scalar(select(Cliente.id_cliente))
+    with sentencias_sql() as sentencias:
+        respuesta = client.put(f'/Clientes/{id_cliente}', json=CLIENTE)
+
+    assert respuesta.status_code == 200
+    updates = [s for s in sentencias if s.lstrip().startswith('UPDATE clientes')]
+    assert len(updates) == 1 and 'RETURNING' in updates[0]
+    assert not any(s.lstrip().startswith('SELECT') and 'FROM clientes' in s for s in sentencias)
+    assert db.session.get(Cliente, id_cliente).contacto == 'Otro contacto'
+
+
+def test_sin_returning_lee_el_registro_despues_del_update(app, datos, sin_returning):
+    id_producto = datos['ids_producto'][0]
+    with sentencias_sql() as sentencias:
+        fila = actualizar(Producto, id_producto, {'precio_venta': 16}, (Producto.precio_venta, Producto.version), {1})
+    db.session.commit()
+
+    assert (fila.precio_venta, fila.version) == (16, 2)
+    operaciones = [s.lstrip().split()[0] for s in sentencias]
+    assert operaciones == ['UPDATE', 'SELECT'] and 'RETURNING' not in sentencias[0]
+
+
+def test_sin_returning_el_delete_lee_las_columnas_antes_de_borrar(app, datos, sin_returning):
+    id_producto = datos['ids_producto'][0]
+    with sentencias_sql() as sentencias:
+        fila = eliminar(Producto, id_producto, (Producto.cantidad,))
+
+    assert fila.cantidad == 1000
+    assert [s.lstrip().split()[0] for s in sentencias] == ['SELECT', 'DELETE']
+    assert db.session.get(Producto, id_producto) is None
+
+
+def test_un_registro_inexistente_responde_404(client, datos, motor):
+    assert client.put('/Productos/999', json=CAMBIOS).status_code == 404
+    assert client.put('/Productos/999', json=CAMBIOS, headers={'If-Match': '"1"'}).status_code == 404
+    assert client.put('/Clientes/999', json=CLIENTE).status_code == 404
+    assert client.delete('/Clientes/999').status_code == 404
+    assert client.delete('/Productos/999').status_code == 404
+
+
+def test_un_if_match_viejo_responde_412_sin_modificar_el_registro(client, datos):
+    id_producto = datos['ids_producto'][0]
+    respuesta = client.put(f'/Productos/{id_producto}', json=CAMBIOS, headers={'If-Match': '"7"'})
+    assert respuesta.status_code == 412
+
+    with pytest.raises(ConflictoVersionError):
+        actualizar(Producto, id_producto, {'precio_venta': 16}, (Producto.version,), {7})
+    producto = db.session.get(Producto, id_producto)
+    assert (producto.precio_venta, producto.version) == (15, 1)
+
+
+def test_eliminar_un_producto_saca_su_stock_del_libro(client, datos, motor):
+    id_producto = datos['ids_producto'][0]
+    assert client.delete(f'/Productos/{id_producto}').status_code == 200
+
+    movimientos = db.session.execute(
+        select(MovimientoStock.cantidad, MovimientoStock.tipo).where(MovimientoStock.id_producto == id_producto)
+    ).all()
+    assert movimientos[-1] == (-1000, 'ajuste')
+    assert db.session.get(Producto, id_producto) is None
@@ -0,0 +1,85 @@
+from datetime import timedelta
+import pytest
+from flask import Response
+from sqlalchemy import select, update
+from app import db
+from app.models.claveIdempotencia import ClaveIdempotencia
+from app.models.producto import Producto
+from app.models.role import Role
+from app.utils.idempotencia import _ahora, idempotente
+
+PRODUCTO = {'nombre': 'Producto C', 'costo': 1, 'precio_venta': 2, 'cantidad': 5}
+
+
+def _dejar_en_proceso(clave, reservada):
+    """Dejar la clave como si la petición original siguiera en proceso desde `reservada`."""
+    db.session.execute(update(ClaveIdempotencia).where(ClaveIdempotencia.clave == clave).values(
+        estado='en_proceso', codigo=None, cuerpo=None, reservada=reservada
+    ))
+    db.session.commit()
+
+
+def _productos():
+    return db.session.scalar(select(db.func.count()).select_from(Producto))
+
+
+def test_una_reserva_vencida_la_toma_el_reintento(app, client):
+    encabezados = {'Idempotency-Key': 'clave-1'}
+    assert client.post('/Productos/', json=PRODUCTO, headers=encabezados).status_code == 201
+    # La petición original murió después de reservar la clave, sin guardar su respuesta.
+    _dejar_en_proceso('clave-1', _ahora() - timedelta(seconds=app.config['IDEMPOTENCIA_RESERVA'] + 1))
+
+    respuesta = client.post('/Productos/', json=PRODUCTO, headers=encabezados)
+    assert respuesta.status_code == 201 and 'Idempotent-Replayed' not in respuesta.headers
+    assert _productos() == 2
+    fila = db.session.execute(select(ClaveIdempotencia).where(ClaveIdempotencia.clave == 'clave-1')).scalar_one()
+    assert (fila.estado, fila.codigo) == ('completado', 201)
+
+
+def test_una_reserva_vigente_no_se_toma(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'IDEMPOTENCIA_ESPERA', 0.1)
+    encabezados = {'Idempotency-Key': 'clave-2'}
+    client.post('/Productos/', json=PRODUCTO, headers=encabezados)
+    _dejar_en_proceso('clave-2', _ahora())
+
+    respuesta = client.post('/Productos/', json=PRODUCTO, headers=encabezados)
+    assert respuesta.status_code == 409
+    assert _productos() == 1
+
+
+def test_el_registro_repite_la_respuesta_original(app, client):
+    db.session.add(Role(app.config['AUTH_ROL_POR_DEFECTO']))
+    db.session.commit()
+    credenciales = {'username': 'nuevo', 'password': 'una-contraseña-larga'}
+    encabezados = {'Idempotency-Key': 'registro-1'}
+
+    primera = client.post('/auth/register', json=credenciales, headers=encabezados)
+    repetida = client.post('/auth/register', json=credenciales, headers=encabezados)
+    assert (primera.status_code, repetida.status_code) == (201, 201)
+    assert repetida.headers['Idempotent-Replayed'] == 'true'
+
+
+ENCABEZADOS = {'ETag': '"1"', 'Location': '/Productos/1', 'Retry-After': '10', 'X-Otro': 'no se guarda'}
+
+
+@pytest.mark.parametrize('como_response', [False, True])
+def test_la_repeticion_conserva_los_encabezados_de_la_respuesta(app, client, como_response):
+    llamadas = []
+
+    @idempotente
+    def crear():
+        llamadas.append(1)
+        if como_response:
+            return Response(b'{"creado": true}', 201, ENCABEZADOS, mimetype='application/json')
+        return {'creado': True}, 201, ENCABEZADOS
+
+    app.add_url_rule('/crear', view_func=crear, methods=['POST'])
+    primera = client.post('/crear', headers={'Idempotency-Key': 'encabezados-1'})
+    repetida = client.post('/crear', headers={'Idempotency-Key': 'encabezados-1'})
+
+    assert len(llamadas) == 1 and repetida.headers['Idempotent-Replayed'] == 'true'
+    assert (repetida.status_code, repetida.json) == (primera.status_code, primera.json) == (201, {'creado': True})
+    for nombre in ('ETag', 'Location', 'Retry-After'):
+        assert repetida.headers[nombre] == primera.headers[nombre] == ENCABEZADOS[nombre]
+    # Solo se repiten los encabezados de ENCABEZADOS_REPETIDOS.
+    assert primera.headers['X-Otro'] == 'no se guarda' and 'X-Otro' not in repetida.headers
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from datetime import date
+import pytest
+from sqlalchemy import event
+from app import db
+from app.services.detalle_orden_compra_service import DetalleOrdenCompraService
+from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from app.services.orden_compra_service import OrdenCompraService
+from app.services.orden_venta_service import OrdenVentaService
+
+
+@contextmanager
+def planes_de_consulta():
+    """Guardar el EXPLAIN QUERY PLAN de cada SELECT ejecutado dentro del bloque."""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith('SELECT'):
+            consultas.append((statement, parameters))
+
+    planes = []
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        yield planes
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+    conexion = db.session.connection()
+    for statement, parameters in consultas:
+        filas = conexion.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+        planes.append(' | '.join(fila[-1] for fila in filas))
+
+
+@pytest.mark.parametrize('consulta, indice', [
+    (lambda: OrdenVentaService.get_all_ordenes_venta(estado='completado', desde=date(2024, 1, 1), hasta=date(2024, 12, 31)),
+     'ix_ordenes_venta_estado_fecha_inicio'),
+    (lambda: OrdenVentaService.get_all_ordenes_venta(id_cliente=1), 'ix_ordenes_venta_id_cliente'),
+    (lambda: OrdenCompraService.get_all_ordenes_compra(estado='pendiente', desde=date(2024, 1, 1)),
+     'ix_ordenes_compra_estado_fecha_inicio'),
+    (lambda: OrdenCompraService.get_all_ordenes_compra(id_proveedor=1), 'ix_ordenes_compra_id_proveedor'),
+    (lambda: DetalleOrdenVentaService.get_detalles_orden_venta(1), 'ix_detalle_orden_venta_id_orden_venta'),
+    (lambda: DetalleOrdenCompraService.get_detalles_orden_compra(1), 'ix_detalle_orden_compra_id_orden_compra'),
+])
+def test_los_filtros_usan_los_indices_de_la_migracion(app_migrada, consulta, indice):
+    with planes_de_consulta() as planes:
+        consulta()
+    assert planes and all(indice in plan for plan in planes), planes
+
+
+def test_las_ventas_de_un_producto_usan_el_indice_compuesto(app_migrada):
+    plan = db.session.connection().exec_driver_sql(
+        'EXPLAIN QUERY PLAN SELECT id_orden_venta FROM detalle_orden_venta WHERE id_producto = ?', (1,)
+    ).all()
+    assert 'ix_detalle_orden_venta_producto_orden' in plan[0][-1]
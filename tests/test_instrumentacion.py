@@ -0,0 +1,31 @@
+import copy
+import time
+import pytest
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import db
+
+
+def test_una_consulta_fallida_no_altera_la_medicion_de_las_siguientes(app):
+    with app.test_request_context():
+        conexion = db.session.connection()
+        info_antes = copy.deepcopy(conexion.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conexion.execute(text('SELECT * FROM tabla_inexistente'))
+        # Las consultas fallidas no dejan valores pendientes en la conexión del pool.
+        assert conexion.info == info_antes
+        db.session.rollback()
+        time.sleep(0.2)
+        g.db_consultas, g.db_tiempo = 0, 0.0
+        db.session.execute(text('SELECT 1'))
+
+        assert g.db_consultas == 1
+        assert g.db_tiempo < 0.1  # Sin la hora de inicio de la consulta fallida.
+
+
+def test_encabezados_con_las_consultas_de_la_peticion(client):
+    respuesta = client.get('/Productos/')
+    assert int(respuesta.headers['X-DB-Queries']) >= 1
+    assert respuesta.headers['Server-Timing'].startswith('db;dur=')
@@ -0,0 +1,56 @@
+import pytest
+from app import db
+from app.models.detalleOrdenCompra import DetalleOrdenCompra
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from app.utils import lotes
+from tests.conftest import inserts_en, sentencias_sql
+
+
+def _lineas(datos, cantidad):
+    return [
+        {'id_orden_venta': datos['id_orden_venta'], 'id_producto': datos['ids_producto'][i % 2], 'cantidad': 1}
+        for i in range(cantidad)
+    ]
+
+
+def test_bulk_inserta_todas_las_lineas_con_un_insert(datos):
+    with sentencias_sql() as sentencias:
+        creados, errores = DetalleOrdenVentaService.create_detalles_orden_venta_bulk(_lineas(datos, 40))
+
+    assert errores == []
+    assert len(inserts_en(sentencias, 'detalle_orden_venta')) == 1
+    # Los IDs devueltos corresponden, en orden, a las filas insertadas.
+    filas = db.session.query(DetalleOrdenVenta.id_detalle_venta, DetalleOrdenVenta.id_producto).order_by(DetalleOrdenVenta.id_detalle_venta).all()
+    assert [id_detalle for _, id_detalle in creados] == [fila.id_detalle_venta for fila in filas]
+    assert [fila.id_producto for fila in filas] == [l['id_producto'] for l in _lineas(datos, 40)]
+
+
+def test_bulk_divide_el_insert_por_cantidad_de_parametros(datos, monkeypatch):
+    # 3 columnas por fila: 10 filas por sentencia.
+    monkeypatch.setattr(lotes, 'MAXIMO_PARAMETROS_POR_SENTENCIA', 30)
+    with sentencias_sql() as sentencias:
+        creados, _ = DetalleOrdenVentaService.create_detalles_orden_venta_bulk(_lineas(datos, 25))
+
+    assert len(inserts_en(sentencias, 'detalle_orden_venta')) == 3
+    assert [id_detalle for _, id_detalle in creados] == list(range(1, 26))
+
+
+@pytest.mark.parametrize('cuerpo', [
+    {'id_orden_venta': 1, 'id_producto': 1, 'cantidad': 1},  # Un objeto suelto en lugar de la lista.
+    [],
+])
+def test_bulk_de_venta_rechaza_un_cuerpo_que_no_es_una_lista(client, datos, cuerpo):
+    respuesta = client.post('/Detalles%20de%20ordenes%20de%20venta/bulk', json=cuerpo)
+    assert respuesta.status_code == 400
+    assert db.session.query(DetalleOrdenVenta).count() == 0
+
+
+@pytest.mark.parametrize('cuerpo', [
+    {'id_orden_compra': 1, 'id_producto': 1, 'cantidad': 1},
+    [],
+])
+def test_bulk_de_compra_rechaza_un_cuerpo_que_no_es_una_lista(client, datos, cuerpo):
+    respuesta = client.post('/Detalles%20de%20ordenes%20de%20compra/bulk', json=cuerpo)
+    assert respuesta.status_code == 400
+    assert db.session.query(DetalleOrdenCompra).count() == 0
@@ -0,0 +1,60 @@
+import os
+import threading
+from app.middlewares import metricas_middleware
+from app.middlewares.metricas_middleware import ARCHIVO_TERMINADOS, Metricas
+
+
+def _registrar_en_hilos(metricas, cantidad):
+    for _ in range(cantidad):
+        hilo = threading.Thread(target=metricas.registrar, args=('Productos', 'GET', 200, 0.01))
+        hilo.start()
+        hilo.join()
+
+
+def test_los_contadores_de_hilos_terminados_se_acumulan_y_se_liberan():
+    metricas = Metricas()
+    _registrar_en_hilos(metricas, 50)
+
+    peticiones, latencias = metricas.instantanea()
+    assert peticiones == {('Productos', 'GET', '200'): 50}
+    assert latencias[('Productos', 'GET')][-1] == 50
+    assert len(metricas._hilos) == 0  # Ningún diccionario de un hilo terminado sigue registrado.
+
+    _registrar_en_hilos(metricas, 5)
+    assert metricas.instantanea()[0] == {('Productos', 'GET', '200'): 55}
+
+
+def test_al_cerrar_el_proceso_sus_contadores_pasan_al_archivo_de_terminados(tmp_path):
+    directorio = str(tmp_path)
+    metricas = Metricas(directorio)
+    metricas.registrar('Productos', 'GET', 200, 0.01)
+    metricas.escribir_archivo()
+    metricas.cerrar()
+    # Un segundo proceso que termina suma sus contadores a los del primero.
+    otro = Metricas(directorio)
+    otro._pid = os.getpid() + 1
+    otro.registrar('Productos', 'GET', 200, 0.01)
+    otro.cerrar()
+
+    assert set(os.listdir(directorio)) == {ARCHIVO_TERMINADOS, 'metricas.lock'}
+    lector = Metricas(directorio)
+    assert lector.instantanea_global()[0] == {('Productos', 'GET', '200'): 2}
+
+
+def test_el_hook_de_fork_se_registra_una_vez_y_reinicia_la_instancia_actual(monkeypatch):
+    hooks = []
+    monkeypatch.setattr(metricas_middleware, '_fork_registrado', False)
+    monkeypatch.setattr(metricas_middleware, '_actual', None)
+    monkeypatch.setattr(os, 'register_at_fork', lambda after_in_child: hooks.append(after_in_child))
+
+    # Cada create_app() crea una instancia nueva (por ejemplo, una por test).
+    anterior = Metricas()
+    Metricas()
+    actual = Metricas()
+    assert len(hooks) == 1
+
+    for metricas in (anterior, actual):
+        metricas.registrar('Productos', 'GET', 200, 0.01)
+    hooks[0]()  # Lo que ejecuta el proceso hijo después de un fork.
+    assert actual.instantanea() == ({}, {})
+    assert anterior.instantanea()[0] == {('Productos', 'GET', '200'): 1}
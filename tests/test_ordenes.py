@@ -0,0 +1,39 @@
+import pytest
+from app import db
+from app.models.detalleOrdenCompra import DetalleOrdenCompra
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.models.producto import Producto
+from tests.conftest import sentencias_sql
+
+
+def _agregar_lineas(datos, cantidad):
+    """Agregar `cantidad` líneas, cada una con un producto distinto, a la orden de venta y a la de compra."""
+    productos = [Producto(f'Producto {i}', 1, 2, 10) for i in range(cantidad)]
+    db.session.add_all(productos)
+    db.session.flush()
+    for producto in productos:
+        db.session.add(DetalleOrdenVenta(datos['id_orden_venta'], producto.id_producto, 1))
+        db.session.add(DetalleOrdenCompra(datos['id_orden_compra'], producto.id_producto, 1))
+    db.session.commit()
+
+
+def _consultas(client, url):
+    db.session.remove()  # Sin objetos en el identity map, como en una petición nueva.
+    with sentencias_sql() as sentencias:
+        respuesta = client.get(url)
+    assert respuesta.status_code == 200
+    return len(sentencias)
+
+
+@pytest.mark.parametrize('ruta, clave', [
+    ('/Ordenes%20de%20venta/{id_orden_venta}/completa', 'id_orden_venta'),
+    ('/Ordenes%20de%20compra/{id_orden_compra}/completa', 'id_orden_compra'),
+])
+def test_orden_completa_usa_una_cantidad_fija_de_consultas(client, datos, ruta, clave):
+    url = ruta.format(**datos)
+    _agregar_lineas(datos, 1)
+    con_una_linea = _consultas(client, url)
+    _agregar_lineas(datos, 30)
+    con_muchas_lineas = _consultas(client, url)
+
+    assert con_una_linea == con_muchas_lineas == 2
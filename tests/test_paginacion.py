@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import insert, select
+from app import db
+from app.models.cliente import Cliente
+from app.models.detalleOrdenCompra import DetalleOrdenCompra
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.models.ordenCompra import OrdenCompra
+from app.models.ordenVenta import OrdenVenta
+from app.models.producto import Producto
+from app.models.proveedor import Proveedor
+
+ORDENES = '/Ordenes%20de%20venta/'
+
+
+def _recorrer(client, url, limit):
+    """Pedir páginas siguiendo `next_cursor` hasta que sea null y devolver todos los registros recibidos."""
+    registros, after = [], None
+    while True:
+        separador = '&' if '?' in url else '?'
+        respuesta = client.get(f'{url}{separador}limit={limit}' + (f'&after={after}' if after is not None else ''))
+        assert respuesta.status_code == 200
+        pagina = respuesta.json
+        clave = next(k for k in pagina if k != 'next_cursor')
+        registros.extend(pagina[clave])
+        after = pagina['next_cursor']
+        if after is None:
+            return registros
+
+
+@pytest.fixture
+def ordenes(datos):
+    """Órdenes de venta con fechas finales repetidas y nulas, intercaladas para que el orden no siga al ID."""
+    hoy = date.today()
+    id_cliente = db.session.get(OrdenVenta, datos['id_orden_venta']).id_cliente
+    for i in range(20):
+        fecha_final = None if i % 4 == 0 else hoy + timedelta(days=i % 3)
+        db.session.add(OrdenVenta(hoy, fecha_final, 'pendiente', id_cliente))
+    db.session.commit()
+    return db.session.execute(db.select(OrdenVenta.id_orden_venta, OrdenVenta.fecha_final)).all()
+
+
+@pytest.mark.parametrize('limit', [1, 3, 7])
+def test_el_orden_descendente_con_nulos_no_repite_ni_salta_registros(client, ordenes, limit):
+    recibidos = _recorrer(client, ORDENES + '?sort=-fecha_final', limit)
+
+    # Orden esperado: fecha final descendente con los NULL al final, y el ID descendente como desempate.
+    esperado = sorted(ordenes, key=lambda o: (o.fecha_final is not None, o.fecha_final or date.min, o.id_orden_venta), reverse=True)
+    assert [r['id'] for r in recibidos] == [o.id_orden_venta for o in esperado]
+
+
+@pytest.mark.parametrize('limit', [1, 4])
+def test_el_orden_ascendente_con_nulos_no_repite_ni_salta_registros(client, ordenes, limit):
+    recibidos = _recorrer(client, ORDENES + '?sort=fecha_final', limit)
+
+    esperado = sorted(ordenes, key=lambda o: (o.fecha_final is not None, o.fecha_final or date.min, o.id_orden_venta))
+    assert [r['id'] for r in recibidos] == [o.id_orden_venta for o in esperado]
+
+
+@pytest.mark.parametrize('sort', ['nombre', '-password', 'id_cliente'])
+def test_una_columna_de_orden_desconocida_responde_400(client, datos, sort):
+    respuesta = client.get(ORDENES + f'?sort={sort}')
+    assert respuesta.status_code == 400
+    assert 'No se puede ordenar' in respuesta.json['message']
+
+
+# Listado -> clave primaria de cada uno de los siete endpoints paginados.
+LISTADOS = {
+    '/Productos/': Producto.id_producto,
+    '/Clientes/': Cliente.id_cliente,
+    '/Proveedores/': Proveedor.id_proveedor,
+    ORDENES: OrdenVenta.id_orden_venta,
+    '/Ordenes%20de%20compra/': OrdenCompra.id_orden_compra,
+    '/Detalles%20de%20ordenes%20de%20venta/': DetalleOrdenVenta.id_detalle_venta,
+    '/Detalles%20de%20ordenes%20de%20compra/': DetalleOrdenCompra.id_detalle_compra,
+}
+
+
+@pytest.fixture
+def registros(datos):
+    """Doce registros más en cada tabla de los listados."""
+    hoy = date.today()
+    id_producto = datos['ids_producto'][0]
+    orden_venta = db.session.get(OrdenVenta, datos['id_orden_venta'])
+    orden_compra = db.session.get(OrdenCompra, datos['id_orden_compra'])
+    contacto = [{'nombre': f'Nombre {i}', 'contacto': 'Contacto', 'telefono': '555', 'direccion': 'Calle'} for i in range(12)]
+    db.session.execute(insert(Cliente), contacto)
+    db.session.execute(insert(Proveedor), contacto)
+    db.session.execute(insert(Producto), [{'nombre': f'Producto {i}', 'costo': 1, 'precio_venta': 2, 'cantidad': 5} for i in range(12)])
+    db.session.execute(insert(OrdenVenta), [{'fecha_inicio': hoy, 'fecha_final': hoy, 'estado': 'pendiente', 'id_cliente': orden_venta.id_cliente}] * 12)
+    db.session.execute(insert(OrdenCompra), [{'fecha_inicio': hoy, 'fecha_final': hoy, 'estado': 'pendiente', 'id_proveedor': orden_compra.id_proveedor}] * 12)
+    db.session.execute(insert(DetalleOrdenVenta), [{'id_orden_venta': datos['id_orden_venta'], 'id_producto': id_producto, 'cantidad': 1}] * 12)
+    db.session.execute(insert(DetalleOrdenCompra), [{'id_orden_compra': datos['id_orden_compra'], 'id_producto': id_producto, 'cantidad': 1}] * 12)
+    db.session.commit()
+
+
+@pytest.mark.parametrize('url', LISTADOS)
+@pytest.mark.parametrize('limit', [1, 5, 13])
+def test_recorrer_las_paginas_devuelve_cada_registro_una_vez(client, registros, url, limit):
+    recibidos = _recorrer(client, url, limit)
+
+    esperados = db.session.scalars(select(LISTADOS[url]).order_by(LISTADOS[url])).all()
+    assert len(esperados) >= 12
+    # La primera clave de cada registro es su ID.
+    assert [next(iter(registro.values())) for registro in recibidos] == esperados
+
+
+@pytest.mark.parametrize('url', LISTADOS)
+def test_el_limite_no_supera_paginacion_limite_maximo(app, client, registros, monkeypatch, url):
+    monkeypatch.setitem(app.config, 'PAGINACION_LIMITE_MAXIMO', 5)
+    pagina = client.get(f'{url}?limit=1000').json
+
+    clave = next(k for k in pagina if k != 'next_cursor')
+    assert len(pagina[clave]) == 5
+    assert pagina['next_cursor'] == next(iter(pagina[clave][-1].values()))
@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+import pytest
+from app import db
+from app.models.detalleOrdenCompra import DetalleOrdenCompra
+from app.models.ordenCompra import OrdenCompra
+from app.models.ordenVenta import OrdenVenta
+from app.models.proveedor import Proveedor
+from app.services import reporte_service
+from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from app.services.orden_venta_service import OrdenVentaService
+from app.services.reporte_service import ReporteService
+
+INICIO = date(2024, 3, 1)
+# Rango de las órdenes del fixture: deja afuera la orden de compra de `datos`, que es de hoy.
+RANGO = {'desde': INICIO, 'hasta': INICIO + timedelta(days=30)}
+
+
+@pytest.fixture
+def compras(datos):
+    """Órdenes de compra completadas de dos proveedores con plazos de entrega distintos (en días)."""
+    otro = Proveedor('Otro proveedor', 'Contacto', '555', 'Calle 3')
+    db.session.add(otro)
+    db.session.flush()
+    id_proveedor = db.session.get(OrdenCompra, datos['id_orden_compra']).id_proveedor
+    id_a, id_b = datos['ids_producto']
+    plazos = {id_proveedor: [3, 1, 7, 2, 2, 10, 5], otro.id_proveedor: [4, 8]}
+    for proveedor, dias in plazos.items():
+        for i, plazo in enumerate(dias):
+            orden = OrdenCompra(INICIO + timedelta(days=i), INICIO + timedelta(days=i + plazo), 'completado', proveedor)
+            db.session.add(orden)
+            db.session.flush()
+            db.session.add(DetalleOrdenCompra(orden.id_orden_compra, id_a if i % 2 else id_b, 1 + i))
+    db.session.commit()
+    return plazos
+
+
+@pytest.mark.parametrize('agrupar', ['proveedor', 'producto'])
+def test_los_percentiles_sin_funciones_de_ventana_coinciden_con_los_de_sql(app, compras, monkeypatch, agrupar):
+    con_ventanas = ReporteService.get_reporte_compras(**RANGO, agrupar=agrupar)
+
+    # Sin funciones de ventana, con lotes de dos filas para que los grupos crucen varios lotes.
+    en_stream = ReporteService._plazos_en_stream
+    llamadas = []
+    monkeypatch.setattr(reporte_service, '_soporta_ventanas', lambda: False)
+    monkeypatch.setattr(ReporteService, '_plazos_en_stream', staticmethod(
+        lambda plazos, cantidad: llamadas.append(cantidad) or en_stream(plazos, cantidad, tamano_lote=2)
+    ))
+    sin_ventanas = ReporteService.get_reporte_compras(**RANGO, agrupar=agrupar)
+
+    assert llamadas and sin_ventanas == con_ventanas
+    assert all(grupo['plazo_p50'] is not None for grupo in sin_ventanas)
+
+
+def test_los_percentiles_del_plazo_son_los_valores_esperados(app, compras, monkeypatch):
+    monkeypatch.setattr(reporte_service, '_soporta_ventanas', lambda: False)
+    grupos = {g['id_proveedor']: g for g in ReporteService.get_reporte_compras(**RANGO)}
+
+    for id_proveedor, plazos in compras.items():
+        ordenados = sorted(plazos)
+        grupo = grupos[id_proveedor]
+        # El percentil p es el menor plazo que cubre el p% de las órdenes.
+        assert grupo['plazo_p50'] == ordenados[-(-50 * len(ordenados) // 100) - 1]
+        assert grupo['plazo_p90'] == ordenados[-(-90 * len(ordenados) // 100) - 1]
+        assert grupo['plazo_promedio'] == pytest.approx(sum(plazos) / len(plazos))
+
+
+@pytest.mark.parametrize('url', [
+    '/reportes/ventas?desde=2024-03-10&hasta=2024-03-01',
+    '/reportes/compras?desde=2024-03-10&hasta=2024-03-01',
+    '/reportes/ventas?agrupar=proveedor',
+    '/reportes/compras?agrupar=cliente',
+    '/reportes/ventas?desde=10-03-2024',
+    '/reportes/compras?hasta=mañana',
+    '/reportes/ventas?solo_completadas=quizas',
+])
+def test_los_parametros_invalidos_del_reporte_responden_400(client, datos, url):
+    respuesta = client.get(url)
+    assert respuesta.status_code == 400
+    assert respuesta.json['message']
+
+
+def test_el_reporte_de_ventas_respeta_el_rango_de_fechas(client, datos):
+    id_a, id_b = datos['ids_producto']
+    id_cliente = db.session.get(OrdenVenta, datos['id_orden_venta']).id_cliente
+    anterior = OrdenVentaService.create_orden_venta(INICIO, INICIO, 'completado', id_cliente).id_orden_venta
+    DetalleOrdenVentaService.create_detalle_orden_venta(anterior, id_a, 4)
+    DetalleOrdenVentaService.create_detalle_orden_venta(datos['id_orden_venta'], id_b, 2)
+
+    def unidades(consulta):
+        respuesta = client.get(f'/reportes/ventas?agrupar=dia{consulta}')
+        assert respuesta.status_code == 200
+        return {grupo['fecha']: grupo['unidades'] for grupo in respuesta.json['ventas']}
+
+    hoy = date.today().isoformat()
+    assert unidades('') == {INICIO.isoformat(): 4, hoy: 2}
+    assert unidades(f'&desde={INICIO}&hasta={INICIO}') == {INICIO.isoformat(): 4}
+    assert unidades(f'&desde={INICIO + timedelta(days=1)}') == {hoy: 2}
+    assert unidades(f'&hasta={INICIO - timedelta(days=1)}') == {}
+
+
+def test_el_reporte_de_compras_respeta_el_rango_de_fechas(client, compras):
+    def ordenes(consulta):
+        respuesta = client.get(f'/reportes/compras{consulta}')
+        assert respuesta.status_code == 200
+        return sorted(grupo['ordenes'] for grupo in respuesta.json['compras'])
+
+    assert ordenes('') == ordenes(f'?desde={RANGO["desde"]}&hasta={RANGO["hasta"]}') == [2, 7]
+    assert ordenes(f'?desde={INICIO}&hasta={INICIO + timedelta(days=1)}') == [2, 2]
+    assert ordenes(f'?desde={INICIO + timedelta(days=3)}') == [4]
+    assert ordenes(f'?hasta={INICIO - timedelta(days=1)}') == []
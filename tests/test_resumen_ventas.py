@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from sqlalchemy import select
+from app import db
+from app.models.ordenVenta import OrdenVenta
+from app.models.resumenVentasDiario import ResumenVentasDiario
+from app.services.detalle_orden_venta_service import DetalleOrdenVentaService
+from app.services.orden_venta_service import OrdenVentaService
+from app.services.resumen_ventas_service import ResumenVentasService
+
+AYER = date.today() - timedelta(days=1)
+
+
+def _resumen():
+    """Contenido del resumen diario como {(fecha, id_producto): unidades}."""
+    filas = db.session.execute(select(ResumenVentasDiario.fecha, ResumenVentasDiario.id_producto, ResumenVentasDiario.unidades))
+    return {(fecha, id_producto): unidades for fecha, id_producto, unidades in filas}
+
+
+def _coincide_con_la_reconstruccion():
+    incremental = _resumen()
+    ResumenVentasService.reconstruir(dias_por_lote=1)
+    assert _resumen() == incremental
+    return incremental
+
+
+def test_el_resumen_incremental_coincide_con_la_reconstruccion(app, datos):
+    id_a, id_b = datos['ids_producto']
+    id_orden = datos['id_orden_venta']
+    id_cliente = db.session.get(OrdenVenta, id_orden).id_cliente
+    otra = OrdenVentaService.create_orden_venta(AYER, AYER, 'completado', id_cliente).id_orden_venta
+    pendiente = OrdenVentaService.create_orden_venta(AYER, AYER, 'pendiente', id_cliente).id_orden_venta
+
+    # Altas: una por una y en lote, incluida una línea de una orden pendiente que no cuenta.
+    id_detalle = DetalleOrdenVentaService.create_detalle_orden_venta(id_orden, id_a, 5)
+    DetalleOrdenVentaService.create_detalles_orden_venta_bulk([
+        {'id_orden_venta': id_orden, 'id_producto': id_a, 'cantidad': 2},
+        {'id_orden_venta': otra, 'id_producto': id_b, 'cantidad': 4},
+        {'id_orden_venta': pendiente, 'id_producto': id_b, 'cantidad': 9},
+    ])
+    assert _coincide_con_la_reconstruccion() == {(date.today(), id_a): 7, (AYER, id_b): 4}
+
+    # Cambio de cantidad y después de producto de la misma línea.
+    DetalleOrdenVentaService.update_detalle_orden_venta(id_detalle, {'cantidad': 8})
+    assert _coincide_con_la_reconstruccion()[(date.today(), id_a)] == 10
+    DetalleOrdenVentaService.update_detalle_orden_venta(id_detalle, {'id_producto': id_b})
+    assert _coincide_con_la_reconstruccion() == {(date.today(), id_a): 2, (date.today(), id_b): 8, (AYER, id_b): 4}
+
+    # La orden pendiente pasa a completada y la otra cambia de día.
+    OrdenVentaService.update_orden_venta(pendiente, {'estado': 'completado'})
+    OrdenVentaService.update_orden_venta(otra, {'fecha_inicio': AYER - timedelta(days=1)})
+    assert _coincide_con_la_reconstruccion() == {
+        (date.today(), id_a): 2, (date.today(), id_b): 8, (AYER, id_b): 9, (AYER - timedelta(days=1), id_b): 4,
+    }
+
+    # Bajas: las filas que quedan en cero desaparecen del resumen.
+    DetalleOrdenVentaService.delete_detalle_orden_venta(id_detalle)
+    id_linea = DetalleOrdenVentaService.get_detalles_orden_venta(pendiente)[0].id_detalle_venta
+    DetalleOrdenVentaService.delete_detalle_orden_venta(id_linea)
+    assert _coincide_con_la_reconstruccion() == {(date.today(), id_a): 2, (AYER - timedelta(days=1), id_b): 4}
+
+
+def test_la_reconstruccion_borra_las_filas_sin_ventas(app, datos):
+    id_a, _ = datos['ids_producto']
+    DetalleOrdenVentaService.create_detalle_orden_venta(datos['id_orden_venta'], id_a, 3)
+    # Una fila que no corresponde a ninguna venta (por ejemplo, de una orden borrada sin pasar por el servicio).
+    db.session.add(ResumenVentasDiario(fecha=AYER, id_producto=id_a, unidades=6))
+    db.session.commit()
+
+    assert ResumenVentasService.reconstruir() == 1
+    assert _resumen() == {(date.today(), id_a): 3}
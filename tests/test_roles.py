@@ -0,0 +1,101 @@
+import time
+import pytest
+from flask_jwt_extended import decode_token, jwt_required
+from sqlalchemy import update
+from app import db
+from app.middlewares.auth_middleware import role_required
+from app.models.role import Role
+from app.models.user import User
+from app.services.user_service import UserService
+from app.utils import cache
+
+PROTEGIDO = '/solo-admin'
+CONTRASENA = 'una-contraseña'
+
+
+@pytest.fixture
+def usuarios(app):
+    """Roles "usuario" y "admin", un usuario de cada uno y un endpoint protegido con `role_required('admin')`."""
+    db.session.add_all([Role('usuario'), Role('admin')])
+    db.session.commit()
+    UserService.create_user('ana', CONTRASENA, rol='admin')
+    UserService.create_user('beto', CONTRASENA, rol='usuario')
+
+    @jwt_required()
+    @role_required('admin')
+    def solo_admin():
+        return {'ok': True}
+
+    app.add_url_rule(PROTEGIDO, view_func=solo_admin)
+
+
+def _login(client, username):
+    respuesta = client.post('/auth/login', json={'username': username, 'password': CONTRASENA})
+    assert respuesta.status_code == 200
+    return respuesta.json
+
+
+def _get(client, token):
+    return client.get(PROTEGIDO, headers={'Authorization': f'Bearer {token}'})
+
+
+def _vencer_cache(app, monkeypatch):
+    """Adelantar el reloj de la caché más allá de AUTH_REVOCACION_TTL."""
+    ahora = time.monotonic() + app.config['AUTH_REVOCACION_TTL'] + 1
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: ahora)
+
+
+def test_el_token_de_acceso_lleva_el_rol_como_claim(app, client, usuarios):
+    tokens = _login(client, 'ana')
+    assert decode_token(tokens['access_token'])['rol'] == 'admin'
+    assert 'rol' not in decode_token(tokens['refresh_token'])
+
+
+def test_un_rol_distinto_responde_403(client, usuarios):
+    assert _get(client, _login(client, 'ana')['access_token']).status_code == 200
+
+    respuesta = _get(client, _login(client, 'beto')['access_token'])
+    assert respuesta.status_code == 403
+    assert respuesta.json['message'] == 'Acceso denegado'
+
+
+@pytest.mark.parametrize('cambios', [{'activo': False}, {'rol': 'usuario'}])
+def test_desactivar_o_cambiar_el_rol_revoca_el_token(client, usuarios, cambios):
+    token = _login(client, 'ana')['access_token']
+    assert _get(client, token).status_code == 200
+
+    # El servicio invalida el estado en caché: el rechazo es inmediato.
+    UserService.update_user('ana', **cambios)
+    respuesta = _get(client, token)
+    assert respuesta.status_code == 401
+    assert respuesta.json['message'] == 'Token revocado'
+
+
+@pytest.mark.parametrize('cambio', ['activo', 'rol'])
+def test_sin_invalidar_la_cache_el_token_se_rechaza_al_vencer_el_ttl(app, client, usuarios, monkeypatch, cambio):
+    token = _login(client, 'ana')['access_token']
+    assert _get(client, token).status_code == 200  # Guarda el estado de "ana" en la caché.
+
+    # Un cambio hecho por fuera del servicio (por ejemplo, desde otro proceso) no invalida la caché.
+    if cambio == 'activo':
+        valores = {'activo': False}
+    else:
+        valores = {'id_rol': db.session.execute(db.select(Role.id_rol).where(Role.name == 'usuario')).scalar_one()}
+    db.session.execute(update(User).where(User.username == 'ana').values(**valores))
+    db.session.commit()
+    assert _get(client, token).status_code == 200
+
+    _vencer_cache(app, monkeypatch)
+    assert _get(client, token).status_code == 401
+
+
+def test_el_refresh_rechaza_a_un_usuario_inactivo(client, usuarios):
+    refresh = _login(client, 'ana')['refresh_token']
+    renovado = client.post('/auth/refresh', headers={'Authorization': f'Bearer {refresh}'})
+    assert renovado.status_code == 200
+    assert decode_token(renovado.json['access_token'])['rol'] == 'admin'
+
+    UserService.update_user('ana', activo=False)
+    respuesta = client.post('/auth/refresh', headers={'Authorization': f'Bearer {refresh}'})
+    assert respuesta.status_code == 401
+    assert respuesta.json['message'] == 'Token revocado'
@@ -0,0 +1,36 @@
+from sqlalchemy import select
+from app import db
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.models.producto import Producto
+from app.utils.serializacion import a_diccionarios
+
+DETALLES = '/Detalles%20de%20ordenes%20de%20venta/'
+CAMPOS = {'id': 'id_producto', 'nombre': 'nombre', 'cantidad': 'cantidad'}
+
+
+def test_los_listados_envian_un_objeto_por_registro(client, datos):
+    respuesta = client.get('/Productos/')
+    assert respuesta.status_code == 200
+    assert respuesta.json['productos'] == [
+        {'id_producto': datos['ids_producto'][0], 'nombre': 'Producto A', 'costo': 10.0, 'precio_venta': 15.0, 'cantidad': 1000, 'version': 1},
+        {'id_producto': datos['ids_producto'][1], 'nombre': 'Producto B', 'costo': 20.0, 'precio_venta': 30.0, 'cantidad': 1000, 'version': 1},
+    ]
+
+    for id_producto in datos['ids_producto']:
+        db.session.add(DetalleOrdenVenta(datos['id_orden_venta'], id_producto, 3))
+    db.session.commit()
+    detalles = client.get(DETALLES).json['detalles_orden_venta']
+    assert [{k: d[k] for k in ('id_orden_venta', 'id_producto', 'cantidad')} for d in detalles] == [
+        {'id_orden_venta': datos['id_orden_venta'], 'id_producto': i, 'cantidad': 3} for i in datos['ids_producto']
+    ]
+    assert all(isinstance(d['id'], int) for d in detalles)
+
+
+def test_a_diccionarios_lee_igual_filas_de_columnas_y_objetos_del_orm(datos):
+    filas = db.session.execute(select(Producto.cantidad, Producto.nombre, Producto.id_producto)).all()
+    objetos = db.session.scalars(select(Producto)).all()
+
+    esperado = [{'id': i, 'nombre': n, 'cantidad': 1000} for i, n in zip(datos['ids_producto'], ('Producto A', 'Producto B'))]
+    assert a_diccionarios(filas, CAMPOS) == a_diccionarios(objetos, CAMPOS) == esperado
+    assert a_diccionarios(iter(filas), {'id': 'id_producto'}) == [{'id': i} for i in datos['ids_producto']]
+    assert a_diccionarios([], CAMPOS) == []
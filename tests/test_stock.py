@@ -0,0 +1,51 @@
+from datetime import date
+from flask_migrate import upgrade
+from sqlalchemy import func, select, text
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.movimientoStock import MovimientoStock
+from app.models.producto import Producto
+from app.services.stock_service import StockService
+from tests.conftest import MIGRACIONES
+
+
+def test_migracion_registra_el_saldo_de_apertura(tmp_path, monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "stock.db"}')
+    app = create_app('testing')
+    with app.app_context():
+        upgrade(directory=MIGRACIONES, revision='3f1a2c9b7d10')
+        db.session.execute(text(
+            "INSERT INTO productos (nombre, costo, precio_venta, cantidad) VALUES ('A', 1, 2, 7), ('B', 1, 2, 0)"
+        ))
+        db.session.commit()
+        upgrade(directory=MIGRACIONES, revision='8c4e6d2a1b37')
+        movimientos = db.session.execute(text('SELECT id_producto, cantidad, tipo FROM movimiento_stock')).all()
+        db.session.remove()
+    assert [tuple(m) for m in movimientos] == [(1, 7, 'ajuste')]
+
+
+def test_conciliar_registra_la_diferencia_de_productos_con_movimientos(app):
+    # Un producto con movimientos pero sin saldo de apertura: 10 unidades previas y una venta de 3.
+    producto = Producto('A', 1, 2, 7)
+    db.session.add(producto)
+    db.session.flush()
+    StockService.registrar_movimiento(producto.id_producto, -3, 'venta')
+    db.session.commit()
+
+    assert StockService.crear_movimientos_iniciales() == 1
+    assert StockService.get_stock_en_fecha(producto.id_producto, date.today()) == 7
+    # Una segunda ejecución no registra nada.
+    assert StockService.crear_movimientos_iniciales() == 0
+    total = db.session.scalar(select(func.count()).select_from(MovimientoStock))
+    assert total == 2
+
+
+def test_stock_de_producto_inexistente_responde_404(client):
+    assert client.get('/Productos/999/stock').status_code == 404
+
+
+def test_snapshot_de_hoy_es_un_parametro_invalido(app):
+    resultado = app.test_cli_runner().invoke(args=['stock', 'snapshot', '--fecha', date.today().isoformat()])
+    assert resultado.exit_code == 2
+    assert 'Solo se pueden generar snapshots de fechas anteriores a hoy.' in resultado.output
+    assert resultado.exception is None or isinstance(resultado.exception, SystemExit)
@@ -0,0 +1,50 @@
+import json
+import pytest
+from app import db
+from app.models.detalleOrdenCompra import DetalleOrdenCompra
+from app.models.detalleOrdenVenta import DetalleOrdenVenta
+from app.utils import streaming
+
+VENTA = '/Detalles%20de%20ordenes%20de%20venta/'
+COMPRA = '/Detalles%20de%20ordenes%20de%20compra/'
+
+
+@pytest.fixture
+def detalles(datos, monkeypatch):
+    """Siete líneas en cada orden; con bloques de tres líneas la exportación se envía en varias partes."""
+    monkeypatch.setattr(streaming, 'LINEAS_POR_BLOQUE', 3)
+    for i in range(7):
+        id_producto = datos['ids_producto'][i % 2]
+        db.session.add(DetalleOrdenVenta(datos['id_orden_venta'], id_producto, 1 + i))
+        db.session.add(DetalleOrdenCompra(datos['id_orden_compra'], id_producto, 1 + i))
+    db.session.commit()
+    return datos
+
+
+@pytest.mark.parametrize('url, clave_orden', [(VENTA, 'id_orden_venta'), (COMPRA, 'id_orden_compra')])
+@pytest.mark.parametrize('consulta, encabezados', [
+    ('?stream=1', {}),
+    ('', {'Accept': 'application/x-ndjson'}),
+])
+def test_la_exportacion_envia_un_objeto_json_por_linea(client, detalles, url, clave_orden, consulta, encabezados):
+    respuesta = client.get(url + consulta, headers=encabezados)
+
+    assert respuesta.status_code == 200 and respuesta.is_streamed
+    assert respuesta.mimetype == 'application/x-ndjson'
+    cuerpo = respuesta.get_data()
+    assert cuerpo.endswith(b'\n')
+    lineas = [json.loads(linea) for linea in cuerpo.split(b'\n')[:-1]]
+    assert [(l[clave_orden], l['cantidad']) for l in lineas] == [(detalles[clave_orden], 1 + i) for i in range(7)]
+    # Todos los registros, sin paginar y sin `next_cursor`.
+    assert all(isinstance(linea, dict) and 'next_cursor' not in linea for linea in lineas)
+
+
+@pytest.mark.parametrize('consulta, encabezados', [
+    ('', {}),
+    ('?stream=0', {'Accept': 'application/x-ndjson'}),  # El parámetro tiene prioridad sobre Accept.
+    ('', {'Accept': 'application/json, application/x-ndjson;q=0.5'}),
+])
+def test_sin_pedir_streaming_se_responde_una_pagina_json(client, detalles, consulta, encabezados):
+    respuesta = client.get(VENTA + consulta, headers=encabezados)
+    assert respuesta.mimetype == 'application/json'
+    assert len(respuesta.json['detalles_orden_venta']) == 7